@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""Aggregate per-turn profiling events from the copilot profiling log.
+
+Reads ``Agent turn critical path`` events written by ``run_fast_agent.py`` and prints p50/p95 of
+turn wall time and its parts (LLM wait, streaming, tools, local overhead) per agent card, so slow
+turns can be attributed to tools or to the model. ``LLM turn profiling`` and ``Prompt prefix changed``
+events add the prompt-cache hit ratio per agent card and model.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+DEFAULT_LOG_PATH = Path(__file__).resolve().parent / "logs" / "copilot-profiling.jsonl"
+TURN_EVENT_MESSAGE = "Agent turn critical path"
+LLM_TURN_EVENT_MESSAGE = "LLM turn profiling"
+PREFIX_CHANGE_EVENT_MESSAGE = "Prompt prefix changed"
+COMPONENTS = ("turn_total_ms", "llm_wait_ms", "streaming_ms", "tools_ms", "overhead_ms")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="p50/p95 turn critical path and prompt-cache hit ratio per agent card from copilot-profiling.jsonl"
+    )
+    parser.add_argument("--log", type=Path, default=DEFAULT_LOG_PATH, help="Path to copilot-profiling.jsonl (COPILOT_PROFILING_LOG)")
+    parser.add_argument("--agent", action="append", default=[], help="Only report these agent cards (repeatable)")
+    parser.add_argument("--json", action="store_true", help="Print the aggregate as JSON instead of a table")
+    return parser.parse_args(argv)
+
+
+def event_payload(record: dict[str, Any]) -> dict[str, Any]:
+    """Profiling data of a log record; the fast-agent file logger nests keyword data one level down."""
+    data = record.get("data")
+    if isinstance(data, dict) and isinstance(data.get("data"), dict):
+        return data["data"]
+    return data if isinstance(data, dict) else {}
+
+
+def iter_events(lines: Iterable[str], messages: set[str]) -> Iterator[tuple[str, dict[str, Any]]]:
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(record, dict) and record.get("message") in messages:
+            yield record["message"], event_payload(record)
+
+
+def iter_turn_events(lines: Iterable[str]) -> Iterator[dict[str, Any]]:
+    for _, payload in iter_events(lines, {TURN_EVENT_MESSAGE}):
+        yield payload
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def aggregate(events: Iterable[dict[str, Any]], agents: list[str] | None = None) -> dict[str, dict[str, Any]]:
+    samples: dict[str, dict[str, list[float]]] = defaultdict(lambda: defaultdict(list))
+    tool_samples: dict[str, dict[str, list[float]]] = defaultdict(lambda: defaultdict(list))
+    for event in events:
+        agent = str(event.get("agent_name") or "unknown")
+        if agents and agent not in agents:
+            continue
+        for component in COMPONENTS:
+            value = event.get(component)
+            if isinstance(value, (int, float)):
+                samples[agent][component].append(value)
+        for tool in event.get("tool_calls") or []:
+            label = f"{tool.get('server_name') or '-'}.{tool.get('tool_name')}"
+            if isinstance(tool.get("duration_ms"), (int, float)):
+                tool_samples[agent][label].append(tool["duration_ms"])
+
+    report: dict[str, dict[str, Any]] = {}
+    for agent in sorted(samples):
+        by_component = samples[agent]
+        report[agent] = {
+            "turns": len(by_component["turn_total_ms"]),
+            **{
+                component: {"p50": percentile(by_component[component], 50), "p95": percentile(by_component[component], 95)}
+                for component in COMPONENTS
+            },
+            "tools": {
+                label: {"calls": len(values), "p50": percentile(values, 50), "p95": percentile(values, 95)}
+                for label, values in sorted(tool_samples[agent].items())
+            },
+        }
+    return report
+
+
+def aggregate_prompt_cache(
+    events: Iterable[tuple[str, dict[str, Any]]], agents: list[str] | None = None
+) -> dict[str, dict[str, dict[str, Any]]]:
+    """Cached vs uncached input tokens and prefix changes per agent card and model alias."""
+    totals: dict[str, dict[str, dict[str, Any]]] = defaultdict(
+        lambda: defaultdict(lambda: {"turns": 0, "input_tokens": 0, "cached_input_tokens": 0, "prefix_changes": 0, "tool_order_only_changes": 0})
+    )
+    for message, event in events:
+        agent = str(event.get("agent_name") or "unknown")
+        if agents and agent not in agents:
+            continue
+        model = str(event.get("model_alias") or event.get("model") or "unknown")
+        row = totals[agent][model]
+        if message == PREFIX_CHANGE_EVENT_MESSAGE:
+            row["prefix_changes"] += 1
+            row["tool_order_only_changes"] += int(bool(event.get("tool_order_only")))
+            continue
+        row["turns"] += 1
+        row["input_tokens"] += int(event.get("input_tokens") or 0)
+        row["cached_input_tokens"] += int(event.get("cached_input_tokens") or 0)
+    report: dict[str, dict[str, dict[str, Any]]] = {}
+    for agent, by_model in sorted(totals.items()):
+        report[agent] = {}
+        for model, row in sorted(by_model.items()):
+            row["uncached_input_tokens"] = row["input_tokens"] - row["cached_input_tokens"]
+            row["cache_hit_ratio"] = round(row["cached_input_tokens"] / row["input_tokens"], 4) if row["input_tokens"] else None
+            report[agent][model] = row
+    return report
+
+
+def format_report(report: dict[str, dict[str, Any]]) -> str:
+    if not report:
+        return "No turn critical-path events found."
+    lines: list[str] = []
+    turn_report = {agent: row for agent, row in report.items() if "turns" in row}
+    header = f"{'agent':<24} {'turns':>6} " + " ".join(f"{component[:-3]:>20}" for component in COMPONENTS)
+    lines.append(header)
+    lines.append(" " * 32 + " ".join(f"{'p50 / p95 ms':>20}" for _ in COMPONENTS))
+    for agent, row in turn_report.items():
+        cells = " ".join(f"{_fmt(row[component]['p50']):>9} / {_fmt(row[component]['p95']):<8}" for component in COMPONENTS)
+        lines.append(f"{agent:<24} {row['turns']:>6} {cells}")
+        for label, tool in row["tools"].items():
+            lines.append(f"  tool {label:<40} calls={tool['calls']:<5} p50={_fmt(tool['p50'])} p95={_fmt(tool['p95'])}")
+    cache_rows = [(agent, model, stats) for agent, row in report.items() for model, stats in (row.get("prompt_cache") or {}).items()]
+    if cache_rows:
+        lines.append("")
+        lines.append(f"{'agent':<24} {'model':<12} {'llm turns':>9} {'input':>10} {'cached':>10} {'hit ratio':>9} {'prefix changes':>15}")
+        for agent, model, stats in cache_rows:
+            ratio = "-" if stats["cache_hit_ratio"] is None else f"{stats['cache_hit_ratio']:.2%}"
+            changes = f"{stats['prefix_changes']} ({stats['tool_order_only_changes']} order)"
+            lines.append(
+                f"{agent:<24} {model:<12} {stats['turns']:>9} {stats['input_tokens']:>10} {stats['cached_input_tokens']:>10} {ratio:>9} {changes:>15}"
+            )
+    return "\n".join(lines)
+
+
+def _fmt(value: float | None) -> str:
+    return "-" if value is None else str(int(value))
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if not args.log.exists():
+        print(f"Log file not found: {args.log}", file=sys.stderr)
+        return 1
+    turn_events: list[dict[str, Any]] = []
+    cache_events: list[tuple[str, dict[str, Any]]] = []
+    with args.log.open(encoding="utf-8") as handle:
+        for message, payload in iter_events(handle, {TURN_EVENT_MESSAGE, LLM_TURN_EVENT_MESSAGE, PREFIX_CHANGE_EVENT_MESSAGE}):
+            if message == TURN_EVENT_MESSAGE:
+                turn_events.append(payload)
+            else:
+                cache_events.append((message, payload))
+    report: dict[str, dict[str, Any]] = aggregate(turn_events, args.agent or None)
+    for agent, by_model in aggregate_prompt_cache(cache_events, args.agent or None).items():
+        report.setdefault(agent, {})["prompt_cache"] = by_model
+    print(json.dumps(report, ensure_ascii=False, indent=2) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
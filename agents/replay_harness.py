@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""Offline record/replay benchmark for the fast-agent runtime and its profiling hooks.
+
+Record: run the service with ``COPILOT_RECORD_DIR=<dir>``; ``run_fast_agent.py`` then writes the
+Responses-API streams, MCP tool results and first agent inputs of every session as JSONL fixtures.
+
+Replay: this script serves those fixtures from a local Responses-API stand-in and fake MCP servers,
+starts ``run_fast_agent.py serve`` against them (no network), drives N concurrent sessions through the
+served agent and reports per-turn runtime overhead, request latency and RSS growth.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+import uvicorn
+import yaml
+from mcp import ClientSession, types
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.server.lowlevel import Server
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from profiling_report import aggregate, iter_turn_events, percentile
+
+AGENTS_DIR = Path(__file__).resolve().parent
+DEFAULT_CONFIG_PATH = AGENTS_DIR / "fastagent.config.yaml"
+DEFAULT_AGENT_CARDS = AGENTS_DIR / "agent-cards"
+REPLAY_PROVIDER = "responses"
+# Card settings that would let replayed tool calls act on this machine; the replay copies override them.
+REPLAY_CARD_OVERRIDES = {"shell": False}
+RSS_SAMPLE_SECONDS = 0.5
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay recorded LLM streams and MCP tool results through run_fast_agent.py")
+    parser.add_argument("fixtures", type=Path, help="Directory recorded with COPILOT_RECORD_DIR")
+    parser.add_argument("--agent", required=True, help="Agent card to drive, e.g. create_tasks")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent sessions (pm2 runs one serve process)")
+    parser.add_argument("--sessions", type=int, default=20, help="Total sessions to run")
+    parser.add_argument("--chunk-delay-ms", type=float, default=0.0, help="Pause between replayed stream events")
+    parser.add_argument("--config-path", type=Path, default=DEFAULT_CONFIG_PATH)
+    parser.add_argument("--agent-cards", type=Path, default=DEFAULT_AGENT_CARDS)
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    parser.add_argument("--json-out", type=Path, help="Write the benchmark summary as JSON")
+    parser.add_argument("--keep-workdir", action="store_true", help="Keep the generated config and logs")
+    return parser.parse_args(argv)
+
+
+def read_jsonl(path: Path) -> list[dict[str, Any]]:
+    if not path.exists():
+        return []
+    records = []
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if line:
+                record = json.loads(line)
+                if "error" not in record:
+                    records.append(record)
+    return records
+
+
+@dataclass
+class Fixtures:
+    streams: dict[int, list[list[dict[str, Any]]]] = field(default_factory=lambda: defaultdict(list))
+    tools: dict[str, dict[str, list[dict[str, Any]]]] = field(default_factory=lambda: defaultdict(lambda: defaultdict(list)))
+    inputs: list[str] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, directory: Path, agent: str) -> Fixtures:
+        fixtures = cls()
+        for record in read_jsonl(directory / "llm-streams.jsonl"):
+            if record.get("agent_name") in {agent, None}:
+                fixtures.streams[int(record.get("turn_index", 0))].append(record["events"])
+        for record in read_jsonl(directory / "tool-results.jsonl"):
+            fixtures.tools[record.get("server_name") or ""][record["tool_name"]].append(record)
+        for record in read_jsonl(directory / "agent-inputs.jsonl"):
+            if record.get("agent_name") == agent:
+                fixtures.inputs.append("\n".join(record.get("texts") or []))
+        if not fixtures.streams:
+            raise SystemExit(f"No recorded streams for agent {agent!r} in {directory}")
+        if not fixtures.inputs:
+            raise SystemExit(f"No recorded inputs for agent {agent!r} in {directory}")
+        return fixtures
+
+
+def assistant_turns_in(request_input: Any) -> int:
+    """Number of assistant turns already in a Responses request, i.e. the index of the turn requested."""
+    if not isinstance(request_input, list):
+        return 0
+    turns = 0
+    in_assistant = False
+    for item in request_input:
+        is_assistant = isinstance(item, dict) and (
+            item.get("type") in {"function_call", "reasoning"} or item.get("role") == "assistant"
+        )
+        if is_assistant and not in_assistant:
+            turns += 1
+        in_assistant = is_assistant
+    return turns
+
+
+class ResponsesStandIn:
+    """Local ``POST .../responses`` endpoint streaming recorded events as SSE, chosen by turn index."""
+
+    def __init__(self, fixtures: Fixtures, chunk_delay_ms: float) -> None:
+        self._fixtures = fixtures
+        self._chunk_delay = chunk_delay_ms / 1000
+        self._cursors = {turn: itertools.cycle(streams) for turn, streams in fixtures.streams.items()}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.unmatched = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+
+    def next_stream(self, turn_index: int) -> list[dict[str, Any]]:
+        with self._lock:
+            self.requests += 1
+            cursor = self._cursors.get(turn_index)
+            if cursor is None:
+                # Sessions can run longer than any recording; reuse the deepest recorded turn.
+                self.unmatched += 1
+                cursor = self._cursors[max(self._cursors)]
+            return next(cursor)
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:  # noqa: N802
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if not self.path.rstrip("/").endswith("/responses"):
+                    self.send_error(404)
+                    return
+                events = stand_in.next_stream(assistant_turns_in(body.get("input")))
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                for event in events:
+                    payload = json.dumps(event, ensure_ascii=False)
+                    self.wfile.write(f"event: {event.get('type', 'message')}\ndata: {payload}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                    if stand_in._chunk_delay:
+                        time.sleep(stand_in._chunk_delay)
+                self.close_connection = True
+
+            def log_message(self, format: str, *args: Any) -> None:
+                return None
+
+        return Handler
+
+    def start(self) -> None:
+        threading.Thread(target=self._server.serve_forever, name="responses-stand-in", daemon=True).start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+
+
+def build_fake_mcp_server(name: str, tools: dict[str, list[dict[str, Any]]]) -> Server:
+    """Low-level MCP server exposing the recorded tools of one server; results match on canonical arguments."""
+    server: Server = Server(f"replay-{name}")
+    by_arguments = {
+        tool_name: {json.dumps(record.get("arguments") or {}, sort_keys=True): record["result"] for record in records}
+        for tool_name, records in tools.items()
+    }
+    cursors = {tool_name: itertools.cycle(records) for tool_name, records in tools.items()}
+
+    @server.list_tools()
+    async def list_tools() -> list[types.Tool]:
+        return [
+            types.Tool(name=tool_name, description=f"Replayed {name}.{tool_name}", inputSchema={"type": "object", "additionalProperties": True})
+            for tool_name in tools
+        ]
+
+    @server.call_tool()
+    async def call_tool(tool_name: str, arguments: dict[str, Any]) -> list[Any]:
+        if tool_name not in tools:
+            raise ValueError(f"No recording for {name}.{tool_name}")
+        recorded = by_arguments[tool_name].get(json.dumps(arguments or {}, sort_keys=True))
+        if recorded is None:
+            recorded = next(cursors[tool_name])["result"]
+        result = types.CallToolResult.model_validate(recorded)
+        if result.isError:
+            raise ValueError(" ".join(getattr(block, "text", "") for block in result.content) or "recorded tool error")
+        return list(result.content)
+
+    return server
+
+
+async def serve_fake_mcp(name: str, tools: dict[str, list[dict[str, Any]]], port: int) -> uvicorn.Server:
+    manager = StreamableHTTPSessionManager(app=build_fake_mcp_server(name, tools), stateless=True)
+
+    async def handle(scope: Any, receive: Any, send: Any) -> None:
+        await manager.handle_request(scope, receive, send)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette):  # type: ignore[no-untyped-def]
+        async with manager.run():
+            yield
+
+    app = Starlette(routes=[Mount("/mcp", app=handle)], lifespan=lifespan)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    return server
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def split_front_matter(text: str) -> tuple[dict[str, Any], str] | None:
+    if not text.startswith("---\n"):
+        return None
+    end = text.find("\n---\n", 4)
+    if end < 0:
+        return None
+    front = yaml.safe_load(text[4:end]) or {}
+    return (front, text[end + 5 :]) if isinstance(front, dict) else None
+
+
+def prepare_replay_cards(source: Path, target: Path) -> list[str]:
+    """Copy the card set into ``target`` with shell access switched off; returns the cards that were changed.
+
+    Recorded streams replay the model's tool calls verbatim, and a card with ``shell: true`` would run
+    the recorded commands for real. In the copies those calls fail as unknown tools instead.
+    """
+    target.mkdir(parents=True, exist_ok=True)
+    cards = sorted(source.glob("*.md")) if source.is_dir() else [source] if source.is_file() else []
+    if not cards:
+        raise SystemExit(f"No agent cards at {source}")
+    changed: list[str] = []
+    for card in cards:
+        text = card.read_text(encoding="utf-8")
+        parsed = split_front_matter(text)
+        if parsed is not None:
+            front, body = parsed
+            overrides = {key: value for key, value in REPLAY_CARD_OVERRIDES.items() if key in front and front[key] != value}
+            if overrides:
+                front.update(overrides)
+                text = "---\n" + yaml.safe_dump(front, allow_unicode=True, sort_keys=False) + "---\n" + body
+                changed.append(card.name)
+        (target / card.name).write_text(text, encoding="utf-8")
+    return changed
+
+
+def write_replay_config(base_config: Path, workdir: Path, responses_port: int, mcp_ports: dict[str, int]) -> Path:
+    """Copy of the fast-agent config with every MCP server and the model provider pointed at local stand-ins."""
+    config = yaml.safe_load(base_config.read_text(encoding="utf-8")) or {}
+    base_url = f"http://127.0.0.1:{responses_port}/v1"
+    for provider in ("openai", REPLAY_PROVIDER):
+        config[provider] = {**(config.get(provider) or {}), "api_key": "replay", "base_url": base_url}
+    config["mcp"] = {
+        "servers": {name: {"transport": "http", "url": f"http://127.0.0.1:{port}/mcp"} for name, port in mcp_ports.items()}
+    }
+    config["logger"] = {
+        **(config.get("logger") or {}),
+        "type": "file",
+        "path": str(workdir / "fastagent-execution.jsonl"),
+        "progress_display": False,
+        "show_chat": False,
+        "show_tools": False,
+        "streaming": "none",
+    }
+    path = workdir / "fastagent.config.yaml"
+    path.write_text(yaml.safe_dump(config, allow_unicode=True, sort_keys=False), encoding="utf-8")
+    return path
+
+
+def read_rss_kb(pid: int) -> int | None:
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+async def sample_rss(pid: int, samples: list[tuple[float, int]], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        rss = read_rss_kb(pid)
+        if rss is not None:
+            samples.append((time.monotonic(), rss))
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(stop.wait(), RSS_SAMPLE_SECONDS)
+
+
+async def wait_for_port(port: int, timeout: float, process: asyncio.subprocess.Process) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.returncode is not None:
+            raise SystemExit(f"run_fast_agent.py exited during startup with code {process.returncode}")
+        with contextlib.suppress(OSError):
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        await asyncio.sleep(0.2)
+    raise SystemExit(f"run_fast_agent.py did not listen on {port} within {timeout}s")
+
+
+async def run_session(url: str, agent: str, message: str) -> float:
+    started = time.monotonic()
+    async with streamablehttp_client(url) as (read, write, _):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            listed = await session.list_tools()
+            names = [tool.name for tool in listed.tools]
+            tool_name = f"{agent}_send" if f"{agent}_send" in names else next((name for name in names if name.startswith(agent)), None)
+            if tool_name is None:
+                raise RuntimeError(f"Agent {agent!r} is not exposed by the served app (tools: {names})")
+            result = await session.call_tool(tool_name, {"message": message})
+            if result.isError:
+                raise RuntimeError(" ".join(getattr(block, "text", "") for block in result.content))
+    return (time.monotonic() - started) * 1000
+
+
+async def drive_sessions(url: str, agent: str, inputs: list[str], sessions: int, concurrency: int) -> tuple[list[float], list[str]]:
+    latencies: list[float] = []
+    errors: list[str] = []
+    messages = itertools.cycle(inputs)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(message: str) -> None:
+        async with semaphore:
+            try:
+                latencies.append(await run_session(url, agent, message))
+            except Exception as exc:
+                errors.append(str(exc))
+
+    await asyncio.gather(*(one(next(messages)) for _ in range(sessions)))
+    return latencies, errors
+
+
+async def replay(args: argparse.Namespace, workdir: Path) -> dict[str, Any]:
+    fixtures = Fixtures.load(args.fixtures, args.agent)
+    stand_in = ResponsesStandIn(fixtures, args.chunk_delay_ms)
+    stand_in.start()
+
+    base_config = yaml.safe_load(args.config_path.read_text(encoding="utf-8")) or {}
+    server_names = set((base_config.get("mcp") or {}).get("servers") or {}) | set(fixtures.tools)
+    mcp_ports = {name: free_port() for name in sorted(server_names)}
+    mcp_servers = [await serve_fake_mcp(name, fixtures.tools.get(name, {}), port) for name, port in mcp_ports.items()]
+    config_path = write_replay_config(args.config_path, workdir, stand_in.port, mcp_ports)
+    cards_dir = workdir / "agent-cards"
+    for card in prepare_replay_cards(args.agent_cards, cards_dir):
+        print(f"replay: {card}: shell disabled; recorded shell calls fail as unknown tools", file=sys.stderr)
+
+    agent_port = free_port()
+    env = {
+        **os.environ,
+        "COPILOT_MODEL_PROVIDER": REPLAY_PROVIDER,
+        "COPILOT_PROFILING_LOG": str(workdir / "copilot-profiling.jsonl"),
+        "OPENAI_API_KEY": "replay",
+        "PYTHONUNBUFFERED": "1",
+    }
+    env.pop("COPILOT_RECORD_DIR", None)
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        str(AGENTS_DIR / "run_fast_agent.py"),
+        "serve",
+        "--config-path", str(config_path),
+        "--agent-cards", str(cards_dir),
+        "--name", "copilot-agent-replay",
+        "--transport", "http",
+        "--host", "127.0.0.1",
+        "--port", str(agent_port),
+        "--instance-scope", "request",
+        cwd=str(AGENTS_DIR),
+        env=env,
+        stdout=(workdir / "serve.log").open("wb"),
+        stderr=asyncio.subprocess.STDOUT,
+    )
+    rss_samples: list[tuple[float, int]] = []
+    stop_sampling = asyncio.Event()
+    try:
+        await wait_for_port(agent_port, args.startup_timeout, process)
+        sampler = asyncio.create_task(sample_rss(process.pid, rss_samples, stop_sampling))
+        started = time.monotonic()
+        latencies, errors = await drive_sessions(
+            f"http://127.0.0.1:{agent_port}/mcp", args.agent, fixtures.inputs, args.sessions, args.concurrency
+        )
+        wall_ms = (time.monotonic() - started) * 1000
+        stop_sampling.set()
+        await sampler
+    finally:
+        stop_sampling.set()
+        if process.returncode is None:
+            process.terminate()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(process.wait(), 15)
+            if process.returncode is None:
+                process.kill()
+        for server in mcp_servers:
+            server.should_exit = True
+        stand_in.stop()
+
+    log_path = workdir / "copilot-profiling.jsonl"
+    turns: dict[str, dict[str, Any]] = {}
+    if log_path.exists():
+        with log_path.open(encoding="utf-8") as handle:
+            turns = aggregate(iter_turn_events(handle), [args.agent])
+    rss_values = [rss for _, rss in rss_samples]
+    return {
+        "agent": args.agent,
+        "sessions": args.sessions,
+        "concurrency": args.concurrency,
+        "wall_ms": int(wall_ms),
+        "sessions_per_second": round(len(latencies) / (wall_ms / 1000), 3) if wall_ms else None,
+        "errors": len(errors),
+        "error_samples": errors[:5],
+        "session_latency_ms": {"p50": percentile(latencies, 50), "p95": percentile(latencies, 95), "max": max(latencies, default=None)},
+        "llm_requests": stand_in.requests,
+        "llm_requests_past_recorded_turns": stand_in.unmatched,
+        "turns": turns.get(args.agent, {}),
+        "rss_kb": {
+            "start": rss_values[0] if rss_values else None,
+            "peak": max(rss_values, default=None),
+            "end": rss_values[-1] if rss_values else None,
+            "growth_per_session": round((rss_values[-1] - rss_values[0]) / args.sessions, 1) if len(rss_values) > 1 else None,
+        },
+    }
+
+
+def format_summary(summary: dict[str, Any]) -> str:
+    overhead = summary["turns"].get("overhead_ms") or {}
+    lines = [
+        f"agent={summary['agent']} sessions={summary['sessions']} concurrency={summary['concurrency']} errors={summary['errors']}",
+        f"wall={summary['wall_ms']}ms throughput={summary['sessions_per_second']} sessions/s",
+        "session latency ms p50={p50} p95={p95} max={max}".format(**summary["session_latency_ms"]),
+        f"turns={summary['turns'].get('turns', 0)} runtime overhead ms p50={overhead.get('p50')} p95={overhead.get('p95')}",
+        "rss kb start={start} peak={peak} end={end} growth/session={growth_per_session}".format(**summary["rss_kb"]),
+    ]
+    if summary["llm_requests_past_recorded_turns"]:
+        lines.append(f"note: {summary['llm_requests_past_recorded_turns']} LLM requests went past the recorded turn depth")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    workdir = Path(tempfile.mkdtemp(prefix="copilot-replay-"))
+    try:
+        summary = asyncio.run(replay(args, workdir))
+    finally:
+        if args.keep_workdir:
+            print(f"workdir: {workdir}", file=sys.stderr)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+    print(format_summary(summary))
+    if args.json_out:
+        args.json_out.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
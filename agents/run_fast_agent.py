@@ -3,18 +3,1327 @@
 
 from __future__ import annotations
 
+import asyncio
+import atexit
+import contextvars
+import hashlib
+import inspect
 import json
+import os
+import queue
+import random
+import sys
+import threading
 import time
-from collections.abc import Mapping, Sequence
+import uuid
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any
 
 from fast_agent.cli.__main__ import main as fast_agent_main
-from fast_agent.core.logging.logger import get_logger
 from fast_agent.llm.model_database import ModelDatabase
 from fast_agent.llm.model_factory import ModelFactory
 from fast_agent.llm.provider_types import Provider
 
-profiling_logger = get_logger("copilot.fast_agent.profiling")
+# Fraction of tool calls whose result is fully serialized to JSON for exact sizes; the rest use the block-walk estimate.
+TOOL_RESULT_FULL_MEASURE_RATE = float(os.environ.get("COPILOT_PROFILING_FULL_MEASURE_RATE", "0.01"))
+PROFILING_QUEUE_MAXSIZE = 1024
+# JSONL file the profiling worker appends events to (profiling_report.py reads it).
+PROFILING_LOG_PATH = Path(os.environ.get("COPILOT_PROFILING_LOG") or Path(__file__).resolve().parent / "logs" / "copilot-profiling.jsonl")
+PROFILING_LOG_NAMESPACE = "copilot.fast_agent.profiling"
+# Optional cap on text kept per stream for the fallback path; unset or 0 keeps everything.
+STREAM_BUFFER_MAX_BYTES = int(os.environ.get("COPILOT_STREAM_BUFFER_MAX_BYTES", "0") or 0) or None
+# When set, LLM streams, MCP tool results and agent inputs are written here as replay fixtures (see replay_harness.py).
+RECORD_DIR = os.environ.get("COPILOT_RECORD_DIR") or None
+# Provider behind the gpt54/gpt54mini aliases; the replay harness switches it to "responses" to reach its local stand-in.
+MODEL_PROVIDER = os.environ.get("COPILOT_MODEL_PROVIDER") or None
+DEFAULT_CONFIG_PATH = Path(__file__).resolve().parent / "fastagent.config.yaml"
+# Top-level section of fastagent.config.yaml holding the settings of these local hooks.
+COPILOT_CONFIG_SECTION = "copilot"
+
+
+def load_copilot_config(argv: Sequence[str] | None = None) -> dict[str, Any]:
+    """Read the ``copilot`` section of the fast-agent config the process was started with."""
+    args = list(sys.argv[1:] if argv is None else argv)
+    config_path = DEFAULT_CONFIG_PATH
+    for index, arg in enumerate(args):
+        if arg == "--config-path" and index + 1 < len(args):
+            config_path = Path(args[index + 1])
+        elif arg.startswith("--config-path="):
+            config_path = Path(arg.split("=", 1)[1])
+    if not config_path.exists():
+        return {}
+    import yaml
+
+    with config_path.open(encoding="utf-8") as handle:
+        payload = yaml.safe_load(handle) or {}
+    section = payload.get(COPILOT_CONFIG_SECTION) if isinstance(payload, Mapping) else None
+    return dict(section) if isinstance(section, Mapping) else {}
+
+
+class _ProfilingLogQueue:
+    """Hands profiling events to a worker thread so the event loop only pays for an enqueue.
+
+    The worker runs optional ``enrich`` callables (e.g. sampled full serialization), formats each
+    event and appends it to ``log_path`` (plus the per-agent file in host mode). ``drain``
+    (registered with ``atexit``) lets the worker finish the queued events; events submitted without
+    a running loop, or after the drain, are written on the calling thread.
+    """
+
+    def __init__(self, maxsize: int = PROFILING_QUEUE_MAXSIZE, log_path: Path | None = PROFILING_LOG_PATH) -> None:
+        self._queue: queue.Queue[tuple[str, dict[str, Any], Callable[[], dict[str, Any]] | None] | None] = queue.Queue(maxsize=maxsize)
+        self._worker: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self._dropped = 0
+        self.log_path = log_path
+        # Host mode: also append each event to <per_agent_log_dir>/<agent_name>.jsonl.
+        self.per_agent_log_dir: Path | None = None
+
+    def submit(self, message: str, data: dict[str, Any], enrich: Callable[[], dict[str, Any]] | None = None) -> None:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._emit(message, data, enrich)
+            return
+        if self._closed:
+            self._emit(message, data, enrich)
+            return
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((message, data, enrich))
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+
+    def drain(self, timeout: float = 5.0) -> None:
+        """Stop accepting queued events and wait for the worker to write the ones it holds."""
+        self._closed = True
+        worker = self._worker
+        if worker is not None and worker.is_alive():
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+            worker.join(timeout)
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="copilot-profiling-log", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            self._emit(*item)
+
+    def _emit(self, message: str, data: dict[str, Any], enrich: Callable[[], dict[str, Any]] | None) -> None:
+        if enrich is not None:
+            try:
+                data.update(enrich())
+            except Exception as exc:
+                data["profiling_enrich_error"] = str(exc)
+        with self._lock:
+            dropped, self._dropped = self._dropped, 0
+        if dropped:
+            data["profiling_events_dropped"] = dropped
+        record = {
+            "level": "INFO",
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "namespace": PROFILING_LOG_NAMESPACE,
+            "message": message,
+            "data": data,
+        }
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        if self.log_path is not None:
+            self._append(self.log_path, line)
+        if self.per_agent_log_dir is not None:
+            agent_name = str(data.get("agent_name") or "_runtime")
+            safe_name = "".join(char if char.isalnum() or char in "-_." else "_" for char in agent_name)
+            self._append(self.per_agent_log_dir / f"{safe_name}.jsonl", line)
+
+    @staticmethod
+    def _append(path: Path, line: str) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("a", encoding="utf-8") as handle:
+                handle.write(line)
+        except OSError:
+            pass
+
+
+_profiling_queue = _ProfilingLogQueue()
+atexit.register(_profiling_queue.drain)
+
+class _StreamTextBuffer:
+    """Append-only text buffer for one stream: amortized O(1) appends, joined lazily on read."""
+
+    __slots__ = ("_parts", "_joined", "byte_count", "max_bytes", "truncated")
+
+    def __init__(self, max_bytes: int | None = None) -> None:
+        self._parts: list[str] = []
+        self._joined: str | None = ""
+        self.byte_count = 0
+        self.max_bytes = max_bytes
+        self.truncated = False
+
+    def __bool__(self) -> bool:
+        return self.byte_count > 0
+
+    def append(self, text: str) -> None:
+        if not text or self.truncated:
+            return
+        size = _utf8_len(text)
+        if self.max_bytes is not None and self.byte_count + size > self.max_bytes:
+            keep = self.max_bytes - self.byte_count
+            text = text.encode("utf-8")[:keep].decode("utf-8", errors="ignore")
+            size = _utf8_len(text)
+            self.truncated = True
+            if not text:
+                return
+        self._parts.append(text)
+        self._joined = None
+        self.byte_count += size
+
+    def text(self) -> str:
+        if self._joined is None:
+            self._joined = "".join(self._parts)
+            # Collapse to the joined string so repeated reads stay cheap.
+            self._parts = [self._joined]
+        return self._joined
+
+
+class _TurnBreakdown:
+    """Wall-time split of one agent turn: an LLM call plus the MCP tool calls it requested.
+
+    ``profiled_generate_with_summary`` opens the turn; stream and tool hooks running in the same task
+    context record into it. A turn that ends in tool use stays open until the follow-up LLM call starts,
+    so its tools are counted, and is emitted then, or when the agent call returns without one
+    (``_closing_pending_turn``). A turn answered without tools is emitted immediately.
+    """
+
+    def __init__(self, agent_name: str | None) -> None:
+        self.turn_id = uuid.uuid4().hex[:16]
+        self.agent_name = agent_name
+        self.started = time.monotonic()
+        self.generate_finished: float | None = None
+        self.first_chunk: float | None = None
+        self.stream_finished: float | None = None
+        self.model: str | None = None
+        self.tools: list[dict[str, Any]] = []
+        self._tool_spans: list[tuple[float, float]] = []
+
+    def record_stream(self, *, model: str | None, first_chunk: float | None, finished: float) -> None:
+        self.model = model
+        self.first_chunk = first_chunk
+        self.stream_finished = finished
+
+    def record_tool(self, *, server_name: str | None, tool_name: str, started: float, finished: float, status: str) -> None:
+        self._tool_spans.append((started, finished))
+        self.tools.append(
+            {
+                "server_name": server_name,
+                "tool_name": tool_name,
+                "duration_ms": int((finished - started) * 1000),
+                "status": status,
+            }
+        )
+
+    def _tools_wall_ms(self) -> int:
+        # Parallel tool calls overlap; count the union of their spans, not the sum.
+        total = 0.0
+        current_start: float | None = None
+        current_end = 0.0
+        for start, end in sorted(self._tool_spans):
+            if current_start is None or start > current_end:
+                if current_start is not None:
+                    total += current_end - current_start
+                current_start, current_end = start, end
+            else:
+                current_end = max(current_end, end)
+        if current_start is not None:
+            total += current_end - current_start
+        return int(total * 1000)
+
+    def summary(self) -> dict[str, Any]:
+        finished = max([self.generate_finished or self.started] + [end for _, end in self._tool_spans])
+        total_ms = int((finished - self.started) * 1000)
+        stream_end = self.stream_finished or self.generate_finished or self.started
+        llm_wait_ms = int(((self.first_chunk or stream_end) - self.started) * 1000)
+        streaming_ms = int((stream_end - self.first_chunk) * 1000) if self.first_chunk is not None else 0
+        tools_ms = self._tools_wall_ms()
+        return {
+            "turn_id": self.turn_id,
+            "agent_name": self.agent_name,
+            "model": self.model,
+            "model_alias": _model_alias_label(self.model),
+            "turn_total_ms": total_ms,
+            "llm_wait_ms": llm_wait_ms,
+            "streaming_ms": streaming_ms,
+            "tools_ms": tools_ms,
+            "tool_calls": self.tools,
+            "overhead_ms": max(total_ms - llm_wait_ms - streaming_ms - tools_ms, 0),
+        }
+
+
+_current_turn: contextvars.ContextVar[_TurnBreakdown | None] = contextvars.ContextVar("copilot_current_turn", default=None)
+
+
+def _current_turn_id() -> str | None:
+    turn = _current_turn.get()
+    return turn.turn_id if turn is not None else None
+
+
+def _emit_turn_breakdown(turn: _TurnBreakdown) -> None:
+    _profiling_queue.submit("Agent turn critical path", turn.summary())
+
+
+def _closing_pending_turn(generate: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Wrap an agent's outer ``generate`` so a turn still open when it returns is emitted.
+
+    That is the turn of a final LLM call that requested tools but got no follow-up call (tool
+    iteration limit, failing tools). A nested agent call starts without the caller's open turn and
+    restores it on return.
+    """
+
+    async def generate_closing_turn(self, *args, **kwargs):  # type: ignore[no-untyped-def]
+        token = _current_turn.set(None)
+        try:
+            return await generate(self, *args, **kwargs)
+        finally:
+            pending = _current_turn.get()
+            _current_turn.reset(token)
+            if pending is not None:
+                _emit_turn_breakdown(pending)
+
+    return generate_closing_turn
+
+
+class _ToolResultCache:
+    """Size-bounded LRU of MCP tool results with per-tool TTLs, limited to an allow-list of idempotent tools."""
+
+    def __init__(self, *, ttl_by_tool: Mapping[tuple[str, str], float], max_entries: int) -> None:
+        self._ttl_by_tool = dict(ttl_by_tool)
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any] | None) -> _ToolResultCache | None:
+        """Build the cache from ``copilot.tool_cache``; ``None`` unless enabled with at least one allowed tool."""
+        if not isinstance(config, Mapping) or not config.get("enabled", False):
+            return None
+        default_ttl = float(config.get("default_ttl_seconds", 300))
+        ttl_by_tool: dict[tuple[str, str], float] = {}
+        for server_name, tools in (config.get("tools") or {}).items():
+            for tool_name, tool_config in (tools or {}).items():
+                ttl = tool_config.get("ttl_seconds", default_ttl) if isinstance(tool_config, Mapping) else default_ttl
+                if float(ttl) > 0:
+                    ttl_by_tool[(str(server_name), str(tool_name))] = float(ttl)
+        if not ttl_by_tool:
+            return None
+        return cls(ttl_by_tool=ttl_by_tool, max_entries=max(int(config.get("max_entries", 256)), 1))
+
+    def key_for(self, server_name: str, tool_name: str, arguments: Mapping[str, Any] | None) -> str | None:
+        if (server_name, tool_name) not in self._ttl_by_tool:
+            return None
+        try:
+            canonical = json.dumps(_to_jsonable(arguments or {}), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        except (TypeError, ValueError):
+            return None
+        return f"{server_name}\x1f{tool_name}\x1f{canonical}"
+
+    def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return _copy_tool_result(entry[1])
+
+    def put(self, key: str, server_name: str, tool_name: str, result: Any) -> None:
+        if getattr(result, "isError", False):
+            # Failures (including timeouts and fast-fails) are transient; never replay them.
+            return
+        self._entries[key] = (time.monotonic() + self._ttl_by_tool[(server_name, tool_name)], _copy_tool_result(result))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict[str, int]:
+        return {"tool_cache_hits": self.hits, "tool_cache_misses": self.misses, "tool_cache_size": len(self._entries), "tool_cache_evictions": self.evictions}
+
+
+class _ToolOutputBudget:
+    """Per-tool / per-agent byte budgets applied to tool results before they reach the LLM context.
+
+    Budgets count the bytes of text blocks; images and other binary blocks pass through untouched.
+    Text blocks over budget are head/tail-elided (or cut, with ``strategy: truncate``) around an explicit
+    marker; a text block holding a top-level JSON array is paginated instead, keeping the leading items
+    that fit. Any other JSON document that has to be cut is prefixed with a notice that the remaining
+    text is no longer valid JSON.
+    """
+
+    def __init__(
+        self,
+        *,
+        default_max_bytes: int | None,
+        agent_max_bytes: Mapping[str, int],
+        tool_max_bytes: Mapping[tuple[str, str], int],
+        strategy: str,
+        head_ratio: float,
+    ) -> None:
+        self._default_max_bytes = default_max_bytes
+        self._agent_max_bytes = dict(agent_max_bytes)
+        self._tool_max_bytes = dict(tool_max_bytes)
+        self.strategy = strategy
+        self._head_ratio = min(max(head_ratio, 0.0), 1.0)
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any] | None) -> _ToolOutputBudget | None:
+        if not isinstance(config, Mapping) or not config.get("enabled", False):
+            return None
+        default_max_bytes = config.get("default_max_bytes")
+        agent_max_bytes = {
+            str(agent): int(agent_config["max_bytes"])
+            for agent, agent_config in (config.get("agents") or {}).items()
+            if isinstance(agent_config, Mapping) and agent_config.get("max_bytes")
+        }
+        tool_max_bytes = {
+            (str(server_name), str(tool_name)): int(tool_config["max_bytes"])
+            for server_name, tools in (config.get("tools") or {}).items()
+            for tool_name, tool_config in (tools or {}).items()
+            if isinstance(tool_config, Mapping) and tool_config.get("max_bytes")
+        }
+        strategy = str(config.get("strategy", "head_tail"))
+        if strategy not in {"head_tail", "truncate"}:
+            raise ValueError(f"copilot.tool_output_budget.strategy must be head_tail or truncate, got {strategy!r}")
+        return cls(
+            default_max_bytes=int(default_max_bytes) if default_max_bytes else None,
+            agent_max_bytes=agent_max_bytes,
+            tool_max_bytes=tool_max_bytes,
+            strategy=strategy,
+            head_ratio=float(config.get("head_ratio", 0.7)),
+        )
+
+    def limit_for(self, agent_name: str | None, server_name: str, tool_name: str) -> int | None:
+        """Tightest of the tool and agent budgets; the default applies only when neither is set."""
+        limits = [
+            limit
+            for limit in (self._tool_max_bytes.get((server_name, tool_name)), self._agent_max_bytes.get(agent_name or ""))
+            if limit is not None
+        ]
+        return min(limits) if limits else self._default_max_bytes
+
+    def apply(self, result: Any, max_bytes: int) -> tuple[Any, dict[str, Any] | None]:
+        blocks = getattr(result, "content", None)
+        if not isinstance(blocks, list) or not hasattr(result, "model_copy"):
+            return result, None
+        remaining = max_bytes
+        original_bytes = 0
+        kept_bytes = 0
+        actions: list[str] = []
+        new_blocks: list[Any] = []
+        for block in blocks:
+            text = getattr(block, "text", None)
+            if not isinstance(text, str) or not hasattr(block, "model_copy"):
+                new_blocks.append(block)
+                continue
+            size = _utf8_len(text)
+            original_bytes += size
+            if size <= remaining:
+                new_text, action = text, None
+            else:
+                new_text, action = self._shrink(text, size, max(remaining, 0))
+            kept = _utf8_len(new_text)
+            kept_bytes += kept
+            remaining -= kept
+            if action is None:
+                new_blocks.append(block)
+            else:
+                actions.append(action)
+                new_blocks.append(block.model_copy(update={"text": new_text}))
+        if not actions:
+            return result, None
+        return result.model_copy(update={"content": new_blocks}), {
+            "budget_max_bytes": max_bytes,
+            "budget_strategy": self.strategy,
+            "budget_actions": actions,
+            "original_text_bytes": original_bytes,
+            "kept_text_bytes": kept_bytes,
+            "saved_bytes": original_bytes - kept_bytes,
+            "saved_token_estimate": _estimate_tokens(json_bytes=original_bytes - kept_bytes, text_chars=0),
+        }
+
+    def _shrink(self, text: str, size: int, budget: int) -> tuple[str, str]:
+        stripped = text.lstrip()
+        if stripped.startswith(("[", "{")):
+            try:
+                document = json.loads(stripped)
+            except ValueError:
+                document = None
+            if isinstance(document, list):
+                return self._paginate(document, budget), "paginate"
+            if document is not None:
+                notice = f"[copilot: JSON tool output cut to {budget} bytes; the text below is not valid JSON]\n"
+                cut, action = self._cut(text, size, max(budget - _utf8_len(notice), 0))
+                return notice + cut, action
+        return self._cut(text, size, budget)
+
+    def _cut(self, text: str, size: int, budget: int) -> tuple[str, str]:
+        if self.strategy == "truncate":
+            marker = f"\n[copilot: tool output truncated, {size} bytes total, budget {budget} bytes]"
+            return _utf8_slice(text, 0, max(budget - _utf8_len(marker), 0)) + marker, "truncate"
+        marker = f"\n[copilot: elided {{elided}} of {size} bytes of tool output, budget {budget} bytes]\n"
+        room = max(budget - _utf8_len(marker.format(elided=size)), 0)
+        head_bytes = int(room * self._head_ratio)
+        tail_bytes = room - head_bytes
+        head = _utf8_slice(text, 0, head_bytes)
+        tail = _utf8_slice(text, size - tail_bytes, size) if tail_bytes else ""
+        elided = size - _utf8_len(head) - _utf8_len(tail)
+        return head + marker.format(elided=elided) + tail, "head_tail"
+
+    @staticmethod
+    def _paginate(items: list[Any], budget: int) -> str:
+        total = len(items)
+
+        def page_marker(returned: int) -> dict[str, Any]:
+            return {
+                "_copilot_page": {
+                    "returned_items": returned,
+                    "total_items": total,
+                    "omitted_items": total - returned,
+                    "note": "Tool output exceeded its budget; narrow the request to see the remaining items.",
+                }
+            }
+
+        # Reserve room for the marker (sized with the widest counts) plus brackets and separator.
+        used = _utf8_len(json.dumps(page_marker(total), ensure_ascii=False)) + 4
+        kept: list[Any] = []
+        for item in items:
+            size = _utf8_len(json.dumps(item, ensure_ascii=False)) + 2
+            if used + size > budget:
+                break
+            kept.append(item)
+            used += size
+        return json.dumps(kept + [page_marker(len(kept))], ensure_ascii=False)
+
+
+def _utf8_slice(text: str, start: int, end: int) -> str:
+    """Slice by UTF-8 byte offsets, dropping any character split at the edges."""
+    if text.isascii():
+        return text[start:end]
+    return text.encode("utf-8")[start:end].decode("utf-8", errors="ignore")
+
+
+class _CircuitOpenError(RuntimeError):
+    pass
+
+
+class _ToolLatency:
+    """Recent call latencies of one MCP tool."""
+
+    def __init__(self, window: int) -> None:
+        self.samples: deque[float] = deque(maxlen=window)
+        self.ewma_ms: float | None = None
+
+    def observe(self, duration_ms: float, alpha: float) -> None:
+        self.samples.append(duration_ms)
+        self.ewma_ms = duration_ms if self.ewma_ms is None else alpha * duration_ms + (1 - alpha) * self.ewma_ms
+
+    def p95_ms(self, min_samples: int) -> float | None:
+        if len(self.samples) < min_samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+
+
+class _ServerBreaker:
+    """Circuit-breaker state of one MCP server."""
+
+    def __init__(self) -> None:
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.trial_in_flight = False
+
+
+class _ToolResilience:
+    """Adaptive timeouts and hedged retries for idempotent tools and a per-server circuit breaker.
+
+    Latency is tracked per ``(server, tool)``. Idempotent tools time out after ``timeout_multiplier * p95``
+    of their recent calls (clamped to the configured bounds; the upper bound until enough samples exist)
+    and, when still running after their p95, get a second, hedged request; the first successful answer
+    wins. Other tools get no timeout: a cancelled call may still complete on the server, so cutting it
+    off would leave the model guessing whether it took effect. After ``failure_threshold`` consecutive failures the server is fast-failed for
+    ``open_seconds``, then a single trial call decides whether it closes again.
+    """
+
+    def __init__(
+        self,
+        *,
+        idempotent_tools: set[tuple[str, str]],
+        window: int,
+        min_samples: int,
+        ewma_alpha: float,
+        timeout_multiplier: float,
+        min_timeout_seconds: float,
+        max_timeout_seconds: float,
+        hedge_min_delay_ms: float,
+        failure_threshold: int,
+        open_seconds: float,
+    ) -> None:
+        self.idempotent_tools = idempotent_tools
+        self.window = window
+        self.min_samples = min_samples
+        self.ewma_alpha = ewma_alpha
+        self.timeout_multiplier = timeout_multiplier
+        self.min_timeout_seconds = min_timeout_seconds
+        self.max_timeout_seconds = max_timeout_seconds
+        self.hedge_min_delay_ms = hedge_min_delay_ms
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self._tools: dict[tuple[str, str], _ToolLatency] = {}
+        self._servers: dict[str, _ServerBreaker] = {}
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any] | None) -> _ToolResilience | None:
+        if not isinstance(config, Mapping) or not config.get("enabled", False):
+            return None
+        breaker = config.get("circuit_breaker") or {}
+        return cls(
+            idempotent_tools={
+                (str(server_name), str(tool_name))
+                for server_name, tools in (config.get("idempotent_tools") or {}).items()
+                for tool_name in tools or []
+            },
+            window=int(config.get("latency_window", 200)),
+            min_samples=int(config.get("min_samples", 20)),
+            ewma_alpha=float(config.get("ewma_alpha", 0.2)),
+            timeout_multiplier=float(config.get("timeout_multiplier", 3.0)),
+            min_timeout_seconds=float(config.get("min_timeout_seconds", 5)),
+            max_timeout_seconds=float(config.get("max_timeout_seconds", 120)),
+            hedge_min_delay_ms=float(config.get("hedge_min_delay_ms", 200)),
+            failure_threshold=int(breaker.get("failure_threshold", 5)),
+            open_seconds=float(breaker.get("open_seconds", 30)),
+        )
+
+    def server(self, server_name: str) -> _ServerBreaker:
+        state = self._servers.get(server_name)
+        if state is None:
+            state = self._servers[server_name] = _ServerBreaker()
+        return state
+
+    def tool(self, server_name: str, tool_name: str) -> _ToolLatency:
+        key = (server_name, tool_name)
+        state = self._tools.get(key)
+        if state is None:
+            state = self._tools[key] = _ToolLatency(self.window)
+        return state
+
+    def timeout_for(self, server_name: str, tool_name: str) -> float | None:
+        if (server_name, tool_name) not in self.idempotent_tools:
+            return None
+        p95 = self.tool(server_name, tool_name).p95_ms(self.min_samples)
+        if p95 is None:
+            return self.max_timeout_seconds
+        return min(max(self.timeout_multiplier * p95 / 1000, self.min_timeout_seconds), self.max_timeout_seconds)
+
+    def hedge_delay_for(self, server_name: str, tool_name: str) -> float | None:
+        if (server_name, tool_name) not in self.idempotent_tools:
+            return None
+        p95 = self.tool(server_name, tool_name).p95_ms(self.min_samples)
+        return None if p95 is None else max(p95, self.hedge_min_delay_ms) / 1000
+
+    def breaker_state(self, server_name: str) -> str:
+        state = self.server(server_name)
+        if state.consecutive_failures < self.failure_threshold:
+            return "closed"
+        return "open" if time.monotonic() < state.open_until else "half_open"
+
+    def _admit(self, server_name: str) -> str | None:
+        """Breaker state the call is admitted under (``closed`` or ``half_open`` trial), None when rejected."""
+        state = self.server(server_name)
+        breaker = self.breaker_state(server_name)
+        if breaker == "closed":
+            return breaker
+        if breaker == "half_open" and not state.trial_in_flight:
+            state.trial_in_flight = True
+            return breaker
+        return None
+
+    def _record(self, server_name: str, tool_name: str, *, ok: bool, duration_ms: float | None = None) -> None:
+        state = self.server(server_name)
+        state.trial_in_flight = False
+        if ok:
+            state.consecutive_failures = 0
+            if duration_ms is not None:
+                self.tool(server_name, tool_name).observe(duration_ms, self.ewma_alpha)
+            return
+        state.consecutive_failures += 1
+        if state.consecutive_failures >= self.failure_threshold:
+            state.open_until = time.monotonic() + self.open_seconds
+
+    async def call(self, invoke: Callable[[], Awaitable[Any]], server_name: str, tool_name: str) -> tuple[Any, dict[str, Any]]:
+        admitted = self._admit(server_name)
+        if admitted is None:
+            raise _CircuitOpenError(f"MCP server {server_name!r} is failing; circuit open, call skipped")
+        timeout = self.timeout_for(server_name, tool_name)
+        hedge_delay = self.hedge_delay_for(server_name, tool_name)
+        info: dict[str, Any] = {"timeout_seconds": None if timeout is None else round(timeout, 3), "hedged": False}
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        primary = asyncio.ensure_future(invoke())
+        pending: set[asyncio.Future[Any]] = {primary}
+        try:
+            if hedge_delay is not None and timeout is not None and hedge_delay < timeout:
+                done, _ = await asyncio.wait(pending, timeout=hedge_delay)
+                if not done:
+                    pending.add(asyncio.ensure_future(invoke()))
+                    info["hedged"] = True
+            first_error: BaseException | None = None
+            while pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        duration_ms = (time.monotonic() - started) * 1000
+                        self._record(server_name, tool_name, ok=True, duration_ms=duration_ms)
+                        if info["hedged"]:
+                            info["hedge_won"] = task is not primary
+                        return task.result(), info
+                    first_error = first_error or task.exception()
+            if first_error is not None and not pending:
+                self._record(server_name, tool_name, ok=False)
+                raise first_error
+            self._record(server_name, tool_name, ok=False)
+            raise TimeoutError(f"MCP tool {server_name}.{tool_name} timed out after {timeout:.1f}s (adaptive timeout)")
+        finally:
+            for task in pending:
+                task.cancel()
+            if admitted == "half_open":
+                # A cancelled trial (e.g. the turn was aborted) is neither success nor failure; let the next call retry.
+                self.server(server_name).trial_in_flight = False
+
+    def stats(self, server_name: str, tool_name: str) -> dict[str, Any]:
+        state = self.tool(server_name, tool_name)
+        p95 = state.p95_ms(self.min_samples)
+        return {
+            "tool_latency_ewma_ms": None if state.ewma_ms is None else int(state.ewma_ms),
+            "tool_latency_p95_ms": None if p95 is None else int(p95),
+            "server_breaker_state": self.breaker_state(server_name),
+        }
+
+
+def _copy_tool_result(result: Any) -> Any:
+    # Callers may annotate or trim results in place; never hand out the cached instance itself.
+    if hasattr(result, "model_copy") and callable(result.model_copy):
+        return result.model_copy(deep=True)
+    return result
+
+
+# Offline BPE tables: tiktoken reads them from this directory and downloads any table missing from it.
+TOKENIZER_CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "tiktoken"
+DEFAULT_TOKENIZER_ENCODING = "o200k_base"
+TIKTOKEN_BLOB_URL = "https://openaipublic.blob.core.windows.net/encodings/{encoding}.tiktoken"
+
+
+def _tiktoken_cache_file(cache_dir: Path, encoding_name: str) -> Path:
+    # tiktoken caches each downloaded table under the SHA-1 of its blob URL.
+    return cache_dir / hashlib.sha1(TIKTOKEN_BLOB_URL.format(encoding=encoding_name).encode()).hexdigest()
+
+
+class _TokenCounter:
+    """Local BPE token counts (tiktoken, cached tables); falls back to the byte heuristic when unavailable."""
+
+    def __init__(self, encoding_name: str = DEFAULT_TOKENIZER_ENCODING) -> None:
+        self.encoding_name = encoding_name
+        self._encoding: Any = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.load_error: str | None = None
+
+    def _load(self) -> Any:
+        if self._loaded:
+            return self._encoding
+        with self._lock:
+            if not self._loaded:
+                cache_dir = Path(os.environ.setdefault("TIKTOKEN_CACHE_DIR", str(TOKENIZER_CACHE_DIR)))
+                cache_file = _tiktoken_cache_file(cache_dir, self.encoding_name)
+                if not cache_file.is_file():
+                    # Never fetch BPE tables from a serving process (tiktoken would download on the event loop);
+                    # prime the cache once (see README).
+                    self.load_error = f"no cached {self.encoding_name} table in {cache_dir}"
+                else:
+                    try:
+                        import tiktoken
+
+                        self._encoding = tiktoken.get_encoding(self.encoding_name)
+                    except Exception as exc:
+                        self.load_error = str(exc)
+                self._loaded = True
+        return self._encoding
+
+    @property
+    def method(self) -> str:
+        return f"tiktoken:{self.encoding_name}" if self._load() is not None else "bytes/4"
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        encoding = self._load()
+        if encoding is None:
+            return _estimate_tokens(json_bytes=_utf8_len(text), text_chars=len(text)) or 0
+        return len(encoding.encode_ordinary(text))
+
+
+# Default counter; a context-pressure monitor brings its own for its configured encoding.
+_token_counter = _TokenCounter()
+
+
+def _iter_message_texts(messages: Any) -> Any:
+    """Texts an LLM request carries from prompt messages: content blocks, tool calls and tool results."""
+    if not isinstance(messages, Sequence) or isinstance(messages, (str, bytes, bytearray)):
+        messages = [messages]
+    for message in messages:
+        if isinstance(message, str):
+            yield message
+            continue
+        for block in list(getattr(message, "content", None) or []):
+            text = getattr(block, "text", None)
+            if isinstance(text, str):
+                yield text
+        for result in (getattr(message, "tool_results", None) or {}).values():
+            for block in list(getattr(result, "content", None) or []):
+                text = getattr(block, "text", None)
+                if isinstance(text, str):
+                    yield text
+        for call in (getattr(message, "tool_calls", None) or {}).values():
+            params = getattr(call, "params", None)
+            arguments = getattr(params, "arguments", None)
+            if arguments:
+                yield json.dumps(arguments, ensure_ascii=False, default=str)
+
+
+def _count_message_tokens(messages: Any, counter: _TokenCounter | None = None) -> int:
+    counter = counter or _token_counter
+    return sum(counter.count(text) for text in _iter_message_texts(messages))
+
+
+async def _count_message_tokens_off_loop(messages: Any, counter: _TokenCounter | None = None) -> int:
+    """``_count_message_tokens`` with the BPE encoding on a worker thread; only text extraction runs on the loop."""
+    counter = counter or _token_counter
+    texts = list(_iter_message_texts(messages))
+    return await asyncio.to_thread(lambda: sum(counter.count(text) for text in texts))
+
+
+def _llm_model_name(llm: Any) -> str | None:
+    model = getattr(llm, "model_name", None)
+    if isinstance(model, str) and model:
+        return model
+    params = getattr(llm, "default_request_params", None)
+    model = getattr(params, "model", None)
+    return model if isinstance(model, str) and model else None
+
+
+ContextPressureHook = Callable[[Any, str, dict[str, Any]], Any]
+_context_pressure_hooks: list[ContextPressureHook] = []
+
+
+def register_context_pressure_hook(hook: ContextPressureHook) -> None:
+    """Register ``hook(agent, level, stats)``; called (and awaited if async) at the compact/overflow levels."""
+    _context_pressure_hooks.append(hook)
+
+
+class _ContextPressureMonitor:
+    """Running per-session context size against the model window, with warn/compact/overflow levels.
+
+    The session total is re-based on the provider-reported usage after every completion and grows by the
+    locally counted tokens of each new request (prompts and tool results) in between.
+    """
+
+    LEVELS = ("ok", "warn", "compact", "overflow")
+
+    def __init__(self, *, warn_ratio: float, compact_ratio: float, encoding: str = DEFAULT_TOKENIZER_ENCODING) -> None:
+        self.warn_ratio = warn_ratio
+        self.compact_ratio = compact_ratio
+        self.counter = _TokenCounter(encoding)
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any] | None) -> _ContextPressureMonitor | None:
+        if not isinstance(config, Mapping) or not config.get("enabled", False):
+            return None
+        warn_ratio = float(config.get("warn_ratio", 0.7))
+        compact_ratio = float(config.get("compact_ratio", 0.85))
+        if not 0 < warn_ratio <= compact_ratio <= 1:
+            raise ValueError("copilot.context_pressure expects 0 < warn_ratio <= compact_ratio <= 1")
+        return cls(
+            warn_ratio=warn_ratio,
+            compact_ratio=compact_ratio,
+            encoding=str(config.get("encoding") or DEFAULT_TOKENIZER_ENCODING),
+        )
+
+    def level_for(self, ratio: float) -> str:
+        if ratio >= 1:
+            return "overflow"
+        if ratio >= self.compact_ratio:
+            return "compact"
+        if ratio >= self.warn_ratio:
+            return "warn"
+        return "ok"
+
+    def project(self, llm: Any, messages: Any, *, model: str | None = None, request_tokens: int | None = None) -> dict[str, Any]:
+        baseline = int(getattr(llm, "_copilot_context_tokens", 0) or 0)
+        if request_tokens is None:
+            request_tokens = _count_message_tokens(messages, self.counter)
+        model = model or _llm_model_name(llm)
+        window = ModelDatabase.get_context_window(model) if model else None
+        projected = baseline + request_tokens
+        ratio = projected / window if window else 0.0
+        return {
+            "model": model,
+            "model_alias": _model_alias_label(model),
+            "context_window": window,
+            "session_tokens": baseline,
+            "request_tokens": request_tokens,
+            "projected_tokens": projected,
+            "context_ratio": round(ratio, 4),
+            "level": self.level_for(ratio),
+            "token_count_method": self.counter.method,
+            "tokenizer_error": self.counter.load_error,
+        }
+
+    @staticmethod
+    def record_usage(llm: Any, usage: Any) -> None:
+        input_tokens = getattr(usage, "input_tokens", 0) or 0
+        output_tokens = getattr(usage, "output_tokens", 0) or 0
+        if input_tokens or output_tokens:
+            setattr(llm, "_copilot_context_tokens", input_tokens + output_tokens)
+
+    async def check(
+        self, agent: Any, llm: Any, messages: Any, *, model: str | None = None, request_tokens: int | None = None
+    ) -> dict[str, Any]:
+        stats = self.project(llm, messages, model=model, request_tokens=request_tokens)
+        level = stats["level"]
+        previous = getattr(llm, "_copilot_context_level", "ok")
+        setattr(llm, "_copilot_context_level", level)
+        if level != "ok" and self.LEVELS.index(level) > self.LEVELS.index(previous):
+            # Log each escalation once per session rather than on every turn.
+            _profiling_queue.submit(
+                "Context pressure",
+                {"agent_name": getattr(agent, "_name", None), "turn_id": _current_turn_id(), **stats},
+            )
+        if level in {"compact", "overflow"}:
+            for hook in list(_context_pressure_hooks):
+                outcome = hook(agent, level, stats)
+                if inspect.isawaitable(outcome):
+                    await outcome
+        return stats
+
+
+class _ModelRouter:
+    """Per-card routing of each LLM call between the mini and the large-context runtime model.
+
+    Policies: ``small`` / ``large`` always use that model; ``auto`` starts on the small model and escalates
+    when the projected prompt, the session's tool-result volume or the small model's window demand it.
+    Escalation is sticky for the rest of the session. Cards without a policy keep their configured model,
+    and so do cards whose model is pinned explicitly (``model:`` in the card or ``--model`` on the command line).
+    """
+
+    POLICIES = ("small", "large", "auto")
+
+    def __init__(
+        self,
+        *,
+        small_model: str,
+        large_model: str,
+        cards: Mapping[str, Mapping[str, Any]],
+        small_window_ratio: float,
+        cli_model: str | None = None,
+    ) -> None:
+        self.small_model = small_model
+        self.large_model = large_model
+        self.cards = {name: dict(card) for name, card in cards.items()}
+        self.small_window_ratio = small_window_ratio
+        self.cli_model = cli_model
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any] | None, *, cli_model: str | None = None) -> _ModelRouter | None:
+        if not isinstance(config, Mapping) or not config.get("enabled", False):
+            return None
+        cards: dict[str, Mapping[str, Any]] = {}
+        for name, card in (config.get("cards") or {}).items():
+            card = card if isinstance(card, Mapping) else {"policy": card}
+            if card.get("policy") not in cls.POLICIES:
+                raise ValueError(f"copilot.model_routing.cards.{name}.policy must be one of {cls.POLICIES}")
+            cards[str(name)] = card
+        return cls(
+            small_model=str(config.get("small_model", "gpt-5.4-mini")),
+            large_model=str(config.get("large_model", "gpt-5.4")),
+            cards=cards,
+            small_window_ratio=float(config.get("small_window_ratio", 0.6)),
+            cli_model=cli_model,
+        )
+
+    def decide(self, card_name: str | None, llm: Any, request_tokens: int, tool_result_bytes: int) -> tuple[str, str] | None:
+        """``(model, reason)`` for this call, or ``None`` when the card is not routed."""
+        card = self.cards.get(card_name or "")
+        if card is None:
+            return None
+        policy = card["policy"]
+        if policy == "small":
+            return self.small_model, "policy_small"
+        if policy == "large":
+            return self.large_model, "policy_large"
+        if getattr(llm, "_copilot_routed_large", False):
+            return self.large_model, "sticky_escalation"
+        session_tokens = int(getattr(llm, "_copilot_context_tokens", 0) or 0)
+        max_prompt_tokens = card.get("small_max_prompt_tokens")
+        if max_prompt_tokens is not None and session_tokens + request_tokens > int(max_prompt_tokens):
+            return self.large_model, "prompt_tokens_over_small_limit"
+        max_tool_bytes = card.get("small_max_tool_result_bytes")
+        if max_tool_bytes is not None and tool_result_bytes > int(max_tool_bytes):
+            return self.large_model, "tool_result_volume_over_small_limit"
+        small_window = ModelDatabase.get_context_window(self.small_model)
+        if small_window and session_tokens + request_tokens > small_window * self.small_window_ratio:
+            return self.large_model, "small_context_window"
+        return self.small_model, "within_small_limits"
+
+    def pinned_model(self, agent: Any) -> str | None:
+        """Model chosen explicitly by the card (``model:``) or ``--model``; routing leaves it alone."""
+        return getattr(getattr(agent, "config", None), "model", None) or self.cli_model
+
+    def escalate(self, agent: Any, llm: Any) -> bool:
+        """Pin an ``auto`` card's session to the large model; True when this changed the routing."""
+        card = self.cards.get(getattr(agent, "_name", None) or "")
+        if card is None or card["policy"] != "auto" or self.pinned_model(agent) or getattr(llm, "_copilot_routed_large", False):
+            return False
+        setattr(llm, "_copilot_routed_large", True)
+        return True
+
+    def route(self, agent: Any, llm: Any, request_params: Any, request_tokens: int) -> tuple[Any, str | None]:
+        """Return request params pinned to the routed model (and that model), logging the decision."""
+        tool_result_bytes = int(getattr(llm, "_copilot_tool_result_bytes", 0) or 0)
+        card_name = getattr(agent, "_name", None)
+        decision = self.decide(card_name, llm, request_tokens, tool_result_bytes)
+        if decision is None:
+            return request_params, None
+        explicit_model = getattr(request_params, "model", None) if request_params is not None else None
+        configured_model = explicit_model or _llm_model_name(llm)
+        model, reason = decision
+        pinned_model = self.pinned_model(agent)
+        if explicit_model and explicit_model not in {self.small_model, self.large_model}:
+            # A caller asked for a specific third model; routing only chooses between the two runtime aliases.
+            model, reason = explicit_model, "explicit_request_model"
+        elif pinned_model:
+            # The card or --model chose the model; the routing policy never overrides that choice.
+            model, reason = configured_model or pinned_model, "explicit_configured_model"
+        elif model == self.large_model:
+            setattr(llm, "_copilot_routed_large", True)
+        _profiling_queue.submit(
+            "Model routing decision",
+            {
+                "agent_name": card_name,
+                "turn_id": _current_turn_id(),
+                "policy": self.cards[card_name]["policy"],
+                "configured_model": configured_model,
+                "routed_model": model,
+                "routed_model_alias": _model_alias_label(model),
+                "reason": reason,
+                "session_tokens": int(getattr(llm, "_copilot_context_tokens", 0) or 0),
+                "request_tokens": request_tokens,
+                "session_tool_result_bytes": tool_result_bytes,
+            },
+        )
+        if reason in {"explicit_request_model", "explicit_configured_model"}:
+            return request_params, model
+        base = request_params if request_params is not None else getattr(llm, "default_request_params", None)
+        if base is None or not hasattr(base, "model_copy"):
+            return request_params, None
+        return base.model_copy(update={"model": model}), model
+
+
+def _message_tool_result_bytes(messages: Any) -> int:
+    if not isinstance(messages, Sequence) or isinstance(messages, (str, bytes, bytearray)):
+        messages = [messages]
+    total = 0
+    for message in messages:
+        for result in (getattr(message, "tool_results", None) or {}).values():
+            total += _estimate_content_payload(getattr(result, "content", None))[3]
+    return total
+
+
+class _FixtureRecorder:
+    """Appends replay fixtures as JSONL from a worker thread; serialization never runs on the event loop.
+
+    ``drain`` (registered with ``atexit`` when recording) writes whatever is still queued; fixtures
+    recorded after it are written on the calling thread.
+    """
+
+    FILES = {"llm_stream": "llm-streams.jsonl", "tool_result": "tool-results.jsonl", "agent_input": "agent-inputs.jsonl"}
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._queue: queue.SimpleQueue[tuple[str, Callable[[], dict[str, Any]]] | None] = queue.SimpleQueue()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="copilot-fixture-recorder", daemon=True)
+        self._worker.start()
+
+    def record(self, kind: str, build: Callable[[], dict[str, Any]]) -> None:
+        if self._closed:
+            self._write(kind, build)
+            return
+        self._queue.put((kind, build))
+
+    def drain(self, timeout: float = 5.0) -> None:
+        """Stop the worker once the queued fixtures are written."""
+        self._closed = True
+        if self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            self._write(*item)
+
+    def _write(self, kind: str, build: Callable[[], dict[str, Any]]) -> None:
+        try:
+            line = json.dumps({"kind": kind, "recorded_at": time.time(), **build()}, ensure_ascii=False, default=str)
+        except Exception as exc:
+            line = json.dumps({"kind": kind, "error": str(exc)})
+        with (self.directory / self.FILES[kind]).open("a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+
+
+_fixture_recorder = _FixtureRecorder(Path(RECORD_DIR)) if RECORD_DIR else None
+if _fixture_recorder is not None:
+    atexit.register(_fixture_recorder.drain)
+
+
+class _RecordingStream:
+    """Proxy over a provider event stream that keeps every event it yields for the fixture recorder."""
+
+    def __init__(self, stream: Any) -> None:
+        self._stream = stream
+        self.events: list[Any] = []
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+    async def __aenter__(self) -> _RecordingStream:
+        await self._stream.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> Any:
+        return await self._stream.__aexit__(*exc_info)
+
+    async def __aiter__(self):  # type: ignore[no-untyped-def]
+        async for event in self._stream:
+            self.events.append(event)
+            yield event
+
+
+def _digest(value: Any) -> str:
+    payload = value if isinstance(value, str) else json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def _prompt_prefix_fingerprint(agent: Any, tools: Any) -> dict[str, str]:
+    """Hashes of the cacheable request prefix: system prompt / card text and tool schemas (in order and as a set)."""
+    tool_specs = [
+        {
+            "name": getattr(tool, "name", None),
+            "description": getattr(tool, "description", None),
+            "input_schema": _to_jsonable(getattr(tool, "inputSchema", None)),
+        }
+        for tool in list(tools or [])
+    ]
+    instruction = getattr(agent, "instruction", None)
+    return {
+        "system_prompt": _digest(instruction if isinstance(instruction, str) else ""),
+        "tool_schemas": _digest(tool_specs),
+        "tool_schemas_unordered": _digest(sorted(_digest(spec) for spec in tool_specs)),
+        "tool_names": ",".join(str(spec["name"]) for spec in tool_specs),
+    }
+
+
+def _check_prompt_prefix(agent: Any, llm: Any, tools: Any, model: str | None) -> None:
+    """Flag turns whose stable prefix differs from the previous turn of the same session (a prompt-cache miss).
+
+    ``model`` is the model the call is sent to, i.e. the routed model when the router picked one.
+    """
+    current = _prompt_prefix_fingerprint(agent, tools)
+    previous = getattr(llm, "_copilot_prefix_fingerprint", None)
+    setattr(llm, "_copilot_prefix_fingerprint", current)
+    if previous is None or previous == current:
+        return
+    changed = [part for part in ("system_prompt", "tool_schemas") if previous[part] != current[part]]
+    if not changed:
+        return
+    reordered_only = changed == ["tool_schemas"] and previous["tool_schemas_unordered"] == current["tool_schemas_unordered"]
+    _profiling_queue.submit(
+        "Prompt prefix changed",
+        {
+            "agent_name": getattr(agent, "_name", None),
+            "turn_id": _current_turn_id(),
+            "model": model,
+            "model_alias": _model_alias_label(model),
+            "changed": changed,
+            "tool_order_only": reordered_only,
+            "previous_tool_names": previous["tool_names"] if "tool_schemas" in changed else None,
+            "tool_names": current["tool_names"] if "tool_schemas" in changed else None,
+        },
+    )
+
+
+# Upper bounds (ms) of the chunk inter-arrival histogram buckets; the last bucket is open-ended.
+STREAM_GAP_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Runtime model name -> alias label used in latency metrics; filled by register_copilot_runtime_models.
+_MODEL_ALIAS_LABELS: dict[str, str] = {}
+
+
+def _model_alias_label(model: str | None) -> str | None:
+    if not model:
+        return None
+    label = _MODEL_ALIAS_LABELS.get(model)
+    if label is None and "." in model:
+        # Accept provider-qualified names such as "codexresponses.gpt-5.4-mini".
+        label = _MODEL_ALIAS_LABELS.get(model.split(".", 1)[1])
+    return label or model
+
+
+class _StreamCoalescer:
+    """Batches consecutive text (or reasoning) deltas before they reach stream listeners.
+
+    A batch is delivered when the kind switches, when it reaches ``max_bytes``, ``window_seconds``
+    after its first delta, or when the stream ends. Delivered text is the exact concatenation of the
+    deltas, in order.
+    """
+
+    def __init__(self, deliver: Callable[[str, bool], None], *, window_seconds: float, max_bytes: int) -> None:
+        self._deliver = deliver
+        self._window_seconds = window_seconds
+        self._max_bytes = max_bytes
+        self._parts: list[str] = []
+        self._is_reasoning = False
+        self._bytes = 0
+        self._timer: asyncio.TimerHandle | None = None
+
+    def push(self, text: str, *, is_reasoning: bool) -> None:
+        if self._parts and is_reasoning != self._is_reasoning:
+            self.flush()
+        self._parts.append(text)
+        self._is_reasoning = is_reasoning
+        self._bytes += _utf8_len(text)
+        if self._bytes >= self._max_bytes:
+            self.flush()
+        elif self._timer is None:
+            try:
+                self._timer = asyncio.get_running_loop().call_later(self._window_seconds, self.flush)
+            except RuntimeError:
+                self.flush()
+
+    def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._parts:
+            return
+        text = "".join(self._parts)
+        self._parts = []
+        self._bytes = 0
+        self._deliver(text, self._is_reasoning)
+
+
+class _StreamTiming:
+    """Latency shape of one streamed completion, fed from the stream listener hook."""
+
+    __slots__ = (
+        "started",
+        "first_chunk",
+        "first_text",
+        "first_reasoning",
+        "last_chunk",
+        "chunk_count",
+        "gap_histogram",
+        "gap_max_ms",
+        "listener_calls",
+        "listener_seconds",
+    )
+
+    def __init__(self) -> None:
+        self.started = time.monotonic()
+        self.first_chunk: float | None = None
+        self.first_text: float | None = None
+        self.first_reasoning: float | None = None
+        self.last_chunk: float | None = None
+        self.chunk_count = 0
+        self.gap_histogram = [0] * (len(STREAM_GAP_BUCKETS_MS) + 1)
+        self.gap_max_ms = 0.0
+        self.listener_calls = 0
+        self.listener_seconds = 0.0
+
+    def observe(self, *, is_reasoning: bool) -> None:
+        now = time.monotonic()
+        if self.first_chunk is None:
+            self.first_chunk = now
+        if is_reasoning:
+            if self.first_reasoning is None:
+                self.first_reasoning = now
+        elif self.first_text is None:
+            self.first_text = now
+        if self.last_chunk is not None:
+            gap_ms = (now - self.last_chunk) * 1000
+            self.gap_max_ms = max(self.gap_max_ms, gap_ms)
+            for index, bound in enumerate(STREAM_GAP_BUCKETS_MS):
+                if gap_ms <= bound:
+                    self.gap_histogram[index] += 1
+                    break
+            else:
+                self.gap_histogram[-1] += 1
+        self.last_chunk = now
+        self.chunk_count += 1
+
+    def _since_start_ms(self, moment: float | None) -> int | None:
+        return None if moment is None else int((moment - self.started) * 1000)
+
+    def summary(self, *, output_tokens: int) -> dict[str, Any]:
+        finished = time.monotonic()
+        generation_seconds = finished - self.first_chunk if self.first_chunk is not None else 0.0
+        labels = [f"le_{bound}ms" for bound in STREAM_GAP_BUCKETS_MS] + [f"gt_{STREAM_GAP_BUCKETS_MS[-1]}ms"]
+        return {
+            "stream_duration_ms": int((finished - self.started) * 1000),
+            "ttft_ms": self._since_start_ms(self.first_chunk),
+            "first_text_ms": self._since_start_ms(self.first_text),
+            "first_reasoning_ms": self._since_start_ms(self.first_reasoning),
+            "chunk_count": self.chunk_count,
+            "chunk_gap_histogram": dict(zip(labels, self.gap_histogram)),
+            "chunk_gap_max_ms": int(self.gap_max_ms),
+            # Deliveries to stream listeners/renderer (fewer than chunk_count when coalescing) and their cost.
+            "listener_calls": self.listener_calls,
+            "listener_ms": round(self.listener_seconds * 1000, 2),
+            "output_tokens": output_tokens,
+            "output_tokens_per_second": round(output_tokens / generation_seconds, 2) if generation_seconds > 0 else None,
+        }
 
 
 def _to_jsonable(value: Any) -> Any:
@@ -45,15 +1354,46 @@ def _measure_payload(value: Any) -> tuple[int, int]:
     return len(serialized), len(serialized.encode("utf-8"))
 
 
-def _extract_text_payload(content: Any) -> tuple[int, int, int]:
+def _utf8_len(text: str) -> int:
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+def _estimate_content_payload(content: Any) -> tuple[int, int, int, int]:
+    """Size content blocks without building JSON.
+
+    Returns ``(text_chars, text_bytes, block_count, payload_bytes)``, where ``payload_bytes`` adds
+    base64 blobs (images, audio, embedded resources) to the text so binary-heavy results are not
+    reported as empty.
+    """
     blocks = content if isinstance(content, Sequence) and not isinstance(content, (str, bytes, bytearray)) else []
-    text_parts: list[str] = []
+    text_chars = 0
+    text_bytes = 0
+    payload_bytes = 0
+    text_blocks = 0
     for block in blocks:
-      text = getattr(block, "text", None)
-      if isinstance(text, str) and text:
-          text_parts.append(text)
-    merged = "\n".join(text_parts)
-    return len(merged), len(merged.encode("utf-8")), len(blocks)
+        text = getattr(block, "text", None)
+        if isinstance(text, str) and text:
+            text_chars += len(text)
+            size = _utf8_len(text)
+            text_bytes += size
+            payload_bytes += size
+            text_blocks += 1
+        data = getattr(block, "data", None)
+        if isinstance(data, str):
+            payload_bytes += len(data)
+        resource = getattr(block, "resource", None)
+        if resource is not None:
+            resource_text = getattr(resource, "text", None)
+            if isinstance(resource_text, str):
+                payload_bytes += _utf8_len(resource_text)
+            blob = getattr(resource, "blob", None)
+            if isinstance(blob, str):
+                payload_bytes += len(blob)
+    if text_blocks > 1:
+        # Account for the newline separators of the merged text view.
+        text_chars += text_blocks - 1
+        text_bytes += text_blocks - 1
+    return text_chars, text_bytes, len(blocks), payload_bytes
 
 
 def _extract_final_response_text(final_response: Any) -> str:
@@ -95,31 +1435,34 @@ def register_copilot_runtime_models() -> None:
     gpt53_codex = ModelDatabase.get_model_params("gpt-5.3-codex")
     if gpt53_codex is None:
         return
+    provider = Provider(MODEL_PROVIDER) if MODEL_PROVIDER else Provider.CODEX_RESPONSES
 
     gpt54_codex = gpt53_codex.model_copy(
         update={
             # Conservative parity with observed Codex CLI effective window (~950K), not a speculative 1,000,000.
             "context_window": 950_000,
-            "default_provider": Provider.CODEX_RESPONSES,
+            "default_provider": provider,
         }
     )
 
     ModelDatabase.register_runtime_model_params("gpt-5.4", gpt54_codex)
-    ModelFactory.MODEL_ALIASES.setdefault("gpt54", "codexresponses.gpt-5.4")
-    ModelFactory.MODEL_ALIASES.setdefault("codex54", "codexresponses.gpt-5.4")
+    ModelFactory.MODEL_ALIASES.setdefault("gpt54", f"{provider.value}.gpt-5.4")
+    ModelFactory.MODEL_ALIASES.setdefault("codex54", f"{provider.value}.gpt-5.4")
+    _MODEL_ALIAS_LABELS["gpt-5.4"] = "gpt54"
 
     gpt54mini_codex = gpt53_codex.model_copy(
         update={
-            "default_provider": Provider.CODEX_RESPONSES,
+            "default_provider": provider,
         }
     )
 
     ModelDatabase.register_runtime_model_params("gpt-5.4-mini", gpt54mini_codex)
-    ModelFactory.MODEL_ALIASES.setdefault("gpt54mini", "codexresponses.gpt-5.4-mini")
-    ModelFactory.MODEL_ALIASES.setdefault("codex54mini", "codexresponses.gpt-5.4-mini")
+    ModelFactory.MODEL_ALIASES.setdefault("gpt54mini", f"{provider.value}.gpt-5.4-mini")
+    ModelFactory.MODEL_ALIASES.setdefault("codex54mini", f"{provider.value}.gpt-5.4-mini")
+    _MODEL_ALIAS_LABELS["gpt-5.4-mini"] = "gpt54mini"
 
 
-def install_profiling_hooks() -> None:
+def install_profiling_hooks(copilot_config: Mapping[str, Any] | None = None) -> None:
     from fast_agent.agents.llm_decorator import LlmDecorator
     from fast_agent.llm.fastagent_llm import FastAgentLLM
     from fast_agent.llm.provider.openai import openresponses_streaming, responses_streaming, streaming_utils
@@ -127,6 +1470,7 @@ def install_profiling_hooks() -> None:
     from fast_agent.llm.provider.openai.responses_streaming import ResponsesStreamingMixin
     from fast_agent.llm.stream_types import StreamChunk
     from fast_agent.mcp import mcp_aggregator
+    from mcp.types import CallToolResult, TextContent
 
     original_finalize = streaming_utils.finalize_stream_response
     original_call_tool = mcp_aggregator.MCPAggregator.call_tool
@@ -134,6 +1478,16 @@ def install_profiling_hooks() -> None:
     original_openresponses_process_stream = OpenResponsesStreamingMixin._process_stream
     original_responses_process_stream = ResponsesStreamingMixin._process_stream
     original_generate_with_summary = LlmDecorator._generate_with_summary
+    tool_cache_config = (copilot_config or {}).get("tool_cache")
+    tool_cache_enabled = _ToolResultCache.from_config(tool_cache_config) is not None
+    output_budget = _ToolOutputBudget.from_config((copilot_config or {}).get("tool_output_budget"))
+    context_monitor = _ContextPressureMonitor.from_config((copilot_config or {}).get("context_pressure"))
+    model_router = _ModelRouter.from_config((copilot_config or {}).get("model_routing"), cli_model=_cli_model(sys.argv[1:]))
+    resilience = _ToolResilience.from_config((copilot_config or {}).get("tool_resilience"))
+    coalescing_config = (copilot_config or {}).get("stream_coalescing") or {}
+    coalescing_enabled = bool(coalescing_config.get("enabled", False))
+    coalescing_window_seconds = float(coalescing_config.get("window_ms", 30)) / 1000
+    coalescing_max_bytes = int(coalescing_config.get("max_bytes", 512))
 
     def profiled_finalize_stream_response(*, final_response: Any, model: str, agent_name: str | None, chat_turn, logger, notified_tool_indices, emit_tool_fallback) -> None:
         original_finalize(
@@ -148,66 +1502,172 @@ def install_profiling_hooks() -> None:
         usage = getattr(final_response, "usage", None)
         input_tokens = getattr(usage, "input_tokens", 0) or 0
         output_tokens = getattr(usage, "output_tokens", 0) or 0
-        profiling_logger.info(
+        cached_input_tokens = getattr(getattr(usage, "input_tokens_details", None), "cached_tokens", 0) or 0
+        _profiling_queue.submit(
             "LLM turn profiling",
-            data={
+            {
                 "agent_name": agent_name,
                 "model": model,
+                "model_alias": _model_alias_label(model),
+                "turn_id": _current_turn_id(),
                 "chat_turn": chat_turn(),
                 "input_tokens": input_tokens,
+                "cached_input_tokens": cached_input_tokens,
+                "uncached_input_tokens": max(input_tokens - cached_input_tokens, 0),
+                "cache_hit_ratio": round(cached_input_tokens / input_tokens, 4) if input_tokens else None,
                 "output_tokens": output_tokens,
                 "configured_context_window": ModelDatabase.get_context_window(model),
                 "observed_model_context_window": None,
             },
         )
 
+    def aggregator_tool_cache(aggregator: Any) -> _ToolResultCache | None:
+        # One cache per aggregator, i.e. per agent instance: with --instance-scope request a new run on a
+        # grown session never sees results cached by an earlier run.
+        if not tool_cache_enabled:
+            return None
+        cache = getattr(aggregator, "_copilot_tool_cache", None)
+        if cache is None:
+            cache = _ToolResultCache.from_config(tool_cache_config)
+            setattr(aggregator, "_copilot_tool_cache", cache)
+        return cache
+
     async def profiled_call_tool(self, name: str, arguments: dict | None = None, tool_use_id: str | None = None, *, request_tool_handler=None):
         started = time.monotonic()
+        tool_cache = aggregator_tool_cache(self)
         server_name = ""
         local_tool_name = name
         if "__" in name:
             server_name, local_tool_name = name.split("__", 1)
         try:
-            result = await original_call_tool(
-                self,
-                name,
-                arguments,
-                tool_use_id,
-                request_tool_handler=request_tool_handler,
-            )
-            duration_ms = int((time.monotonic() - started) * 1000)
-            json_chars, json_bytes = _measure_payload(result)
-            text_chars, text_bytes, block_count = _extract_text_payload(getattr(result, "content", None))
-            profiling_logger.info(
-                "Inner MCP tool profiling",
-                data={
-                    "agent_name": getattr(self, "agent_name", None),
-                    "server_name": server_name or None,
-                    "tool_name": local_tool_name,
-                    "tool_name_raw": name,
-                    "tool_use_id": tool_use_id,
-                    "tool_result_json_chars": json_chars,
-                    "tool_result_json_bytes": json_bytes,
-                    "tool_content_text_chars": text_chars,
-                    "tool_content_text_bytes": text_bytes,
-                    "tool_content_block_count": block_count,
-                    "tool_result_token_estimate": _estimate_tokens(json_bytes=json_bytes, text_chars=text_chars),
-                    "tool_is_error": bool(getattr(result, "isError", False)),
-                    "duration_ms": duration_ms,
-                    "status": "ok",
-                },
-            )
+            cache_key = tool_cache.key_for(server_name, local_tool_name, arguments) if tool_cache is not None else None
+            result = tool_cache.get(cache_key) if cache_key is not None else None
+            cache_status = "hit" if result is not None else ("miss" if cache_key is not None else None)
+            resilience_info: dict[str, Any] = {}
+            if result is None:
+
+                def invoke() -> Awaitable[Any]:
+                    return original_call_tool(
+                        self,
+                        name,
+                        arguments,
+                        tool_use_id,
+                        request_tool_handler=request_tool_handler,
+                    )
+
+                if resilience is None:
+                    result = await invoke()
+                else:
+                    try:
+                        result, resilience_info = await resilience.call(invoke, server_name or "local", local_tool_name)
+                    except (TimeoutError, _CircuitOpenError) as exc:
+                        # Hand the model an error result instead of stalling or aborting the whole turn.
+                        resilience_info = {"fast_failed": isinstance(exc, _CircuitOpenError), "timed_out": isinstance(exc, TimeoutError)}
+                        result = CallToolResult(content=[TextContent(type="text", text=str(exc))], isError=True)
+                    resilience_info.update(resilience.stats(server_name or "local", local_tool_name))
+                if cache_key is not None:
+                    tool_cache.put(cache_key, server_name, local_tool_name, result)
+                if _fixture_recorder is not None and not (resilience_info.get("fast_failed") or resilience_info.get("timed_out")):
+                    recorded_result = result
+                    _fixture_recorder.record(
+                        "tool_result",
+                        lambda: {
+                            "server_name": server_name or None,
+                            "tool_name": local_tool_name,
+                            "arguments": _to_jsonable(arguments or {}),
+                            "result": _to_jsonable(recorded_result),
+                        },
+                    )
+            finished = time.monotonic()
+            duration_ms = int((finished - started) * 1000)
+            turn = _current_turn.get()
+            if turn is not None:
+                turn.record_tool(
+                    server_name=server_name or None,
+                    tool_name=local_tool_name,
+                    started=started,
+                    finished=finished,
+                    status="cache_hit" if cache_status == "hit" else "ok",
+                )
+            text_chars, text_bytes, block_count, payload_bytes = _estimate_content_payload(getattr(result, "content", None))
+            data = {
+                "agent_name": getattr(self, "agent_name", None),
+                "server_name": server_name or None,
+                "tool_name": local_tool_name,
+                "tool_name_raw": name,
+                "tool_use_id": tool_use_id,
+                "turn_id": _current_turn_id(),
+                "tool_result_estimated_bytes": payload_bytes,
+                "tool_content_text_chars": text_chars,
+                "tool_content_text_bytes": text_bytes,
+                "tool_content_block_count": block_count,
+                "tool_result_token_estimate": _estimate_tokens(json_bytes=payload_bytes, text_chars=text_chars),
+                "tool_is_error": bool(getattr(result, "isError", False)),
+                "duration_ms": duration_ms,
+                "status": "ok",
+                "tool_result_measure": "estimate",
+            }
+            if cache_status is not None:
+                data["tool_cache"] = cache_status
+                data.update(tool_cache.stats())
+            data.update(resilience_info)
+            raw_result = result
+            agent_name = getattr(self, "agent_name", None)
+            budget_limit = output_budget.limit_for(agent_name, server_name, local_tool_name) if output_budget is not None else None
+            if budget_limit is not None and text_bytes > budget_limit:
+                result, savings = output_budget.apply(result, budget_limit)
+                if savings is not None:
+                    data["tool_result_budget_saved_bytes"] = savings["saved_bytes"]
+                    _profiling_queue.submit(
+                        "Tool output budget applied",
+                        {
+                            "agent_name": agent_name,
+                            "server_name": server_name or None,
+                            "tool_name": local_tool_name,
+                            "tool_use_id": tool_use_id,
+                            "turn_id": _current_turn_id(),
+                            **savings,
+                        },
+                    )
+            full_measure = TOOL_RESULT_FULL_MEASURE_RATE > 0 and random.random() < TOOL_RESULT_FULL_MEASURE_RATE
+            delivered_result = result
+
+            def enrich() -> dict[str, Any]:
+                # Runs on the profiling worker: exact token counts and sampled JSON sizes stay off the event loop.
+                counter = context_monitor.counter if context_monitor is not None else _token_counter
+                extra: dict[str, Any] = {
+                    "tool_result_tokens": _count_message_tokens([delivered_result], counter),
+                    "token_count_method": counter.method,
+                }
+                if full_measure:
+                    json_chars, json_bytes = _measure_payload(raw_result)
+                    extra.update(
+                        {
+                            "tool_result_json_chars": json_chars,
+                            "tool_result_json_bytes": json_bytes,
+                            "tool_result_token_estimate": _estimate_tokens(json_bytes=json_bytes, text_chars=text_chars),
+                            "tool_result_measure": "sampled_full",
+                        }
+                    )
+                return extra
+
+            _profiling_queue.submit("Inner MCP tool profiling", data, enrich)
             return result
         except Exception as exc:
-            duration_ms = int((time.monotonic() - started) * 1000)
-            profiling_logger.info(
+            finished = time.monotonic()
+            duration_ms = int((finished - started) * 1000)
+            turn = _current_turn.get()
+            if turn is not None:
+                turn.record_tool(server_name=server_name or None, tool_name=local_tool_name, started=started, finished=finished, status="exception")
+            _profiling_queue.submit(
                 "Inner MCP tool profiling",
-                data={
+                {
                     "agent_name": getattr(self, "agent_name", None),
                     "server_name": server_name or None,
                     "tool_name": local_tool_name,
                     "tool_name_raw": name,
                     "tool_use_id": tool_use_id,
+                    "turn_id": _current_turn_id(),
                     "duration_ms": duration_ms,
                     "status": "exception",
                     "error": str(exc),
@@ -216,12 +1676,35 @@ def install_profiling_hooks() -> None:
             raise
 
     def profiled_notify_stream_listeners(self, chunk):  # type: ignore[no-untyped-def]
+        timing = getattr(self, "_copilot_stream_timing", None)
+        if timing is not None and getattr(chunk, "text", None):
+            timing.observe(is_reasoning=bool(getattr(chunk, "is_reasoning", False)))
         if getattr(chunk, "text", None) and not getattr(chunk, "is_reasoning", False):
             setattr(self, "_copilot_stream_had_text", True)
-            chunks = list(getattr(self, "_copilot_stream_text_chunks", []) or [])
-            chunks.append(chunk.text)
-            setattr(self, "_copilot_stream_text_chunks", chunks)
-        return original_notify_stream_listeners(self, chunk)
+            buffer = getattr(self, "_copilot_stream_text_buffer", None)
+            if buffer is not None:
+                buffer.append(chunk.text)
+        coalescer = getattr(self, "_copilot_stream_coalescer", None)
+        if coalescer is None:
+            return _timed_notify(self, chunk)
+        text = getattr(chunk, "text", None)
+        if type(chunk) is StreamChunk and isinstance(text, str) and text:
+            coalescer.push(text, is_reasoning=bool(getattr(chunk, "is_reasoning", False)))
+            return None
+        # Anything else (e.g. non-text events) keeps its position relative to the buffered text.
+        coalescer.flush()
+        return _timed_notify(self, chunk)
+
+    def _timed_notify(self, chunk):  # type: ignore[no-untyped-def]
+        timing = getattr(self, "_copilot_stream_timing", None)
+        if timing is None:
+            return original_notify_stream_listeners(self, chunk)
+        started = time.perf_counter()
+        try:
+            return original_notify_stream_listeners(self, chunk)
+        finally:
+            timing.listener_calls += 1
+            timing.listener_seconds += time.perf_counter() - started
 
     async def _inject_fallback_text_if_needed(self, final_response):  # type: ignore[no-untyped-def]
         if getattr(self, "_copilot_stream_had_text", False):
@@ -229,14 +1712,14 @@ def install_profiling_hooks() -> None:
         fallback_text = _extract_final_response_text(final_response)
         if not fallback_text:
             return
-        chunks = list(getattr(self, "_copilot_stream_text_chunks", []) or [])
-        chunks.append(fallback_text)
-        setattr(self, "_copilot_stream_text_chunks", chunks)
+        buffer = getattr(self, "_copilot_stream_text_buffer", None)
+        if buffer is not None:
+            buffer.append(fallback_text)
         original_notify_stream_listeners(self, StreamChunk(text=fallback_text, is_reasoning=False))
         setattr(self, "_copilot_stream_had_text", True)
-        profiling_logger.info(
+        _profiling_queue.submit(
             "Injected fallback stream text from final_response",
-            data={
+            {
                 "agent_name": getattr(self, "name", None),
                 "model": getattr(final_response, "model", None),
                 "fallback_text_chars": len(fallback_text),
@@ -244,39 +1727,137 @@ def install_profiling_hooks() -> None:
             },
         )
 
-    async def profiled_openresponses_process_stream(self, stream, model, capture_filename):  # type: ignore[no-untyped-def]
+    async def _profiled_process_stream(self, original_process_stream, stream, model, capture_filename):  # type: ignore[no-untyped-def]
         setattr(self, "_copilot_stream_had_text", False)
-        setattr(self, "_copilot_stream_text_chunks", [])
-        final_response, reasoning_segments = await original_openresponses_process_stream(self, stream, model, capture_filename)
+        setattr(self, "_copilot_stream_text_buffer", _StreamTextBuffer(STREAM_BUFFER_MAX_BYTES))
+        timing = _StreamTiming()
+        setattr(self, "_copilot_stream_timing", timing)
+        turn_index = int(getattr(self, "_copilot_llm_turns", 0) or 0)
+        setattr(self, "_copilot_llm_turns", turn_index + 1)
+        if _fixture_recorder is not None:
+            stream = _RecordingStream(stream)
+        coalescer = None
+        if coalescing_enabled:
+            coalescer = _StreamCoalescer(
+                lambda text, is_reasoning: _timed_notify(self, StreamChunk(text=text, is_reasoning=is_reasoning)),
+                window_seconds=coalescing_window_seconds,
+                max_bytes=coalescing_max_bytes,
+            )
+        setattr(self, "_copilot_stream_coalescer", coalescer)
+        final_response = None
+        status = "exception"
+        try:
+            final_response, reasoning_segments = await original_process_stream(self, stream, model, capture_filename)
+            status = "ok"
+        finally:
+            if coalescer is not None:
+                # Deliver the tail before timing stops and before any fallback text is injected.
+                coalescer.flush()
+            setattr(self, "_copilot_stream_coalescer", None)
+            setattr(self, "_copilot_stream_timing", None)
+            turn = _current_turn.get()
+            if turn is not None:
+                turn.record_stream(model=model, first_chunk=timing.first_chunk, finished=time.monotonic())
+            usage = getattr(final_response, "usage", None)
+            if usage is not None:
+                _ContextPressureMonitor.record_usage(self, usage)
+            _profiling_queue.submit(
+                "LLM stream latency profiling",
+                {
+                    "agent_name": getattr(self, "name", None),
+                    "model": model,
+                    "model_alias": _model_alias_label(model),
+                    "turn_id": _current_turn_id(),
+                    "status": status,
+                    **timing.summary(output_tokens=getattr(usage, "output_tokens", 0) or 0),
+                },
+            )
+            if _fixture_recorder is not None and status == "ok":
+                recorded_events = stream.events
+                _fixture_recorder.record(
+                    "llm_stream",
+                    lambda: {
+                        "agent_name": getattr(self, "name", None),
+                        "model": model,
+                        "turn_index": turn_index,
+                        "events": [_to_jsonable(event) for event in recorded_events],
+                    },
+                )
         await _inject_fallback_text_if_needed(self, final_response)
         return final_response, reasoning_segments
 
+    async def profiled_openresponses_process_stream(self, stream, model, capture_filename):  # type: ignore[no-untyped-def]
+        return await _profiled_process_stream(self, original_openresponses_process_stream, stream, model, capture_filename)
+
     async def profiled_responses_process_stream(self, stream, model, capture_filename):  # type: ignore[no-untyped-def]
-        setattr(self, "_copilot_stream_had_text", False)
-        setattr(self, "_copilot_stream_text_chunks", [])
-        final_response, reasoning_segments = await original_responses_process_stream(self, stream, model, capture_filename)
-        await _inject_fallback_text_if_needed(self, final_response)
-        return final_response, reasoning_segments
+        return await _profiled_process_stream(self, original_responses_process_stream, stream, model, capture_filename)
 
     async def profiled_generate_with_summary(self, messages, request_params=None, tools=None):  # type: ignore[no-untyped-def]
-        response, summary = await original_generate_with_summary(self, messages, request_params, tools)
         llm = getattr(self, "_llm", None)
-        buffered_chunks = list(getattr(llm, "_copilot_stream_text_chunks", []) or [])
-        if hasattr(response, "last_text") and callable(response.last_text):
-            last_text = response.last_text() or ""
-            if not last_text and buffered_chunks and hasattr(response, "add_text") and callable(response.add_text):
-                fallback_text = "".join(chunk for chunk in buffered_chunks if isinstance(chunk, str)).strip()
-                if fallback_text:
-                    response.add_text(fallback_text)
-                    profiling_logger.info(
-                        "Injected fallback assistant message text into PromptMessageExtended",
-                        data={
-                            "agent_name": getattr(self, "_name", None),
-                            "fallback_text_chars": len(fallback_text),
-                            "fallback_text_bytes": len(fallback_text.encode("utf-8")),
-                        },
-                    )
-        return response, summary
+        pending_turn = _current_turn.get()
+        if pending_turn is not None:
+            # The previous turn ended in tool use; its tools have run, so it is complete now.
+            _emit_turn_breakdown(pending_turn)
+        turn = _TurnBreakdown(getattr(self, "_name", None))
+        _current_turn.set(turn)
+        if _fixture_recorder is not None and llm is not None and not getattr(llm, "_copilot_llm_turns", 0):
+            input_texts = list(_iter_message_texts(messages))
+            _fixture_recorder.record("agent_input", lambda: {"agent_name": getattr(self, "_name", None), "texts": input_texts})
+        try:
+            routed_model = None
+            if llm is not None and (model_router is not None or context_monitor is not None):
+                request_tokens = await _count_message_tokens_off_loop(
+                    messages, context_monitor.counter if context_monitor is not None else None
+                )
+                setattr(llm, "_copilot_tool_result_bytes", int(getattr(llm, "_copilot_tool_result_bytes", 0) or 0) + _message_tool_result_bytes(messages))
+                caller_request_params = request_params
+                if model_router is not None:
+                    request_params, routed_model = model_router.route(self, llm, caller_request_params, request_tokens)
+                if context_monitor is not None:
+                    pressure = await context_monitor.check(self, llm, messages, model=routed_model, request_tokens=request_tokens)
+                    if (
+                        pressure["level"] in {"compact", "overflow"}
+                        and model_router is not None
+                        and model_router.escalate(self, llm)
+                    ):
+                        # Default pressure action: move an auto-routed session to the large model for this call on.
+                        request_params, routed_model = model_router.route(self, llm, caller_request_params, request_tokens)
+                        await context_monitor.check(self, llm, messages, model=routed_model, request_tokens=request_tokens)
+            if llm is not None:
+                _check_prompt_prefix(self, llm, tools, routed_model or _llm_model_name(llm))
+            response, summary = await original_generate_with_summary(self, messages, request_params, tools)
+            turn.generate_finished = time.monotonic()
+            buffer = getattr(llm, "_copilot_stream_text_buffer", None)
+            if hasattr(response, "last_text") and callable(response.last_text):
+                last_text = response.last_text() or ""
+                if not last_text and buffer and hasattr(response, "add_text") and callable(response.add_text):
+                    fallback_text = buffer.text().strip()
+                    if fallback_text:
+                        response.add_text(fallback_text)
+                        _profiling_queue.submit(
+                            "Injected fallback assistant message text into PromptMessageExtended",
+                            {
+                                "agent_name": getattr(self, "_name", None),
+                                "fallback_text_chars": len(fallback_text),
+                                "fallback_text_bytes": len(fallback_text.encode("utf-8")),
+                                "stream_buffer_truncated": buffer.truncated,
+                            },
+                        )
+            if not getattr(response, "tool_calls", None):
+                _current_turn.set(None)
+                _emit_turn_breakdown(turn)
+            # Otherwise the turn stays open in this task context so the requested tool calls are attributed to it.
+            return response, summary
+        except BaseException:
+            if turn.generate_finished is None:
+                turn.generate_finished = time.monotonic()
+            _current_turn.set(None)
+            _emit_turn_breakdown(turn)
+            raise
+        finally:
+            # The turn is over; drop the streamed text instead of holding it until the next stream.
+            if llm is not None:
+                setattr(llm, "_copilot_stream_text_buffer", None)
 
     streaming_utils.finalize_stream_response = profiled_finalize_stream_response
     responses_streaming.finalize_stream_response = profiled_finalize_stream_response
@@ -286,9 +1867,85 @@ def install_profiling_hooks() -> None:
     OpenResponsesStreamingMixin._process_stream = profiled_openresponses_process_stream
     ResponsesStreamingMixin._process_stream = profiled_responses_process_stream
     LlmDecorator._generate_with_summary = profiled_generate_with_summary
+    LlmDecorator.generate = _closing_pending_turn(LlmDecorator.generate)
+
+
+HOST_COMMAND = "host"
+DEFAULT_HOST_CARDS_DIR = Path(__file__).resolve().parent / ".cache" / "host-cards"
+
+
+def prepare_host_cards(sources: Sequence[str], target: Path, base_dir: Path) -> list[str]:
+    """Link the agent cards of every source (card file or directory of ``*.md`` cards) into one directory.
+
+    fast-agent serves one card set per process; gathering the cards of several fleets lets a single
+    ``serve`` process host them all. Duplicate card file names are rejected rather than shadowed.
+    """
+    target.mkdir(parents=True, exist_ok=True)
+    for stale in target.iterdir():
+        # Only our own links; a cards_dir pointed at real cards must never lose them.
+        if stale.is_symlink():
+            stale.unlink()
+    linked: dict[str, Path] = {}
+    for source in sources:
+        path = Path(source)
+        path = path if path.is_absolute() else (base_dir / path)
+        cards = sorted(path.glob("*.md")) if path.is_dir() else [path]
+        if not cards or not all(card.is_file() for card in cards):
+            raise SystemExit(f"copilot.host.cards: no agent cards at {path}")
+        for card in cards:
+            if card.name in linked:
+                raise SystemExit(f"copilot.host.cards: {card.name} is provided by both {linked[card.name]} and {card}")
+            if (target / card.name).exists():
+                raise SystemExit(f"copilot.host.cards_dir {target} already holds a real {card.name}; use a dedicated directory")
+            linked[card.name] = card.resolve()
+            (target / card.name).symlink_to(card.resolve())
+    return sorted(linked)
+
+
+def host_argv(argv: Sequence[str], host_config: Mapping[str, Any], config_dir: Path) -> list[str]:
+    """Rewrite ``host [serve options]`` into a ``serve`` invocation over the combined card directory."""
+    sources = [str(source) for source in host_config.get("cards") or ["agent-cards"]]
+    single_dir = config_dir / sources[0] if len(sources) == 1 and not Path(sources[0]).is_absolute() else Path(sources[0])
+    if len(sources) == 1 and single_dir.is_dir():
+        # One card directory needs no link farm, and --watch keeps seeing edits to the real files.
+        cards_dir = single_dir
+    else:
+        cards_dir = Path(host_config.get("cards_dir") or DEFAULT_HOST_CARDS_DIR)
+        prepare_host_cards(sources, cards_dir, config_dir)
+    passthrough = list(argv)
+    if "--agent-cards" in passthrough:
+        raise SystemExit("host mode takes its cards from copilot.host.cards; drop --agent-cards")
+    name_args = [] if "--name" in passthrough else ["--name", str(host_config.get("name") or "copilot-agent-services")]
+    return ["serve", "--agent-cards", str(cards_dir), *name_args, *passthrough]
+
+
+def _cli_model(argv: Sequence[str]) -> str | None:
+    for index, arg in enumerate(argv):
+        if arg == "--model" and index + 1 < len(argv):
+            return argv[index + 1]
+        if arg.startswith("--model="):
+            return arg.split("=", 1)[1]
+    return None
+
+
+def _config_dir(argv: Sequence[str]) -> Path:
+    for index, arg in enumerate(argv):
+        if arg == "--config-path" and index + 1 < len(argv):
+            return Path(argv[index + 1]).resolve().parent
+        if arg.startswith("--config-path="):
+            return Path(arg.split("=", 1)[1]).resolve().parent
+    return DEFAULT_CONFIG_PATH.parent
 
 
 if __name__ == "__main__":
     register_copilot_runtime_models()
-    install_profiling_hooks()
+    copilot_config = load_copilot_config()
+    install_profiling_hooks(copilot_config)
+    if sys.argv[1:2] == [HOST_COMMAND]:
+        host_config = copilot_config.get("host") or {}
+        sys.argv = [sys.argv[0], *host_argv(sys.argv[2:], host_config, _config_dir(sys.argv[2:]))]
+        if host_config.get("per_agent_log_dir"):
+            log_dir = _config_dir(sys.argv[1:]) / str(host_config["per_agent_log_dir"])
+            log_dir.mkdir(parents=True, exist_ok=True)
+            _profiling_queue.per_agent_log_dir = log_dir
     fast_agent_main()
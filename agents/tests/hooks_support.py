@@ -0,0 +1,80 @@
+"""Shared loader for the hook tests: stubs fast-agent when it is not installed and loads the scripts."""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+import types
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _stub_fast_agent() -> None:
+    """Minimal stand-ins for the fast_agent imports at the top of run_fast_agent.py (only when it is not installed)."""
+    try:
+        import fast_agent  # noqa: F401
+
+        return
+    except ImportError:
+        pass
+
+    class ModelDatabase:
+        @staticmethod
+        def get_context_window(model: str) -> int | None:
+            return None
+
+    stubs = {
+        "fast_agent": {},
+        "fast_agent.cli": {},
+        "fast_agent.cli.__main__": {"main": lambda: 0},
+        "fast_agent.llm": {},
+        "fast_agent.llm.model_database": {"ModelDatabase": ModelDatabase},
+        "fast_agent.llm.model_factory": {"ModelFactory": SimpleNamespace(MODEL_ALIASES={})},
+        "fast_agent.llm.provider_types": {"Provider": SimpleNamespace},
+    }
+    for name, attributes in stubs.items():
+        module = types.ModuleType(name)
+        module.__dict__.update(attributes)
+        sys.modules[name] = module
+
+
+def _load(module_name: str, path: Path) -> Any:
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot load module from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+_stub_fast_agent()
+hooks = _load("run_fast_agent_hooks_test_module", ROOT / "run_fast_agent.py")
+profiling_report = _load("profiling_report_test_module", ROOT / "profiling_report.py")
+# Keep events emitted by the code under test out of logs/.
+hooks._profiling_queue.log_path = None
+
+
+class FakeModel:
+    """Pydantic-like value object: attribute access plus ``model_copy``."""
+
+    def __init__(self, **fields: Any) -> None:
+        self.__dict__.update(fields)
+
+    def model_copy(self, *, update: dict[str, Any] | None = None, deep: bool = False) -> "FakeModel":
+        fields = json.loads(json.dumps(self.__dict__, default=lambda value: value.__dict__)) if deep else dict(self.__dict__)
+        if deep:
+            fields["content"] = [FakeModel(**block) for block in fields.get("content", [])]
+        fields.update(update or {})
+        return FakeModel(**fields)
+
+
+def tool_result(*texts: str, is_error: bool = False) -> FakeModel:
+    return FakeModel(content=[FakeModel(type="text", text=text) for text in texts], isError=is_error)
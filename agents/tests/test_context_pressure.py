@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from hooks_support import hooks
+
+
+class TokenCounterTests(unittest.TestCase):
+    def test_missing_cached_table_falls_back_to_the_byte_heuristic(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.dict(os.environ, {"TIKTOKEN_CACHE_DIR": tmp}):
+            counter = hooks._TokenCounter("o200k_base")
+            self.assertEqual(counter.count("x" * 40), hooks._estimate_tokens(json_bytes=40, text_chars=40))
+            self.assertEqual(counter.method, "bytes/4")
+            self.assertIn("no cached o200k_base table", counter.load_error)
+            self.assertEqual(counter.count(""), 0)
+
+    def test_monitors_keep_their_own_encoding(self) -> None:
+        first = hooks._ContextPressureMonitor.from_config({"enabled": True, "encoding": "cl100k_base"})
+        second = hooks._ContextPressureMonitor.from_config({"enabled": True})
+        self.assertEqual(first.counter.encoding_name, "cl100k_base")
+        self.assertEqual(second.counter.encoding_name, hooks.DEFAULT_TOKENIZER_ENCODING)
+        self.assertEqual(hooks._token_counter.encoding_name, hooks.DEFAULT_TOKENIZER_ENCODING)
+
+    def test_request_tokens_are_counted_off_the_event_loop(self) -> None:
+        threads: list[str] = []
+
+        class RecordingCounter:
+            def count(self, text: str) -> int:
+                threads.append(threading.current_thread().name)
+                return len(text)
+
+        message = SimpleNamespace(content=[SimpleNamespace(text="hello"), SimpleNamespace(text="world!")])
+        total = asyncio.run(hooks._count_message_tokens_off_loop([message], RecordingCounter()))
+
+        self.assertEqual(total, 11)
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(threading.main_thread().name, threads)
+
+
+class ContextPressureMonitorTests(unittest.TestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch.object(hooks.ModelDatabase, "get_context_window", return_value=1000)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.monitor = hooks._ContextPressureMonitor.from_config({"enabled": True, "warn_ratio": 0.5, "compact_ratio": 0.8})
+
+    def test_levels_follow_the_configured_ratios(self) -> None:
+        self.assertEqual(
+            [self.monitor.level_for(ratio) for ratio in (0.49, 0.5, 0.79, 0.8, 1.0)],
+            ["ok", "warn", "warn", "compact", "overflow"],
+        )
+        self.assertIsNone(hooks._ContextPressureMonitor.from_config({"enabled": False}))
+        with self.assertRaises(ValueError):
+            hooks._ContextPressureMonitor.from_config({"enabled": True, "warn_ratio": 0.9, "compact_ratio": 0.8})
+
+    def test_projection_rebases_on_usage_and_escalations_log_once(self) -> None:
+        llm = SimpleNamespace(model_name="gpt-5.4-mini")
+        hooks._ContextPressureMonitor.record_usage(llm, SimpleNamespace(input_tokens=300, output_tokens=100))
+        agent = SimpleNamespace(_name="create_tasks")
+        events: list[dict] = []
+        hook_levels: list[str] = []
+
+        async def on_pressure(agent: object, level: str, stats: dict) -> None:
+            hook_levels.append(level)
+
+        async def scenario() -> list[str]:
+            levels = []
+            for request_tokens in (50, 150, 150, 450, 650):
+                stats = await self.monitor.check(agent, llm, [], request_tokens=request_tokens)
+                levels.append(stats["level"])
+            return levels
+
+        with mock.patch.object(
+            hooks._profiling_queue, "submit", side_effect=lambda message, data, enrich=None: events.append(data)
+        ), mock.patch.object(hooks, "_context_pressure_hooks", [on_pressure]):
+            levels = asyncio.run(scenario())
+
+        self.assertEqual(levels, ["ok", "warn", "warn", "compact", "overflow"])
+        self.assertEqual([event["level"] for event in events], ["warn", "compact", "overflow"])
+        self.assertEqual((events[0]["session_tokens"], events[0]["projected_tokens"]), (400, 550))
+        self.assertEqual(hook_levels, ["compact", "overflow"])
+
+
+if __name__ == "__main__":
+    unittest.main()
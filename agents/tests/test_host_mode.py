@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from hooks_support import hooks
+
+
+class HostModeTests(unittest.TestCase):
+    def test_single_directory_passes_straight_through(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / "agent-cards").mkdir()
+            argv = hooks.host_argv(["--port", "8722"], {"cards": ["agent-cards"]}, Path(tmp))
+            self.assertEqual(
+                argv,
+                ["serve", "--agent-cards", str(Path(tmp) / "agent-cards"), "--name", "copilot-agent-services", "--port", "8722"],
+            )
+            with self.assertRaises(SystemExit):
+                hooks.host_argv(["--agent-cards", "x"], {"cards": ["agent-cards"]}, Path(tmp))
+
+    def test_several_sources_are_linked_without_touching_real_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            for fleet, card in (("fleet-a", "a.md"), ("fleet-b", "b.md")):
+                (root / fleet).mkdir()
+                (root / fleet / card).write_text(f"# {card}\n", encoding="utf-8")
+            cards_dir = root / "cards"
+            cards_dir.mkdir()
+            (cards_dir / "real.md").write_text("keep\n", encoding="utf-8")
+            (cards_dir / "old.md").symlink_to(root / "fleet-a" / "a.md")
+
+            argv = hooks.host_argv([], {"cards": ["fleet-a", "fleet-b"], "cards_dir": str(cards_dir)}, root)
+
+            self.assertEqual(argv[:3], ["serve", "--agent-cards", str(cards_dir)])
+            self.assertEqual(sorted(path.name for path in cards_dir.iterdir()), ["a.md", "b.md", "real.md"])
+            self.assertTrue((cards_dir / "a.md").is_symlink())
+            self.assertEqual((cards_dir / "real.md").read_text(encoding="utf-8"), "keep\n")
+
+            (root / "fleet-b" / "a.md").write_text("dup\n", encoding="utf-8")
+            with self.assertRaises(SystemExit):
+                hooks.prepare_host_cards(["fleet-a", "fleet-b"], cards_dir, root)
+
+
+if __name__ == "__main__":
+    unittest.main()
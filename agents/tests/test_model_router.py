@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from hooks_support import FakeModel, hooks
+
+
+class ModelRouterTests(unittest.TestCase):
+    def setUp(self) -> None:
+        windows = {"gpt-5.4-mini": 8_000, "gpt-5.4": 100_000}
+        patcher = mock.patch.object(hooks.ModelDatabase, "get_context_window", side_effect=windows.get)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.router = hooks._ModelRouter.from_config(
+            {
+                "enabled": True,
+                "small_window_ratio": 0.6,
+                "cards": {
+                    "create_tasks": {"policy": "auto", "small_max_prompt_tokens": 5000, "small_max_tool_result_bytes": 1000},
+                    "review": "small",
+                    "summarize": {"policy": "large"},
+                },
+            }
+        )
+
+    def test_decide_follows_the_card_policy(self) -> None:
+        llm = SimpleNamespace()
+        self.assertEqual(self.router.decide("review", llm, 50_000, 0), ("gpt-5.4-mini", "policy_small"))
+        self.assertEqual(self.router.decide("summarize", llm, 10, 0), ("gpt-5.4", "policy_large"))
+        self.assertIsNone(self.router.decide("unrouted", llm, 10, 0))
+        self.assertEqual(self.router.decide("create_tasks", llm, 100, 0), ("gpt-5.4-mini", "within_small_limits"))
+        self.assertEqual(self.router.decide("create_tasks", llm, 5001, 0)[1], "prompt_tokens_over_small_limit")
+        self.assertEqual(self.router.decide("create_tasks", llm, 100, 1001)[1], "tool_result_volume_over_small_limit")
+        self.assertEqual(self.router.decide("create_tasks", SimpleNamespace(_copilot_context_tokens=3000), 1900, 0)[1], "small_context_window")
+
+    def test_escalation_is_sticky_and_pinned_models_are_kept(self) -> None:
+        agent = SimpleNamespace(_name="create_tasks", config=SimpleNamespace(model=None))
+        llm = SimpleNamespace(model_name="gpt-5.4-mini", default_request_params=FakeModel(model="gpt-5.4-mini"))
+
+        params, model = self.router.route(agent, llm, None, 6000)
+        self.assertEqual((params.model, model), ("gpt-5.4", "gpt-5.4"))
+        self.assertEqual(self.router.decide("create_tasks", llm, 10, 0), ("gpt-5.4", "sticky_escalation"))
+
+        pinned = SimpleNamespace(_name="create_tasks", config=SimpleNamespace(model="gpt-5.4-mini"))
+        pinned_llm = SimpleNamespace(model_name="gpt-5.4-mini")
+        self.assertEqual(self.router.route(pinned, pinned_llm, None, 6000), (None, "gpt-5.4-mini"))
+        self.assertFalse(self.router.escalate(pinned, pinned_llm))
+        self.assertFalse(getattr(pinned_llm, "_copilot_routed_large", False))
+
+
+if __name__ == "__main__":
+    unittest.main()
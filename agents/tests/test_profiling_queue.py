@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+from hooks_support import hooks, profiling_report
+
+
+def read_records(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+class ProfilingLogQueueTests(unittest.TestCase):
+    def test_worker_enriches_and_writes_events_off_the_loop(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            log_path = Path(tmp) / "profiling.jsonl"
+            log_queue = hooks._ProfilingLogQueue(log_path=log_path)
+            writers: list[str] = []
+
+            def enrich() -> dict:
+                writers.append(threading.current_thread().name)
+                return {"tool_result_tokens": 7}
+
+            async def scenario() -> None:
+                log_queue.submit("Inner MCP tool profiling", {"agent_name": "create_tasks", "index": 0}, enrich)
+                log_queue.submit("Inner MCP tool profiling", {"agent_name": "create_tasks", "index": 1})
+
+            asyncio.run(scenario())
+            log_queue.drain()
+
+            records = read_records(log_path)
+            self.assertEqual(writers, ["copilot-profiling-log"])
+            self.assertEqual([record["data"]["index"] for record in records], [0, 1])
+            self.assertEqual(records[0]["data"]["tool_result_tokens"], 7)
+            self.assertEqual(records[0]["namespace"], hooks.PROFILING_LOG_NAMESPACE)
+            with log_path.open(encoding="utf-8") as handle:
+                events = list(profiling_report.iter_events(handle, {"Inner MCP tool profiling"}))
+            self.assertEqual(len(events), 2)
+
+    def test_full_queue_drops_events_and_reports_the_count(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            log_path = Path(tmp) / "profiling.jsonl"
+            log_queue = hooks._ProfilingLogQueue(maxsize=1, log_path=log_path)
+            started = threading.Event()
+            release = threading.Event()
+
+            def blocking_enrich() -> dict:
+                started.set()
+                release.wait(5)
+                return {}
+
+            async def scenario() -> None:
+                log_queue.submit("event", {"index": 0}, blocking_enrich)
+                started.wait(5)
+                for index in range(1, 4):
+                    log_queue.submit("event", {"index": index})
+
+            asyncio.run(scenario())
+            release.set()
+            log_queue.drain()
+
+            records = read_records(log_path)
+            self.assertEqual([record["data"]["index"] for record in records], [0, 1])
+            self.assertEqual(sum(record["data"].get("profiling_events_dropped", 0) for record in records), 2)
+
+    def test_events_without_a_loop_or_after_drain_are_written_inline(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            log_path = Path(tmp) / "profiling.jsonl"
+            log_queue = hooks._ProfilingLogQueue(log_path=log_path)
+            log_queue.per_agent_log_dir = Path(tmp) / "agents"
+            log_queue.submit("startup", {"agent_name": "create/tasks"})
+            self.assertIsNone(log_queue._worker)
+
+            log_queue.drain()
+
+            async def late() -> None:
+                log_queue.submit("shutdown", {})
+
+            asyncio.run(late())
+            self.assertIsNone(log_queue._worker)
+            self.assertEqual([record["message"] for record in read_records(log_path)], ["startup", "shutdown"])
+            self.assertEqual(len(read_records(Path(tmp) / "agents" / "create_tasks.jsonl")), 1)
+            self.assertEqual(len(read_records(Path(tmp) / "agents" / "_runtime.jsonl")), 1)
+
+
+class ContentPayloadEstimateTests(unittest.TestCase):
+    def test_text_blobs_and_resources_are_sized_without_serializing(self) -> None:
+        content = [
+            SimpleNamespace(type="text", text="héllo"),
+            SimpleNamespace(type="text", text="ok"),
+            SimpleNamespace(type="image", data="QUJD" * 10),
+            SimpleNamespace(type="resource", resource=SimpleNamespace(text="ü", blob=None)),
+            SimpleNamespace(type="resource", resource=SimpleNamespace(text=None, blob="AAAA")),
+        ]
+
+        text_chars, text_bytes, blocks, payload_bytes = hooks._estimate_content_payload(content)
+
+        # "héllo\nok": the merged text view joins text blocks with a newline.
+        self.assertEqual((text_chars, text_bytes, blocks), (8, 9, 5))
+        self.assertEqual(payload_bytes, 6 + 2 + 40 + 2 + 4)
+        self.assertEqual(hooks._estimate_content_payload(None), (0, 0, 0, 0))
+        self.assertEqual(hooks._estimate_content_payload("raw"), (0, 0, 0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from hooks_support import hooks, profiling_report
+
+
+class PromptPrefixTests(unittest.TestCase):
+    def test_prefix_change_is_reported_against_the_routed_model(self) -> None:
+        agent = SimpleNamespace(_name="create_tasks", instruction="card text")
+        llm = SimpleNamespace(model_name="gpt-5.4-mini")
+        fetch, create = SimpleNamespace(name="fetch"), SimpleNamespace(name="create_task")
+
+        with mock.patch.object(hooks._profiling_queue, "submit") as submit, mock.patch.dict(
+            hooks._MODEL_ALIAS_LABELS, {"gpt-5.4": "gpt54", "gpt-5.4-mini": "gpt54mini"}
+        ):
+            hooks._check_prompt_prefix(agent, llm, [fetch, create], "gpt-5.4-mini")
+            hooks._check_prompt_prefix(agent, llm, [fetch, create], "gpt-5.4")
+            submit.assert_not_called()
+            hooks._check_prompt_prefix(agent, llm, [create, fetch], "gpt-5.4")
+
+        ((message, data),) = [call.args for call in submit.call_args_list]
+        self.assertEqual(message, "Prompt prefix changed")
+        self.assertEqual((data["model"], data["model_alias"]), ("gpt-5.4", "gpt54"))
+        self.assertEqual((data["changed"], data["tool_order_only"]), (["tool_schemas"], True))
+
+
+class ProfilingReportTests(unittest.TestCase):
+    def test_prompt_cache_aggregate_counts_hits_and_prefix_changes(self) -> None:
+        events = [
+            ("LLM turn profiling", {"agent_name": "a", "model_alias": "gpt54", "input_tokens": 1000, "cached_input_tokens": 800}),
+            ("LLM turn profiling", {"agent_name": "a", "model_alias": "gpt54", "input_tokens": 1000, "cached_input_tokens": 0}),
+            ("Prompt prefix changed", {"agent_name": "a", "model_alias": "gpt54", "tool_order_only": True}),
+        ]
+        row = profiling_report.aggregate_prompt_cache(events)["a"]["gpt54"]
+        self.assertEqual((row["turns"], row["cache_hit_ratio"], row["uncached_input_tokens"]), (2, 0.4, 1200))
+        self.assertEqual((row["prefix_changes"], row["tool_order_only_changes"]), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
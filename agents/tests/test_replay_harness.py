@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import types
+import unittest
+import urllib.request
+from pathlib import Path
+from types import SimpleNamespace
+
+import yaml
+
+from hooks_support import ROOT, _load, hooks
+
+
+def _stub_replay_dependencies() -> None:
+    """Stand-ins for the MCP/ASGI imports of replay_harness.py (only when they are not installed)."""
+    try:
+        import mcp  # noqa: F401
+        import starlette  # noqa: F401
+        import uvicorn  # noqa: F401
+
+        return
+    except ImportError:
+        pass
+    stubs = {
+        "uvicorn": {},
+        "mcp": {"ClientSession": object, "types": SimpleNamespace()},
+        "mcp.client": {},
+        "mcp.client.streamable_http": {"streamablehttp_client": None},
+        "mcp.server": {},
+        "mcp.server.lowlevel": {"Server": object},
+        "mcp.server.streamable_http_manager": {"StreamableHTTPSessionManager": object},
+        "starlette": {},
+        "starlette.applications": {"Starlette": object},
+        "starlette.routing": {"Mount": object},
+    }
+    for name, attributes in stubs.items():
+        module = types.ModuleType(name)
+        module.__dict__.update(attributes)
+        sys.modules.setdefault(name, module)
+
+
+_stub_replay_dependencies()
+sys.path.insert(0, str(ROOT))
+replay = _load("replay_harness_test_module", ROOT / "replay_harness.py")
+
+
+def write_jsonl(path: Path, records: list[dict]) -> None:
+    path.write_text("".join(json.dumps(record) + "\n" for record in records), encoding="utf-8")
+
+
+class FixtureTests(unittest.TestCase):
+    def test_fixtures_are_filtered_by_agent_and_failed_records_skipped(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            write_jsonl(
+                directory / "llm-streams.jsonl",
+                [
+                    {"agent_name": "create_tasks", "turn_index": 0, "events": [{"type": "a"}]},
+                    {"agent_name": "create_tasks", "turn_index": 1, "events": [{"type": "b"}]},
+                    {"agent_name": "other", "turn_index": 0, "events": [{"type": "c"}]},
+                    {"agent_name": "create_tasks", "error": "not serializable"},
+                ],
+            )
+            write_jsonl(directory / "tool-results.jsonl", [{"server_name": "voice", "tool_name": "fetch", "result": {}}])
+            write_jsonl(directory / "agent-inputs.jsonl", [{"agent_name": "create_tasks", "texts": ["hello", "world"]}])
+
+            fixtures = replay.Fixtures.load(directory, "create_tasks")
+
+            self.assertEqual(dict(fixtures.streams), {0: [[{"type": "a"}]], 1: [[{"type": "b"}]]})
+            self.assertEqual(list(fixtures.tools["voice"]), ["fetch"])
+            self.assertEqual(fixtures.inputs, ["hello\nworld"])
+            with self.assertRaises(SystemExit):
+                replay.Fixtures.load(directory, "missing")
+
+    def test_turn_index_counts_assistant_runs(self) -> None:
+        request_input = [
+            {"role": "user", "content": "hi"},
+            {"type": "reasoning"},
+            {"type": "function_call", "name": "fetch"},
+            {"type": "function_call_output"},
+            {"role": "assistant", "content": "ok"},
+            {"role": "user", "content": "more"},
+        ]
+        self.assertEqual(replay.assistant_turns_in(request_input), 2)
+        self.assertEqual(replay.assistant_turns_in("plain text"), 0)
+
+
+class ResponsesStandInTests(unittest.TestCase):
+    def test_streams_the_recorded_turn_and_reuses_the_deepest_past_it(self) -> None:
+        fixtures = replay.Fixtures()
+        fixtures.streams[0].append([{"type": "response.created"}, {"type": "response.completed"}])
+        fixtures.streams[1].append([{"type": "response.output_text.delta", "delta": "hi"}])
+        stand_in = replay.ResponsesStandIn(fixtures, chunk_delay_ms=0)
+        stand_in.start()
+        self.addCleanup(stand_in.stop)
+
+        def post(request_input: list) -> str:
+            request = urllib.request.Request(
+                f"http://127.0.0.1:{stand_in.port}/v1/responses",
+                data=json.dumps({"input": request_input}).encode(),
+                headers={"Content-Type": "application/json"},
+            )
+            with urllib.request.urlopen(request, timeout=5) as response:
+                return response.read().decode()
+
+        first = post([{"role": "user", "content": "hi"}])
+        self.assertEqual(first.count("event: "), 2)
+        self.assertIn('event: response.completed\ndata: {"type": "response.completed"}', first)
+        third = post([{"role": "assistant"}, {"role": "user"}, {"role": "assistant"}, {"role": "user"}])
+        self.assertIn('"delta": "hi"', third)
+        self.assertEqual((stand_in.requests, stand_in.unmatched), (2, 1))
+
+
+class ReplaySetupTests(unittest.TestCase):
+    def test_card_copies_switch_shell_off_and_keep_other_cards_verbatim(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            source = Path(tmp) / "cards"
+            source.mkdir()
+            shell_card = "---\ntype: agent\nname: create_tasks\nshell: true\ncwd: /srv\n---\nПромпт body\n"
+            plain_card = "---\ntype: agent\nname: review\n---\nbody\n"
+            (source / "create_tasks.md").write_text(shell_card, encoding="utf-8")
+            (source / "review.md").write_text(plain_card, encoding="utf-8")
+            target = Path(tmp) / "replay-cards"
+
+            changed = replay.prepare_replay_cards(source, target)
+
+            self.assertEqual(changed, ["create_tasks.md"])
+            front, body = replay.split_front_matter((target / "create_tasks.md").read_text(encoding="utf-8"))
+            self.assertEqual(front, {"type": "agent", "name": "create_tasks", "shell": False, "cwd": "/srv"})
+            self.assertEqual(body, "Промпт body\n")
+            self.assertEqual((target / "review.md").read_text(encoding="utf-8"), plain_card)
+            with self.assertRaises(SystemExit):
+                replay.prepare_replay_cards(Path(tmp) / "empty-dir-missing", target)
+
+    def test_the_shipped_cards_replay_without_shell(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            replay.prepare_replay_cards(replay.DEFAULT_AGENT_CARDS, Path(tmp))
+            for card in Path(tmp).glob("*.md"):
+                front, _ = replay.split_front_matter(card.read_text(encoding="utf-8"))
+                self.assertFalse(front.get("shell", False), card.name)
+
+    def test_config_points_models_and_servers_at_the_stand_ins(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            workdir = Path(tmp)
+            base = workdir / "base.yaml"
+            base.write_text(
+                yaml.safe_dump({"openai": {"api_key": "real"}, "mcp": {"servers": {"voice": {"url": "https://voice"}}}}),
+                encoding="utf-8",
+            )
+            config = yaml.safe_load(replay.write_replay_config(base, workdir, 9000, {"voice": 9001}).read_text(encoding="utf-8"))
+
+        self.assertEqual(config["openai"], {"api_key": "replay", "base_url": "http://127.0.0.1:9000/v1"})
+        self.assertEqual(config[replay.REPLAY_PROVIDER]["base_url"], "http://127.0.0.1:9000/v1")
+        self.assertEqual(config["mcp"]["servers"], {"voice": {"transport": "http", "url": "http://127.0.0.1:9001/mcp"}})
+        self.assertEqual(config["logger"]["type"], "file")
+
+
+class FixtureRecorderTests(unittest.TestCase):
+    def test_drain_writes_queued_fixtures_and_later_ones_inline(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            recorder = hooks._FixtureRecorder(Path(tmp))
+            for index in range(50):
+                recorder.record("tool_result", lambda index=index: {"tool_name": "fetch", "index": index})
+            recorder.drain()
+            self.assertFalse(recorder._worker.is_alive())
+            recorder.record("agent_input", lambda: {"agent_name": "create_tasks", "texts": ["hi"]})
+
+            results = replay.read_jsonl(Path(tmp) / "tool-results.jsonl")
+            inputs = replay.read_jsonl(Path(tmp) / "agent-inputs.jsonl")
+
+        self.assertEqual([record["index"] for record in results], list(range(50)))
+        self.assertEqual(inputs[0]["texts"], ["hi"])
+
+
+if __name__ == "__main__":
+    unittest.main()
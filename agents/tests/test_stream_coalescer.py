@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import asyncio
+import unittest
+
+from hooks_support import hooks
+
+
+class StreamCoalescerTests(unittest.TestCase):
+    def test_batches_keep_order_across_text_and_reasoning_switches(self) -> None:
+        delivered: list[tuple[str, bool]] = []
+
+        async def scenario() -> None:
+            coalescer = hooks._StreamCoalescer(
+                lambda text, is_reasoning: delivered.append((text, is_reasoning)), window_seconds=0.03, max_bytes=10
+            )
+            for text in ("th", "ink", "ing"):
+                coalescer.push(text, is_reasoning=True)
+            coalescer.push("A", is_reasoning=False)
+            coalescer.push("0123456789", is_reasoning=False)
+            coalescer.push("b", is_reasoning=False)
+            await asyncio.sleep(0.05)
+            coalescer.push("c", is_reasoning=True)
+            coalescer.push("d", is_reasoning=False)
+            coalescer.flush()
+            coalescer.flush()
+
+        asyncio.run(scenario())
+
+        self.assertEqual(
+            delivered,
+            [("thinking", True), ("A0123456789", False), ("b", False), ("c", True), ("d", False)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import unittest
+
+from hooks_support import hooks
+
+
+class StreamTextBufferTests(unittest.TestCase):
+    def test_appends_are_joined_lazily_and_counted_in_utf8_bytes(self) -> None:
+        buffer = hooks._StreamTextBuffer()
+        self.assertFalse(buffer)
+        for part in ("Prі", "", "vet", " ✓"):
+            buffer.append(part)
+        self.assertTrue(buffer)
+        self.assertEqual(buffer.byte_count, len("Prіvet ✓".encode("utf-8")))
+        self.assertEqual(buffer.text(), "Prіvet ✓")
+        self.assertEqual(buffer._parts, ["Prіvet ✓"])
+
+        buffer.append("!")
+        self.assertEqual(buffer.text(), "Prіvet ✓!")
+
+    def test_cap_truncates_on_a_character_boundary_and_stops_appending(self) -> None:
+        buffer = hooks._StreamTextBuffer(max_bytes=5)
+        buffer.append("ab")
+        buffer.append("ééé")
+        buffer.append("more")
+
+        self.assertTrue(buffer.truncated)
+        self.assertEqual(buffer.text(), "abé")
+        self.assertEqual(buffer.byte_count, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+from hooks_support import hooks
+
+
+class StreamTimingTests(unittest.TestCase):
+    def test_ttft_first_text_and_chunk_gaps(self) -> None:
+        clock = iter([0.0, 0.25, 0.2578125, 3.0, 4.0])
+        with mock.patch.object(hooks.time, "monotonic", side_effect=lambda: next(clock)):
+            timing = hooks._StreamTiming()
+            timing.observe(is_reasoning=True)
+            timing.observe(is_reasoning=False)
+            timing.observe(is_reasoning=False)
+            summary = timing.summary(output_tokens=30)
+
+        self.assertEqual(
+            (summary["ttft_ms"], summary["first_reasoning_ms"], summary["first_text_ms"], summary["stream_duration_ms"]),
+            (250, 250, 257, 4000),
+        )
+        self.assertEqual(summary["chunk_count"], 3)
+        histogram = summary["chunk_gap_histogram"]
+        self.assertEqual((histogram["le_10ms"], histogram["gt_2500ms"]), (1, 1))
+        self.assertEqual(sum(histogram.values()), 2)
+        self.assertEqual(summary["chunk_gap_max_ms"], 2742)
+        # 30 tokens over the 3.75 s between the first chunk and the end of the stream.
+        self.assertEqual(summary["output_tokens_per_second"], 8.0)
+
+    def test_stream_without_chunks_reports_no_first_token(self) -> None:
+        summary = hooks._StreamTiming().summary(output_tokens=0)
+        self.assertIsNone(summary["ttft_ms"])
+        self.assertIsNone(summary["output_tokens_per_second"])
+        self.assertEqual(summary["chunk_count"], 0)
+        self.assertEqual(sum(summary["chunk_gap_histogram"].values()), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
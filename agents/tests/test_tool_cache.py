@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import unittest
+from typing import Any
+from unittest import mock
+
+from hooks_support import hooks, tool_result
+
+
+class ToolResultCacheTests(unittest.TestCase):
+    def cache(self, max_entries: int = 256) -> Any:
+        return hooks._ToolResultCache.from_config(
+            {
+                "enabled": True,
+                "max_entries": max_entries,
+                "tools": {"voice": {"fetch": {"ttl_seconds": 10}, "project": None}},
+            }
+        )
+
+    def test_entries_expire_after_their_ttl_and_are_copied(self) -> None:
+        cache = self.cache()
+        key = cache.key_for("voice", "fetch", {"b": 1, "a": 2})
+        self.assertEqual(key, cache.key_for("voice", "fetch", {"a": 2, "b": 1}))
+        self.assertIsNone(cache.key_for("voice", "session_tasks", {}))
+
+        with mock.patch.object(hooks.time, "monotonic", return_value=100.0):
+            cache.put(key, "voice", "fetch", tool_result("transcript"))
+            cached = cache.get(key)
+            cached.content[0].text = "edited"
+            self.assertEqual(cache.get(key).content[0].text, "transcript")
+        with mock.patch.object(hooks.time, "monotonic", return_value=110.0):
+            self.assertIsNone(cache.get(key))
+        self.assertEqual(cache.stats()["tool_cache_size"], 0)
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        cache = self.cache(max_entries=2)
+        keys = [cache.key_for("voice", "project", {"id": index}) for index in range(3)]
+        cache.put(keys[0], "voice", "project", tool_result("p0"))
+        cache.put(keys[1], "voice", "project", tool_result("p1"))
+        self.assertIsNotNone(cache.get(keys[0]))
+        cache.put(keys[2], "voice", "project", tool_result("p2"))
+
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertEqual(cache.get(keys[0]).content[0].text, "p0")
+        self.assertEqual(cache.stats()["tool_cache_evictions"], 1)
+
+    def test_error_results_are_never_cached(self) -> None:
+        cache = self.cache()
+        key = cache.key_for("voice", "fetch", {"id": 1})
+        cache.put(key, "voice", "fetch", tool_result("timed out", is_error=True))
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(cache.stats()["tool_cache_size"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import json
+import unittest
+from typing import Any
+
+from hooks_support import FakeModel, hooks, tool_result
+
+
+class ToolOutputBudgetTests(unittest.TestCase):
+    def budget(self, **overrides: Any) -> Any:
+        config = {
+            "enabled": True,
+            "default_max_bytes": 300,
+            "agents": {"create_tasks": {"max_bytes": 250}},
+            "tools": {"voice": {"fetch": {"max_bytes": 400}}},
+        }
+        config.update(overrides)
+        return hooks._ToolOutputBudget.from_config(config)
+
+    def test_limits_take_the_tightest_configured_budget(self) -> None:
+        budget = self.budget()
+        self.assertEqual(budget.limit_for("create_tasks", "voice", "fetch"), 250)
+        self.assertEqual(budget.limit_for("other", "voice", "fetch"), 400)
+        self.assertEqual(budget.limit_for("other", "fs", "read"), 300)
+        self.assertIsNone(hooks._ToolOutputBudget.from_config({"enabled": False}))
+
+    def test_text_is_elided_or_truncated_around_a_marker(self) -> None:
+        text = "é" * 100 + "MIDDLE" + "z" * 500
+        original = tool_result(text)
+        shrunk, savings = self.budget().apply(original, 250)
+        kept = shrunk.content[0].text
+        self.assertLessEqual(len(kept.encode()), 250)
+        self.assertTrue(kept.startswith("é"))
+        self.assertTrue(kept.endswith("z"))
+        self.assertIn("[copilot: elided", kept)
+        self.assertEqual(savings["budget_actions"], ["head_tail"])
+        self.assertEqual(original.content[0].text, text)
+
+        truncated, savings = self.budget(strategy="truncate").apply(tool_result(text), 250)
+        self.assertIn("[copilot: tool output truncated, 706 bytes total, budget 250 bytes]", truncated.content[0].text)
+        self.assertEqual(savings["budget_actions"], ["truncate"])
+
+    def test_json_arrays_are_paginated_with_a_page_marker(self) -> None:
+        items = [{"id": index, "v": "x" * 20} for index in range(50)]
+        paged, savings = self.budget().apply(tool_result(json.dumps(items)), 600)
+        page = json.loads(paged.content[0].text)
+        marker = page[-1]["_copilot_page"]
+
+        self.assertEqual(savings["budget_actions"], ["paginate"])
+        self.assertLessEqual(len(paged.content[0].text.encode()), 600)
+        self.assertEqual(page[:-1], items[: marker["returned_items"]])
+        self.assertEqual((marker["total_items"], marker["omitted_items"]), (50, 50 - marker["returned_items"]))
+
+    def test_results_within_budget_are_left_alone(self) -> None:
+        result = tool_result("short")
+        self.assertEqual(self.budget().apply(result, 300), (result, None))
+
+    def test_cut_json_objects_are_marked_as_not_json(self) -> None:
+        document = json.dumps({"items": [{"id": index, "v": "x" * 20} for index in range(50)], "total": 50})
+        cut, savings = self.budget().apply(tool_result(document), 300)
+        text = cut.content[0].text
+
+        self.assertEqual(savings["budget_actions"], ["head_tail"])
+        self.assertLessEqual(len(text.encode()), 300)
+        self.assertTrue(text.startswith("[copilot: JSON tool output cut to 300 bytes; the text below is not valid JSON]\n"))
+        self.assertIn('{"items": [{"id": 0', text)
+
+    def test_binary_blocks_are_not_counted_or_changed(self) -> None:
+        image = FakeModel(type="image", data="A" * 5000, mimeType="image/png")
+        result = FakeModel(content=[image, FakeModel(type="text", text="caption")], isError=False)
+        _, text_bytes, _, payload_bytes = hooks._estimate_content_payload(result.content)
+        self.assertLessEqual(text_bytes, 300)
+        self.assertGreater(payload_bytes, 300)
+        self.assertEqual(self.budget().apply(result, 300), (result, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
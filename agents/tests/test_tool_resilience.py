@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import unittest
+from typing import Any
+
+from hooks_support import hooks
+
+
+def make_resilience(**overrides: Any) -> Any:
+    settings = dict(
+        idempotent_tools={("voice", "fetch")},
+        window=50,
+        min_samples=3,
+        ewma_alpha=0.5,
+        timeout_multiplier=3.0,
+        min_timeout_seconds=0.5,
+        max_timeout_seconds=2.0,
+        hedge_min_delay_ms=10,
+        failure_threshold=2,
+        open_seconds=0.05,
+    )
+    settings.update(overrides)
+    return hooks._ToolResilience(**settings)
+
+
+async def _succeed() -> str:
+    return "ok"
+
+
+async def _fail() -> str:
+    raise RuntimeError("server down")
+
+
+class ToolResilienceTests(unittest.TestCase):
+    def test_breaker_opens_half_opens_and_survives_a_cancelled_trial(self) -> None:
+        resilience = make_resilience()
+
+        async def scenario() -> None:
+            for _ in range(2):
+                with self.assertRaises(RuntimeError):
+                    await resilience.call(_fail, "voice", "fetch")
+            self.assertEqual(resilience.breaker_state("voice"), "open")
+            with self.assertRaises(hooks._CircuitOpenError):
+                await resilience.call(_succeed, "voice", "fetch")
+
+            await asyncio.sleep(0.06)
+            self.assertEqual(resilience.breaker_state("voice"), "half_open")
+            hang = asyncio.Event()
+            trial = asyncio.ensure_future(resilience.call(hang.wait, "voice", "fetch"))
+            await asyncio.sleep(0)
+            with self.assertRaises(hooks._CircuitOpenError):
+                await resilience.call(_succeed, "voice", "fetch")
+            trial.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await trial
+
+            # The cancelled trial neither closed nor re-opened the breaker; the next call is the new trial.
+            self.assertEqual(resilience.breaker_state("voice"), "half_open")
+            result, _ = await resilience.call(_succeed, "voice", "fetch")
+            self.assertEqual(result, "ok")
+            self.assertEqual(resilience.breaker_state("voice"), "closed")
+
+        asyncio.run(scenario())
+
+    def test_hedged_request_wins_and_the_slow_call_is_cancelled(self) -> None:
+        resilience = make_resilience()
+        for _ in range(3):
+            resilience.tool("voice", "fetch").observe(1.0, resilience.ewma_alpha)
+        cancelled: list[str] = []
+        calls = 0
+
+        async def invoke() -> str:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                try:
+                    await asyncio.sleep(1)
+                except asyncio.CancelledError:
+                    cancelled.append("primary")
+                    raise
+                return "primary"
+            return "hedge"
+
+        result, info = asyncio.run(resilience.call(invoke, "voice", "fetch"))
+
+        self.assertEqual(result, "hedge")
+        self.assertEqual((info["hedged"], info["hedge_won"]), (True, True))
+        self.assertEqual(cancelled, ["primary"])
+        self.assertAlmostEqual(info["timeout_seconds"], 0.5)
+
+    def test_latency_is_per_tool_and_only_idempotent_tools_time_out(self) -> None:
+        resilience = make_resilience()
+        for _ in range(3):
+            resilience.tool("voice", "create_task").observe(1500.0, resilience.ewma_alpha)
+            resilience.tool("voice", "fetch").observe(100.0, resilience.ewma_alpha)
+
+        self.assertAlmostEqual(resilience.timeout_for("voice", "fetch"), 0.5)
+        self.assertIsNone(resilience.timeout_for("voice", "create_task"))
+        self.assertIsNone(resilience.hedge_delay_for("voice", "create_task"))
+        self.assertEqual(resilience.stats("voice", "fetch")["tool_latency_p95_ms"], 100)
+
+        async def slow_write() -> str:
+            await asyncio.sleep(0.1)
+            return "created"
+
+        slow = make_resilience(max_timeout_seconds=0.05)
+        result, info = asyncio.run(slow.call(slow_write, "voice", "create_task"))
+        self.assertEqual((result, info["timeout_seconds"]), ("created", None))
+        with self.assertRaisesRegex(TimeoutError, "adaptive timeout"):
+            asyncio.run(slow.call(lambda: asyncio.sleep(1), "voice", "fetch"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+import unittest
+from unittest import mock
+
+from hooks_support import hooks, profiling_report
+
+
+class TurnBreakdownTests(unittest.TestCase):
+    def test_parallel_tool_spans_are_counted_once(self) -> None:
+        with mock.patch.object(hooks.time, "monotonic", return_value=10.0):
+            turn = hooks._TurnBreakdown("create_tasks")
+        turn.record_stream(model="gpt-5.4", first_chunk=10.5, finished=11.0)
+        turn.generate_finished = 11.0
+        turn.record_tool(server_name="voice", tool_name="fetch", started=11.0, finished=12.0, status="ok")
+        turn.record_tool(server_name="voice", tool_name="project", started=11.5, finished=12.5, status="ok")
+
+        summary = turn.summary()
+
+        self.assertEqual(
+            (summary["turn_total_ms"], summary["llm_wait_ms"], summary["streaming_ms"], summary["tools_ms"], summary["overhead_ms"]),
+            (2500, 500, 500, 1500, 0),
+        )
+        self.assertEqual([tool["tool_name"] for tool in summary["tool_calls"]], ["fetch", "project"])
+
+    def test_turn_left_open_by_a_tool_call_is_emitted_when_the_agent_returns(self) -> None:
+        emitted: list[dict] = []
+        outer = hooks._TurnBreakdown("parent")
+
+        async def generate(agent: object, message: str) -> str:
+            # The last LLM call requested tools, so the hooks left its turn open.
+            hooks._current_turn.set(hooks._TurnBreakdown("create_tasks"))
+            return "done"
+
+        async def scenario() -> None:
+            hooks._current_turn.set(outer)
+            wrapped = hooks._closing_pending_turn(generate)
+            self.assertEqual(await wrapped(object(), "hi"), "done")
+            self.assertIs(hooks._current_turn.get(), outer)
+
+        with mock.patch.object(
+            hooks._profiling_queue, "submit", side_effect=lambda message, data, enrich=None: emitted.append(data)
+        ):
+            asyncio.run(scenario())
+
+        self.assertEqual([event["agent_name"] for event in emitted], ["create_tasks"])
+
+
+class ProfilingReportTests(unittest.TestCase):
+    def test_aggregate_reports_percentiles_per_agent_and_tool(self) -> None:
+        events = [
+            {
+                "agent_name": "create_tasks",
+                "turn_total_ms": total,
+                "llm_wait_ms": 100,
+                "streaming_ms": 50,
+                "tools_ms": total - 150,
+                "overhead_ms": 0,
+                "tool_calls": [{"server_name": "voice", "tool_name": "fetch", "duration_ms": total - 150}],
+            }
+            for total in (200, 400, 1000)
+        ]
+        events.append({"agent_name": "other", "turn_total_ms": 10})
+
+        report = profiling_report.aggregate(events, ["create_tasks"])
+
+        self.assertEqual(list(report), ["create_tasks"])
+        row = report["create_tasks"]
+        self.assertEqual(row["turns"], 3)
+        self.assertEqual(row["turn_total_ms"], {"p50": 400, "p95": 1000})
+        self.assertEqual(row["tools"]["voice.fetch"], {"calls": 3, "p50": 250, "p95": 850})
+
+
+if __name__ == "__main__":
+    unittest.main()
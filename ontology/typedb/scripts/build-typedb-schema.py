@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import argparse
 import json
+from collections import Counter
 from pathlib import Path
 import re
 
@@ -12,6 +13,8 @@ TYPEDB_ROOT = SCRIPT_DIR.parent
 FRAGMENTS_ROOT = TYPEDB_ROOT / "schema" / "fragments"
 DEFAULT_OUTPUT = TYPEDB_ROOT / "schema" / "str-ontology.tql"
 DEFAULT_DOMAIN_JSON = TYPEDB_ROOT / "inventory_latest" / "domain_inventory_latest.json"
+# Read by ingest/contract-check to decide when str-ontology.tql needs a rebuild (and from which values source).
+SCHEMA_BUILD_MANIFEST = TYPEDB_ROOT / "logs" / "schema-cache" / "schema-build-manifest.json"
 
 SECTION_ORDER = [
     ("kernel", FRAGMENTS_ROOT / "00-kernel"),
@@ -30,6 +33,12 @@ def parse_args() -> argparse.Namespace:
         default=DEFAULT_DOMAIN_JSON,
         help="Optional JSON sidecar produced by domain-inventory for generated # @toon values injection",
     )
+    parser.add_argument(
+        "--domain-sketches",
+        type=Path,
+        default=None,
+        help="Use value sketches maintained by ingest (logs/typedb-ontology-domain-sketches.json) instead of --domain-json",
+    )
     return parser.parse_args()
 
 
@@ -63,6 +72,37 @@ def load_domain_inventory(path: Path) -> dict[str, dict] | None:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
+def load_domain_sketches(path: Path) -> dict[str, dict] | None:
+    """Fold ingest value sketches into the domain-inventory JSON shape consumed by render_toon_values."""
+    if not path.exists():
+        return None
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    inventory: dict[str, dict] = {}
+    counts: dict[str, Counter[str]] = {}
+    for collection, entry in sorted((payload.get("collections") or {}).items()):
+        for attr, sketch in sorted((entry.get("attrs") or {}).items()):
+            bucket = inventory.setdefault(
+                attr,
+                {
+                    "declared_domain": sketch.get("declared_domain"),
+                    "max_values": sketch.get("max_values"),
+                    "collections": [],
+                    "values": [],
+                    "truncated": False,
+                },
+            )
+            bucket["collections"].append(
+                {"collection": collection, "target_entity": entry.get("target_entity"), "source_field": sketch.get("source_field")}
+            )
+            bucket["truncated"] = bucket["truncated"] or bool(sketch.get("overflow"))
+            attr_counts = counts.setdefault(attr, Counter())
+            for value, count in sketch.get("counts") or []:
+                attr_counts[value] += int(count)
+    for attr, bucket in inventory.items():
+        bucket["values"] = [value for value, _ in sorted(counts[attr].items(), key=lambda item: (-item[1], item[0]))]
+    return inventory
+
+
 def normalize_priority_display(value: str) -> str:
     compact = re.sub(r"[^A-Z0-9]+", "", value.upper())
     if compact == "UNKNOWN":
@@ -88,7 +128,7 @@ def render_toon_values(attr: str | dict, inventory: dict[str, dict] | None) -> s
         return "# @toon values: <structured domain; see domain_inventory_latest.md>"
     if len(values) == 0:
         return None
-    if max_values and len(values) > int(max_values):
+    if payload.get("truncated") or (max_values and len(values) > int(max_values)):
         return "# @toon values: <too many values; see domain_inventory_latest.md>"
 
     normalized: list[str] = []
@@ -152,11 +192,34 @@ def write_text(path: Path, content: str) -> None:
     path.write_text(content, encoding="utf-8")
 
 
+def record_domain_source(manifest_path: Path, domain_sketches: Path | None) -> None:
+    """Keep the values source in the schema-build manifest so automatic rebuilds reuse it.
+
+    The recorded input/output hashes no longer match after a manual build, so the next ingest
+    rebuilds once, from the same source, and refreshes them.
+    """
+    manifest: dict = {}
+    if manifest_path.exists():
+        try:
+            loaded = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except ValueError:
+            loaded = None
+        if isinstance(loaded, dict):
+            manifest = loaded
+    manifest["domain_sketches"] = str(domain_sketches.resolve()) if domain_sketches is not None else None
+    write_text(manifest_path, json.dumps(manifest, ensure_ascii=False, separators=(",", ":")))
+
+
 def main() -> int:
     args = parse_args()
-    domain_inventory = load_domain_inventory(args.domain_json)
+    if args.domain_sketches is not None:
+        domain_inventory = load_domain_sketches(args.domain_sketches)
+    else:
+        domain_inventory = load_domain_inventory(args.domain_json)
     schema_text = build_schema_text(domain_inventory)
     write_text(args.output, schema_text)
+    if args.output.resolve() == DEFAULT_OUTPUT:
+        record_domain_source(SCHEMA_BUILD_MANIFEST, args.domain_sketches)
     print(f"[build-typedb-schema] wrote {args.output}")
     return 0
 
@@ -73,6 +73,7 @@ PY
 
   PYTHONUNBUFFERED=1 bash ../ontology/typedb/scripts/run-typedb-python.sh \
     ../ontology/typedb/scripts/typedb-ontology-validate.py \
+    --recount \
     --typedb-database "$target_db"
 }
 
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+import argparse
+import gzip
+import importlib.util
+import json
+import os
+import pathlib
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+from typedb.driver import Credentials, DriverOptions, TransactionType, TypeDB
+
+SCRIPT_DIR = pathlib.Path(__file__).resolve().parent
+INGEST_SCRIPT = SCRIPT_DIR / "typedb-ontology-ingest.py"
+
+spec = importlib.util.spec_from_file_location("typedb_ontology_ingest_module", INGEST_SCRIPT)
+if spec is None or spec.loader is None:
+    raise RuntimeError(f"Cannot load ingest helpers from {INGEST_SCRIPT}")
+ingest = importlib.util.module_from_spec(spec)
+sys.modules["typedb_ontology_ingest_module"] = ingest
+spec.loader.exec_module(ingest)
+
+DEFAULT_WRITERS = 8
+DEFAULT_GROUP_OPS = 50
+
+
+@dataclass
+class BatchResult:
+    path: str
+    ops: int = 0
+    applied: int = 0
+    skipped: int = 0
+    failed: int = 0
+    group_commits: int = 0
+    group_fallbacks: int = 0
+
+    def merge(self, other: "BatchResult") -> None:
+        self.ops += other.ops
+        self.applied += other.applied
+        self.skipped += other.skipped
+        self.failed += other.failed
+        self.group_commits += other.group_commits
+        self.group_fallbacks += other.group_fallbacks
+
+
+class LockedDeadletter:
+    def __init__(self, writer: Any) -> None:
+        self._writer = writer
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> pathlib.Path:
+        return self._writer.path
+
+    def write(self, entry: dict[str, Any]) -> None:
+        with self._lock:
+            self._writer.write(entry)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Apply a TypeQL write plan emitted by typedb-ontology-ingest.py --emit-plan")
+    parser.add_argument("plan_dir", type=str, help="Directory containing the plan manifest.json")
+    parser.add_argument("--writers", type=int, default=DEFAULT_WRITERS, help="Parallel writer threads per plan phase")
+    parser.add_argument(
+        "--group-ops",
+        type=int,
+        default=DEFAULT_GROUP_OPS,
+        help="Plan ops committed per TypeDB write transaction (failed groups fall back to one op per transaction)",
+    )
+    parser.add_argument("--init-schema", action="store_true", help="Load schema before applying the plan")
+    parser.add_argument(
+        "--schema",
+        type=str,
+        default=None,
+        help="Path to TypeQL schema (defaults to the schema recorded in the plan manifest)",
+    )
+    parser.add_argument("--run-id", type=str, default=None)
+    parser.add_argument(
+        "--deadletter",
+        type=str,
+        default=str(ingest.TYPEDB_ROOT_DIR / "logs" / "typedb-ontology-apply-plan-deadletter.ndjson"),
+        help="Path to deadletter NDJSON",
+    )
+    parser.add_argument("--typedb-addresses", type=str, default=None)
+    parser.add_argument("--typedb-username", type=str, default=None)
+    parser.add_argument("--typedb-password", type=str, default=None)
+    parser.add_argument("--typedb-database", type=str, default=None)
+    parser.add_argument("--typedb-tls-enabled", type=str, default=None)
+    return parser.parse_args()
+
+
+def load_manifest(plan_dir: pathlib.Path) -> dict[str, Any]:
+    manifest_path = plan_dir / ingest.PLAN_MANIFEST_NAME
+    if not manifest_path.exists():
+        raise ValueError(f"Plan manifest not found: {manifest_path}")
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    if manifest.get("format") != ingest.PLAN_FORMAT:
+        raise ValueError(f"Unsupported plan format: {manifest.get('format')!r} (expected {ingest.PLAN_FORMAT})")
+    return manifest
+
+
+def iter_plan_ops(path: pathlib.Path) -> Iterator[dict[str, Any]]:
+    with gzip.open(path, "rt", encoding="utf-8") as fp:
+        for line in fp:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_groups(ops: Iterator[dict[str, Any]], size: int) -> Iterator[list[dict[str, Any]]]:
+    group: list[dict[str, Any]] = []
+    for op in ops:
+        group.append(op)
+        if len(group) >= size:
+            yield group
+            group = []
+    if group:
+        yield group
+
+
+def apply_op(driver: Any, database: str, op: dict[str, Any], result: BatchResult, deadletter: Any) -> None:
+    try:
+        ingest.execute_queries_in_transaction(driver, database, TransactionType.WRITE, op["queries"])
+        result.applied += 1
+    except Exception as error:
+        if "[CNT9]" in str(error):
+            result.skipped += 1
+            return
+        result.failed += 1
+        deadletter.write(
+            {
+                "collection": op.get("collection"),
+                "source_id": op.get("seq"),
+                "reason": "plan_op_failed",
+                "error": str(error),
+                "queries": op["queries"],
+                "requires": op.get("requires", []),
+            }
+        )
+
+
+def apply_batch(
+    driver: Any,
+    database: str,
+    plan_dir: pathlib.Path,
+    batch: dict[str, Any],
+    group_ops: int,
+    deadletter: Any,
+) -> BatchResult:
+    result = BatchResult(path=batch["path"])
+    for group in iter_groups(iter_plan_ops(plan_dir / batch["path"]), group_ops):
+        result.ops += len(group)
+        queries = [query for op in group for query in op["queries"]]
+        try:
+            ingest.execute_queries_in_transaction(driver, database, TransactionType.WRITE, queries)
+            result.applied += len(group)
+            result.group_commits += 1
+            continue
+        except Exception:
+            if len(group) == 1:
+                apply_op(driver, database, group[0], result, deadletter)
+                continue
+        # One bad op (duplicate key, dangling match) aborts the whole group; isolate it.
+        result.group_fallbacks += 1
+        for op in group:
+            apply_op(driver, database, op, result, deadletter)
+    return result
+
+
+def apply_plan(
+    driver: Any,
+    database: str,
+    plan_dir: pathlib.Path,
+    manifest: dict[str, Any],
+    *,
+    writers: int,
+    group_ops: int,
+    deadletter: Any,
+) -> BatchResult:
+    total = BatchResult(path=str(plan_dir))
+    for phase in manifest.get("phases", []):
+        started = time.time()
+        phase_result = BatchResult(path=phase["name"])
+        with ThreadPoolExecutor(max_workers=writers) as pool:
+            futures = [
+                pool.submit(apply_batch, driver, database, plan_dir, batch, group_ops, deadletter)
+                for batch in phase.get("batches", [])
+            ]
+            for future in futures:
+                phase_result.merge(future.result())
+        duration_s = max(time.time() - started, 1e-9)
+        print(
+            f"[typedb-ontology-apply-plan] phase={phase['name']} level={phase['level']} "
+            f"batches={len(phase.get('batches', []))} ops={phase_result.ops} applied={phase_result.applied} "
+            f"skipped={phase_result.skipped} failed={phase_result.failed} "
+            f"group_commits={phase_result.group_commits} group_fallbacks={phase_result.group_fallbacks} "
+            f"duration_ms={int(duration_s * 1000)} ops_per_s={phase_result.ops / duration_s:.1f}"
+        )
+        total.merge(phase_result)
+    return total
+
+
+def main() -> int:
+    ingest.load_operator_env()
+    args = parse_args()
+    if args.writers <= 0:
+        print(f"[typedb-ontology-apply-plan] failed: invalid --writers value: {args.writers}", file=sys.stderr)
+        return 1
+    if args.group_ops <= 0:
+        print(f"[typedb-ontology-apply-plan] failed: invalid --group-ops value: {args.group_ops}", file=sys.stderr)
+        return 1
+
+    plan_dir = pathlib.Path(args.plan_dir).resolve()
+    try:
+        manifest = load_manifest(plan_dir)
+    except ValueError as error:
+        print(f"[typedb-ontology-apply-plan] failed: {error}", file=sys.stderr)
+        return 1
+
+    addresses = ingest.parse_typedb_addresses(
+        args.typedb_addresses or os.getenv("TYPEDB_ADDRESSES") or "127.0.0.1:1729"
+    )
+    database = args.typedb_database or os.getenv("TYPEDB_DATABASE") or "str_opsportal_v1"
+    schema_path = pathlib.Path(args.schema or manifest.get("schema_path") or ingest.DEFAULT_SCHEMA_PATH).resolve()
+    run_id = (args.run_id or time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())).strip()
+
+    print(
+        f"[typedb-ontology-apply-plan] plan={plan_dir} plan_run_id={manifest.get('run_id')} "
+        f"ops={manifest.get('ops_total')} phases={len(manifest.get('phases', []))} "
+        f"unresolved_requires={manifest.get('unresolved_requires')} "
+        f"writers={args.writers} group_ops={args.group_ops} "
+        f"addresses={','.join(addresses)} db={database}"
+    )
+
+    deadletter = LockedDeadletter(ingest.DeadletterWriter(pathlib.Path(args.deadletter).resolve(), run_id))
+    driver = None
+    try:
+        driver = TypeDB.driver(
+            addresses[0],
+            Credentials(
+                args.typedb_username or os.getenv("TYPEDB_USERNAME") or "admin",
+                args.typedb_password or os.getenv("TYPEDB_PASSWORD") or "password",
+            ),
+            DriverOptions(
+                is_tls_enabled=ingest.parse_bool(args.typedb_tls_enabled or os.getenv("TYPEDB_TLS_ENABLED"), default=False)
+            ),
+        )
+        exists = driver.databases.contains(database)
+        if not exists:
+            driver.databases.create(database)
+            print(f"[typedb-ontology-apply-plan] created database: {database}")
+        if not exists or args.init_schema:
+            ingest.execute_query_in_transaction(
+                driver, database, TransactionType.SCHEMA, schema_path.read_text(encoding="utf-8")
+            )
+            print(f"[typedb-ontology-apply-plan] schema loaded from {schema_path}")
+
+        started = time.time()
+        total = apply_plan(
+            driver,
+            database,
+            plan_dir,
+            manifest,
+            writers=args.writers,
+            group_ops=args.group_ops,
+            deadletter=deadletter,
+        )
+        duration_s = max(time.time() - started, 1e-9)
+        if total.applied:
+            # Plan writes do not maintain validation_counter values; validate --counters reports them stale until --recount.
+            ingest.validation.mark_counters_stale(driver, database)
+        print(
+            f"[typedb-ontology-apply-plan] done ops={total.ops} applied={total.applied} "
+            f"skipped={total.skipped} failed={total.failed} group_fallbacks={total.group_fallbacks} "
+            f"duration_ms={int(duration_s * 1000)} ops_per_s={total.ops / duration_s:.1f}"
+        )
+        print(f"[typedb-ontology-apply-plan] deadletter={deadletter.path}")
+        return 0 if total.failed == 0 else 2
+    except Exception as error:
+        print(f"[typedb-ontology-apply-plan] failed: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if driver is not None:
+            try:
+                driver.close()
+            except Exception:
+                pass
+        deadletter.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,14 +3,16 @@ from __future__ import annotations
 
 import argparse
 import importlib.util
+import math
 import os
 import sys
 import time
 from collections import defaultdict
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 from types import SimpleNamespace
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from pymongo import MongoClient
 
@@ -72,25 +74,437 @@ SPARSE_OPTIONAL_RELATION_LOOKUPS: dict[str, set[str]] = {
 
 REASONING_ITEM_KINDS = {"assumption", "open_question"}
 
+# Server-side equivalents of ingest.LOOKUP_TRANSFORMS: a lookup resolves when the
+# stringified key matches. Collections using a transform missing here fall back to the Python scan.
+SERVER_LOOKUP_TRANSFORM_PATTERNS: dict[str, str] = {
+    "canonical_voice_ref_to_session_id": r"^[0-9a-f]{24}$|/session/[0-9a-f]{24}(?:[/?#].*)?$",
+}
+
+MONGO_NULLISH_TYPES = ["missing", "null"]
+MONGO_ALWAYS_KEYED_TYPES = ["objectId", "bool", "int", "long", "date", "array", "object"]
+MONGO_NON_FINITE_DOUBLES = [float("nan"), float("inf"), float("-inf")]
+
+
+@dataclass
+class CollectionScan:
+    scanned: int = 0
+    sampled: bool = False
+    population: Optional[int] = None
+    missing_paths: dict[str, int] = field(default_factory=dict)
+    empty_relation_keys: dict[str, int] = field(default_factory=dict)
+    unsupported_kinds: list[Optional[str]] = field(default_factory=list)
+    missing_evidence_link_ids: int = 0
 
-def parse_args() -> argparse.Namespace:
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description='Validate MongoDB documents against TypeDB schema/mapping without importing data')
     parser.add_argument('--collections', type=str, default=None, help='Comma-separated collection list')
     parser.add_argument('--limit', type=int, default=None, help='Limit docs per collection')
     parser.add_argument('--schema', type=str, default=str(ingest.DEFAULT_SCHEMA_PATH), help='Path to generated TypeQL schema')
     parser.add_argument('--mapping', type=str, default=str(ingest.DEFAULT_MAPPING_PATH), help='Path to MongoDB->TypeDB mapping YAML')
     parser.add_argument('--sample-errors', type=int, default=5, help='Max examples per issue type')
-    return parser.parse_args()
-
-
-def iter_docs(db: Any, collection: str, limit: Optional[int]):
-    cursor = db[collection].find({})
-    if limit is not None:
-        cursor = cursor.limit(limit)
+    parser.add_argument(
+        '--scan-mode',
+        choices=['aggregate', 'python'],
+        default='aggregate',
+        help='Count unresolved paths inside Mongo with one aggregation per collection, or pull documents into Python',
+    )
+    parser.add_argument('--workers', type=int, default=4, help='Collections scanned concurrently')
+    parser.add_argument(
+        '--sample',
+        type=str,
+        default=None,
+        help='Scan a random sample per collection: a document count (e.g. 500) or a fraction (e.g. 0.05); rates are reported with 95%% confidence intervals',
+    )
+    parser.add_argument(
+        '--escalate-below',
+        type=float,
+        default=0.99,
+        help='Re-check an "unresolved in all docs" sample finding with a full scan when its confidence lower bound is below this rate (0 disables escalation)',
+    )
+    args = parser.parse_args(argv)
+    try:
+        parse_sample_spec(args.sample)
+    except ValueError as error:
+        parser.error(str(error))
+    return args
+
+
+def parse_sample_spec(raw: Optional[str]) -> Optional[tuple[str, float]]:
+    if raw is None:
+        return None
+    try:
+        value = float(raw)
+    except ValueError:
+        raise ValueError(f'Invalid --sample value: {raw} (expected a document count or a fraction)') from None
+    if '.' in raw or 0 < value < 1:
+        if not 0 < value <= 1:
+            raise ValueError(f'Invalid --sample fraction: {raw}')
+        return ('fraction', value)
+    if value < 1 or not value.is_integer():
+        raise ValueError(f'Invalid --sample size: {raw}')
+    return ('count', value)
+
+
+def resolve_sample_size(population: int, spec: tuple[str, float]) -> Optional[int]:
+    kind, value = spec
+    size = math.ceil(population * value) if kind == 'fraction' else int(value)
+    # Sampling everything is just a slower full scan.
+    if size >= population:
+        return None
+    return max(1, size)
+
+
+def wilson_interval(successes: int, total: int, z: float = 1.96) -> tuple[float, float]:
+    if total <= 0:
+        return (0.0, 1.0)
+    rate = successes / total
+    denominator = 1 + z * z / total
+    center = (rate + z * z / (2 * total)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / total + z * z / (4 * total * total)) / denominator
+    return (max(0.0, center - margin), min(1.0, center + margin))
+
+
+def format_rate(successes: int, total: int) -> str:
+    low, high = wilson_interval(successes, total)
+    return f'rate={successes / total:.1%} ci95=[{low:.1%}, {high:.1%}]'
+
+
+def iter_docs(db: Any, collection: str, limit: Optional[int], sample_size: Optional[int] = None):
+    if sample_size is not None:
+        cursor = db[collection].aggregate([{'$sample': {'size': sample_size}}], allowDiskUse=True)
+    else:
+        cursor = db[collection].find({})
+        if limit is not None:
+            cursor = cursor.limit(limit)
     for raw_doc in cursor:
         yield dict(raw_doc)
 
 
+def mapped_path_checks(cfg: dict[str, Any]) -> list[tuple[str, str, Optional[list[str]]]]:
+    attributes_cfg = cfg.get('attributes') or {}
+    coalesce_cfg = cfg.get('coalesce') or {}
+    checks = []
+    for attr, source_field in attributes_cfg.items():
+        if not isinstance(source_field, str):
+            continue
+        coalesce_fields = coalesce_cfg.get(attr) if isinstance(coalesce_cfg, dict) else None
+        checks.append((f'{attr} <- {source_field}', source_field, coalesce_fields if isinstance(coalesce_fields, list) else None))
+    return checks
+
+
+def relation_lookup_checks(cfg: dict[str, Any]) -> list[tuple[str, str, Optional[str]]]:
+    checks = []
+    for rel_cfg in cfg.get('relations') or []:
+        if not isinstance(rel_cfg, dict):
+            continue
+        relation_name = rel_cfg.get('relation')
+        owner_lookup = rel_cfg.get('owner_lookup') or {}
+        owner_from = owner_lookup.get('from') if isinstance(owner_lookup, dict) else None
+        owner_transform = owner_lookup.get('transform') if isinstance(owner_lookup, dict) else None
+        if not isinstance(relation_name, str) or not isinstance(owner_from, str):
+            continue
+        checks.append((f'{relation_name} <- {owner_from}', owner_from, owner_transform if isinstance(owner_transform, str) else None))
+    return checks
+
+
+def observe_contract_doc(
+    result: CollectionScan,
+    collection: str,
+    doc: dict[str, Any],
+    path_checks: list[tuple[str, str, Optional[list[str]]]],
+    lookup_checks: list[tuple[str, str, Optional[str]]],
+) -> None:
+    result.scanned += 1
+    if collection == "automation_reasoning_items":
+        kind_value = ingest.as_string(doc.get("kind"))
+        normalized_kind = kind_value.strip().lower() if isinstance(kind_value, str) else ""
+        if normalized_kind not in REASONING_ITEM_KINDS and kind_value not in result.unsupported_kinds:
+            result.unsupported_kinds.append(kind_value)
+    if collection == "automation_visual_observations":
+        if not ingest.normalize_id(doc.get("evidence_link_id")):
+            result.missing_evidence_link_ids += 1
+    for desc, source_field, coalesce_fields in path_checks:
+        if ingest.resolve_mapped_value(doc, source_field, coalesce_fields) is None:
+            result.missing_paths[desc] = result.missing_paths.get(desc, 0) + 1
+    for desc, owner_from, owner_transform in lookup_checks:
+        if ingest.apply_lookup_transform(owner_transform, ingest.resolve_doc_path(doc, owner_from)) is None:
+            result.empty_relation_keys[desc] = result.empty_relation_keys.get(desc, 0) + 1
+
+
+def scan_collection_python(db: Any, collection: str, cfg: dict[str, Any], limit: Optional[int], sample_size: Optional[int] = None) -> CollectionScan:
+    result = CollectionScan(sampled=sample_size is not None)
+    path_checks = mapped_path_checks(cfg)
+    lookup_checks = relation_lookup_checks(cfg)
+    for doc in iter_docs(db, collection, limit, sample_size):
+        observe_contract_doc(result, collection, doc, path_checks, lookup_checks)
+    return result
+
+
+class ContractScanConsumer:
+    """Scan consumer (see ingest.ScanConsumer) building the same CollectionScan as the Python scan."""
+
+    def __init__(self, mapping_by_collection: dict[str, dict[str, Any]], collections: list[str]) -> None:
+        self._checks = {
+            collection: (mapped_path_checks(mapping_by_collection[collection]), relation_lookup_checks(mapping_by_collection[collection]))
+            for collection in collections
+        }
+        self.scans: dict[str, CollectionScan] = {}
+
+    def wants(self, collection: str) -> bool:
+        return collection in self._checks
+
+    def projection_fields(self, collection: str) -> Optional[list[str]]:
+        path_checks, lookup_checks = self._checks[collection]
+        fields = ['kind', 'evidence_link_id']
+        for _desc, source_field, coalesce_fields in path_checks:
+            fields.extend(coalesce_fields or [source_field])
+        fields.extend(owner_from for _desc, owner_from, _transform in lookup_checks)
+        return fields
+
+    def begin(self, collection: str) -> None:
+        self.scans[collection] = CollectionScan()
+
+    def observe(self, collection: str, doc: dict[str, Any]) -> None:
+        path_checks, lookup_checks = self._checks[collection]
+        observe_contract_doc(self.scans[collection], collection, doc, path_checks, lookup_checks)
+
+    def end(self, collection: str) -> None:
+        return None
+
+    def scan(self, collection: str) -> CollectionScan:
+        return self.scans.get(collection) or CollectionScan()
+
+
+def mongo_path_expr(field_path: str) -> Any:
+    """Mirror ingest.resolve_doc_path: descend only through embedded documents, never arrays."""
+    parts = field_path.split('.')
+    expr: Any = {'$getField': {'field': parts[0], 'input': '$$ROOT'}}
+    for part in parts[1:]:
+        expr = {
+            '$let': {
+                'vars': {'parent': expr},
+                'in': {
+                    '$cond': [
+                        {'$eq': [{'$type': '$$parent'}, 'object']},
+                        {'$getField': {'field': part, 'input': '$$parent'}},
+                        None,
+                    ]
+                },
+            }
+        }
+    return expr
+
+
+def mongo_blank_string_expr(value: Any) -> Any:
+    return {'$cond': [{'$eq': [{'$type': value}, 'string']}, {'$eq': [{'$trim': {'input': value}}, '']}, False]}
+
+
+def mongo_is_nullish_expr(value: Any) -> Any:
+    return {'$in': [{'$type': value}, MONGO_NULLISH_TYPES]}
+
+
+def mongo_mapped_value_missing_expr(source_field: str, coalesce_fields: Optional[list[str]]) -> Any:
+    """Mirror ingest.resolve_mapped_value(...) is None."""
+    if not coalesce_fields:
+        return mongo_is_nullish_expr(mongo_path_expr(source_field))
+    return {
+        '$and': [
+            {
+                '$let': {
+                    'vars': {'candidate': mongo_path_expr(field_path)},
+                    'in': {'$or': [mongo_is_nullish_expr('$$candidate'), mongo_blank_string_expr('$$candidate')]},
+                }
+            }
+            for field_path in coalesce_fields
+        ]
+    }
+
+
+def mongo_lookup_unresolved_expr(owner_from: str, owner_transform: Optional[str]) -> Any:
+    """Mirror ingest.apply_lookup_transform(transform, resolve_doc_path(doc, owner_from)) is None."""
+    if owner_transform is None:
+        resolved = {
+            '$or': [
+                {'$in': [{'$type': '$$value'}, MONGO_ALWAYS_KEYED_TYPES]},
+                {'$cond': [{'$eq': [{'$type': '$$value'}, 'string']}, {'$ne': [{'$trim': {'input': '$$value'}}, '']}, False]},
+                {'$cond': [{'$eq': [{'$type': '$$value'}, 'double']}, {'$not': [{'$in': ['$$value', MONGO_NON_FINITE_DOUBLES]}]}, False]},
+            ]
+        }
+    else:
+        key_text = {
+            '$switch': {
+                'branches': [
+                    {'case': {'$eq': [{'$type': '$$value'}, 'objectId']}, 'then': {'$toString': '$$value'}},
+                    {'case': {'$eq': [{'$type': '$$value'}, 'string']}, 'then': {'$trim': {'input': '$$value'}}},
+                ],
+                'default': '',
+            }
+        }
+        resolved = {'$regexMatch': {'input': key_text, 'regex': SERVER_LOOKUP_TRANSFORM_PATTERNS[owner_transform]}}
+    return {'$let': {'vars': {'value': mongo_path_expr(owner_from)}, 'in': {'$not': [resolved]}}}
+
+
+def mongo_reasoning_kind_expr() -> Any:
+    """Mirror ingest.as_string(doc.get('kind'))."""
+    return {
+        '$let': {
+            'vars': {'kind': {'$getField': {'field': 'kind', 'input': '$$ROOT'}}},
+            'in': {
+                '$cond': [
+                    {'$eq': [{'$type': '$$kind'}, 'string']},
+                    {'$let': {'vars': {'trimmed': {'$trim': {'input': '$$kind'}}}, 'in': {'$cond': [{'$eq': ['$$trimmed', '']}, None, '$$trimmed']}}},
+                    None,
+                ]
+            },
+        }
+    }
+
+
+def mongo_missing_normalized_id_expr(field_name: str) -> Any:
+    """Mirror not ingest.normalize_id(doc.get(field_name))."""
+    return {
+        '$let': {
+            'vars': {'value': {'$getField': {'field': field_name, 'input': '$$ROOT'}}},
+            'in': {
+                '$not': [
+                    {
+                        '$or': [
+                            {'$in': [{'$type': '$$value'}, ['objectId', 'int', 'long']]},
+                            {'$cond': [{'$eq': [{'$type': '$$value'}, 'string']}, {'$ne': [{'$trim': {'input': '$$value'}}, '']}, False]},
+                            {'$cond': [{'$eq': [{'$type': '$$value'}, 'double']}, {'$not': [{'$in': ['$$value', MONGO_NON_FINITE_DOUBLES]}]}, False]},
+                        ]
+                    }
+                ]
+            },
+        }
+    }
+
+
+def supports_aggregate_scan(cfg: dict[str, Any]) -> bool:
+    return all(
+        transform is None or transform in SERVER_LOOKUP_TRANSFORM_PATTERNS
+        for _desc, _owner_from, transform in relation_lookup_checks(cfg)
+    )
+
+
+def count_if(expr: Any) -> Any:
+    return {'$sum': {'$cond': [expr, 1, 0]}}
+
+
+def build_contract_pipeline(
+    collection: str,
+    cfg: dict[str, Any],
+    limit: Optional[int],
+    sample_errors: int,
+    sample_size: Optional[int] = None,
+) -> list[dict[str, Any]]:
+    counters: dict[str, Any] = {'_id': None, 'scanned': {'$sum': 1}}
+    for index, (_desc, source_field, coalesce_fields) in enumerate(mapped_path_checks(cfg)):
+        counters[f'path_{index}'] = count_if(mongo_mapped_value_missing_expr(source_field, coalesce_fields))
+    for index, (_desc, owner_from, owner_transform) in enumerate(relation_lookup_checks(cfg)):
+        counters[f'lookup_{index}'] = count_if(mongo_lookup_unresolved_expr(owner_from, owner_transform))
+    if collection == 'automation_visual_observations':
+        counters['missing_evidence_link_id'] = count_if(mongo_missing_normalized_id_expr('evidence_link_id'))
+
+    facets: dict[str, Any] = {'counters': [{'$group': counters}]}
+    if collection == 'automation_reasoning_items':
+        kind = mongo_reasoning_kind_expr()
+        facets['unsupported_kinds'] = [
+            {'$match': {'$expr': {'$not': [{'$in': [{'$toLower': kind}, sorted(REASONING_ITEM_KINDS)]}]}}},
+            {'$group': {'_id': kind, 'count': {'$sum': 1}}},
+            {'$sort': {'count': -1, '_id': 1}},
+            {'$limit': max(1, sample_errors)},
+        ]
+
+    pipeline: list[dict[str, Any]] = []
+    if sample_size is not None:
+        pipeline.append({'$sample': {'size': sample_size}})
+    elif limit is not None:
+        pipeline.append({'$limit': limit})
+    pipeline.append({'$facet': facets})
+    return pipeline
+
+
+def scan_collection_aggregate(
+    db: Any,
+    collection: str,
+    cfg: dict[str, Any],
+    limit: Optional[int],
+    sample_errors: int,
+    sample_size: Optional[int] = None,
+) -> CollectionScan:
+    pipeline = build_contract_pipeline(collection, cfg, limit, sample_errors, sample_size)
+    rows = list(db[collection].aggregate(pipeline, allowDiskUse=True))
+    facet = rows[0] if rows else {}
+    counters = (facet.get('counters') or [{}])[0]
+    result = CollectionScan(scanned=int(counters.get('scanned', 0)), sampled=sample_size is not None)
+    for index, (desc, _source_field, _coalesce) in enumerate(mapped_path_checks(cfg)):
+        count = int(counters.get(f'path_{index}', 0))
+        if count:
+            result.missing_paths[desc] = count
+    for index, (desc, _owner_from, _transform) in enumerate(relation_lookup_checks(cfg)):
+        count = int(counters.get(f'lookup_{index}', 0))
+        if count:
+            result.empty_relation_keys[desc] = count
+    result.missing_evidence_link_ids = int(counters.get('missing_evidence_link_id', 0))
+    result.unsupported_kinds = [row.get('_id') for row in facet.get('unsupported_kinds') or []]
+    return result
+
+
+def scan_collection(
+    db: Any,
+    collection: str,
+    cfg: dict[str, Any],
+    limit: Optional[int],
+    sample_errors: int,
+    scan_mode: str,
+    sample_spec: Optional[tuple[str, float]] = None,
+) -> CollectionScan:
+    population = None
+    sample_size = None
+    if sample_spec is not None:
+        population = db[collection].estimated_document_count()
+        sample_size = resolve_sample_size(population, sample_spec)
+    if scan_mode == 'aggregate' and supports_aggregate_scan(cfg):
+        result = scan_collection_aggregate(db, collection, cfg, limit, sample_errors, sample_size)
+    else:
+        result = scan_collection_python(db, collection, cfg, limit, sample_size)
+    result.population = population
+    return result
+
+
+def all_docs_findings(
+    scan: CollectionScan,
+    full_scan: Callable[[], CollectionScan],
+    escalate_below: float,
+) -> list[tuple[str, str]]:
+    """Return (kind, detail) for paths/lookups unresolved in every scanned document.
+
+    Sample findings carry a Wilson interval for the unresolved rate; when its
+    lower bound is under `escalate_below` the finding is re-decided by a full scan.
+    """
+    findings: list[tuple[str, str]] = []
+    for kind, attr_name in (('path_unresolved_all_docs', 'missing_paths'), ('relation_lookup_unresolved_all_docs', 'empty_relation_keys')):
+        for desc, count in sorted(getattr(scan, attr_name).items()):
+            if count != scan.scanned or scan.scanned <= 0:
+                continue
+            if not scan.sampled:
+                findings.append((kind, f'{desc} unresolved in all {scan.scanned} scanned docs'))
+                continue
+            low, _high = wilson_interval(count, scan.scanned)
+            if low >= escalate_below:
+                findings.append(
+                    (kind, f'{desc} unresolved in all {scan.scanned} sampled docs of ~{scan.population} ({format_rate(count, scan.scanned)})')
+                )
+                continue
+            exact = full_scan()
+            exact_count = getattr(exact, attr_name).get(desc, 0)
+            if exact_count == exact.scanned and exact.scanned > 0:
+                findings.append((kind, f'{desc} unresolved in all {exact.scanned} scanned docs (escalated from sample)'))
+    return findings
+
+
 def add_issue(issues: list[Issue], level: str, collection: str, kind: str, detail: str, seen: set[tuple[str, str, str]], max_per_kind: int, counters: dict[tuple[str, str], int]) -> None:
     key = (collection, kind, detail)
     if key in seen:
@@ -115,38 +529,54 @@ def classify_issue_level(collection: str, kind: str, detail: str) -> str:
     return "WARN"
 
 
-def main() -> int:
-    ingest.load_operator_env()
-    args = parse_args()
+def load_contract_inputs(args: argparse.Namespace) -> tuple[list[str], dict[str, dict[str, Any]], Any]:
     schema_path = Path(args.schema).resolve()
     mapping_path = Path(args.mapping).resolve()
     ingest.maybe_build_generated_schema(schema_path)
     mapping_by_collection = ingest.load_mapping_by_collection(mapping_path)
+    schema_metadata = ingest.parse_schema_metadata(schema_path)
+    if args.collections:
+        collections = [c.strip() for c in args.collections.split(',') if c.strip()]
+    else:
+        collections = list(mapping_by_collection.keys())
+    return collections, mapping_by_collection, schema_metadata
+
+
+def scannable_collections(collections: list[str], mapping_by_collection: dict[str, dict[str, Any]], schema_metadata: Any) -> list[str]:
+    entity_owned_attrs = schema_metadata[1]
+    scannable = []
+    for collection in collections:
+        cfg = mapping_by_collection.get(collection)
+        target_entity = cfg.get('target_entity') if cfg is not None else None
+        if isinstance(target_entity, str) and target_entity in entity_owned_attrs:
+            scannable.append(collection)
+    return scannable
+
+
+def check_collections(
+    args: argparse.Namespace,
+    collections: list[str],
+    mapping_by_collection: dict[str, dict[str, Any]],
+    schema_metadata: Any,
+    scan_for: Callable[[str], CollectionScan],
+    full_scan_for: Callable[[str], CollectionScan],
+) -> tuple[list[Issue], int]:
+    """Run mapping/schema checks and turn each collection's document scan into issues."""
     (
         schema_attr_types,
         entity_owned_attrs,
         relation_roles,
         entity_relation_roles,
-    ) = ingest.parse_schema_metadata(schema_path)
+    ) = schema_metadata
     relation_ctx = SimpleNamespace(
         entity_relation_roles=entity_relation_roles,
         relation_roles=relation_roles,
         relation_role_cache={},
     )
-
-    if args.collections:
-        collections = [c.strip() for c in args.collections.split(',') if c.strip()]
-    else:
-        collections = list(mapping_by_collection.keys())
-
-    mongo = MongoClient(ingest.resolve_mongo_uri())
-    db = mongo[ingest.resolve_db_name()]
     issues: list[Issue] = []
     seen: set[tuple[str, str, str]] = set()
     counters: dict[tuple[str, str], int] = defaultdict(int)
     total_scanned = 0
-    t0 = time.time()
-
     for collection in collections:
         cfg = mapping_by_collection.get(collection)
         if cfg is None:
@@ -161,7 +591,6 @@ def main() -> int:
             continue
 
         attributes_cfg = cfg.get('attributes') or {}
-        coalesce_cfg = cfg.get('coalesce') or {}
         relations_cfg = cfg.get('relations') or []
 
         for attr in attributes_cfg.keys():
@@ -202,80 +631,89 @@ def main() -> int:
             if not isinstance(owner_from, str) or not owner_from:
                 add_issue(issues, 'ERROR', collection, 'owner_source_missing', f'owner lookup source missing for relation {relation_name!r}', seen, args.sample_errors, counters)
 
-        scanned = 0
-        sample_missing_paths: dict[str, int] = defaultdict(int)
-        sample_empty_relation_keys: dict[str, int] = defaultdict(int)
-        for doc in iter_docs(db, collection, args.limit):
-            scanned += 1
-            total_scanned += 1
-            if collection == "automation_reasoning_items":
-                kind_value = ingest.as_string(doc.get("kind"))
-                normalized_kind = kind_value.strip().lower() if isinstance(kind_value, str) else ""
-                if normalized_kind not in REASONING_ITEM_KINDS:
-                    add_issue(
-                        issues,
-                        "ERROR",
-                        collection,
-                        "unsupported_kind",
-                        f"unsupported kind {kind_value!r}; expected one of {sorted(REASONING_ITEM_KINDS)}",
-                        seen,
-                        args.sample_errors,
-                        counters,
-                    )
-            if collection == "automation_visual_observations":
-                evidence_link_id = ingest.normalize_id(doc.get("evidence_link_id"))
-                if not evidence_link_id:
-                    add_issue(
-                        issues,
-                        "ERROR",
-                        collection,
-                        "missing_canonical_evidence_link_id",
-                        "evidence_link_id is required for canonical visual-observation provenance",
-                        seen,
-                        args.sample_errors,
-                        counters,
-                    )
-            for attr, source_field in attributes_cfg.items():
-                if not isinstance(source_field, str):
-                    continue
-                coalesce_fields = coalesce_cfg.get(attr) if isinstance(coalesce_cfg, dict) else None
-                value = ingest.resolve_mapped_value(doc, source_field, coalesce_fields if isinstance(coalesce_fields, list) else None)
-                if value is None:
-                    sample_missing_paths[f'{attr} <- {source_field}'] += 1
-            for rel_cfg in relations_cfg:
-                if not isinstance(rel_cfg, dict):
-                    continue
-                relation_name = rel_cfg.get('relation')
-                owner_lookup = rel_cfg.get('owner_lookup') or {}
-                owner_from = owner_lookup.get('from') if isinstance(owner_lookup, dict) else None
-                owner_transform = owner_lookup.get('transform') if isinstance(owner_lookup, dict) else None
-                if not isinstance(relation_name, str) or not isinstance(owner_from, str):
-                    continue
-                resolved = ingest.apply_lookup_transform(owner_transform if isinstance(owner_transform, str) else None, ingest.resolve_doc_path(doc, owner_from))
-                if resolved is None:
-                    sample_empty_relation_keys[f'{relation_name} <- {owner_from}'] += 1
-
-        for desc, count in sorted(sample_missing_paths.items()):
-            if count == scanned and scanned > 0:
-                detail = f'{desc} unresolved in all {scanned} scanned docs'
-                add_issue(issues, classify_issue_level(collection, 'path_unresolved_all_docs', detail), collection, 'path_unresolved_all_docs', detail, seen, args.sample_errors, counters)
-        for desc, count in sorted(sample_empty_relation_keys.items()):
-            if count == scanned and scanned > 0:
-                detail = f'{desc} unresolved in all {scanned} scanned docs'
-                add_issue(issues, classify_issue_level(collection, 'relation_lookup_unresolved_all_docs', detail), collection, 'relation_lookup_unresolved_all_docs', detail, seen, args.sample_errors, counters)
-
-        print(f'[typedb-ontology-contract-check] checked {collection}: scanned={scanned}')
+        scan = scan_for(collection)
+        scanned = scan.scanned
+        total_scanned += scanned
+        for kind_value in scan.unsupported_kinds:
+            add_issue(
+                issues,
+                "ERROR",
+                collection,
+                "unsupported_kind",
+                f"unsupported kind {kind_value!r}; expected one of {sorted(REASONING_ITEM_KINDS)}",
+                seen,
+                args.sample_errors,
+                counters,
+            )
+        if scan.missing_evidence_link_ids:
+            detail = "evidence_link_id is required for canonical visual-observation provenance"
+            if scan.sampled:
+                detail += f" ({scan.missing_evidence_link_ids}/{scanned} sampled docs, {format_rate(scan.missing_evidence_link_ids, scanned)})"
+            add_issue(
+                issues,
+                "ERROR",
+                collection,
+                "missing_canonical_evidence_link_id",
+                detail,
+                seen,
+                args.sample_errors,
+                counters,
+            )
 
-    mongo.close()
+        for kind, detail in all_docs_findings(scan, lambda: full_scan_for(collection), args.escalate_below):
+            add_issue(issues, classify_issue_level(collection, kind, detail), collection, kind, detail, seen, args.sample_errors, counters)
 
+        if scan.sampled:
+            print(f'[typedb-ontology-contract-check] checked {collection}: sampled={scanned} population~{scan.population}')
+        else:
+            print(f'[typedb-ontology-contract-check] checked {collection}: scanned={scanned}')
+    return issues, total_scanned
+
+
+def print_contract_report(args: argparse.Namespace, collections: list[str], issues: list[Issue], total_scanned: int, started_at: float) -> int:
     errors = [i for i in issues if i.level == 'ERROR']
     warns = [i for i in issues if i.level == 'WARN']
     infos = [i for i in issues if i.level == 'INFO']
-    print(f'[typedb-ontology-contract-check] collections={len(collections)} scanned={total_scanned} errors={len(errors)} warnings={len(warns)} infos={len(infos)} duration_ms={int((time.time()-t0)*1000)}')
+    print(f'[typedb-ontology-contract-check] collections={len(collections)} scanned={total_scanned} sample={args.sample or "none"} errors={len(errors)} warnings={len(warns)} infos={len(infos)} duration_ms={int((time.time()-started_at)*1000)}')
     for issue in issues:
         print(f'[{issue.level}] {issue.collection} :: {issue.kind} :: {issue.detail}')
     return 1 if errors else 0
 
 
+def main() -> int:
+    ingest.load_operator_env()
+    args = parse_args()
+    sample_spec = parse_sample_spec(args.sample)
+    collections, mapping_by_collection, schema_metadata = load_contract_inputs(args)
+
+    mongo = MongoClient(ingest.resolve_mongo_uri())
+    db = mongo[ingest.resolve_db_name()]
+    t0 = time.time()
+
+    pool = ThreadPoolExecutor(max_workers=max(1, args.workers))
+    scans = {
+        collection: pool.submit(
+            scan_collection, db, collection, mapping_by_collection[collection], args.limit, args.sample_errors, args.scan_mode, sample_spec
+        )
+        for collection in scannable_collections(collections, mapping_by_collection, schema_metadata)
+    }
+    full_scans: dict[str, CollectionScan] = {}
+
+    def full_scan_for(collection: str) -> CollectionScan:
+        if collection not in full_scans:
+            print(f'[typedb-ontology-contract-check] escalating {collection} to full scan')
+            full_scans[collection] = scan_collection(
+                db, collection, mapping_by_collection[collection], args.limit, args.sample_errors, args.scan_mode
+            )
+        return full_scans[collection]
+
+    issues, total_scanned = check_collections(
+        args, collections, mapping_by_collection, schema_metadata, lambda collection: scans[collection].result(), full_scan_for
+    )
+    pool.shutdown()
+    mongo.close()
+    return print_contract_report(args, collections, issues, total_scanned, t0)
+
+
 if __name__ == '__main__':
     raise SystemExit(main())
@@ -2,15 +2,19 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import os
 import re
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
+from bson import json_util
 from pymongo import MongoClient
+from pymongo.errors import OperationFailure
 import yaml
 
 SCRIPT_DIR = Path(__file__).resolve().parent
@@ -22,6 +26,9 @@ DEFAULT_JSON_OUTPUT_PATH = INVENTORY_ROOT / 'domain_inventory_latest.json'
 DEFAULT_KERNEL_ATTRS_PATH = TYPEDB_ROOT / 'schema' / 'fragments' / '00-kernel' / '10-attributes-and-ids.tql'
 COPILOT_ROOT = TYPEDB_ROOT.parent.parent
 BACKEND_ENV_PATH = COPILOT_ROOT / 'backend' / '.env.production'
+DEFAULT_CACHE_DIR = TYPEDB_ROOT / 'logs' / 'domain-inventory-cache'
+SNAPSHOT_CACHE_VERSION = 1
+SNAPSHOT_FIELD = 'updated_at'
 
 CANDIDATE_TOKENS = {
     'status', 'state', 'type', 'kind', 'scope', 'role', 'priority', 'severity', 'currency',
@@ -44,7 +51,7 @@ def normalize_priority_value(value: Any) -> Any:
     return f"P{match.group(1)}"
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description='Inventory dictionary-like Mongo domains from ontology mapping')
     p.add_argument('--mapping', type=Path, default=DEFAULT_MAPPING_PATH)
     p.add_argument('--kernel-attrs', type=Path, default=DEFAULT_KERNEL_ATTRS_PATH)
@@ -54,7 +61,10 @@ def parse_args() -> argparse.Namespace:
     p.add_argument('--attrs', type=str, default='', help='Comma-separated attribute names to force-include')
     p.add_argument('--marked-only', action='store_true', help='Inspect only attrs marked in kernel TQL plus any --attrs overrides')
     p.add_argument('--include-heuristics', action='store_true', help='Include heuristic candidates from mapping in addition to TQL-marked attrs')
-    return p.parse_args()
+    p.add_argument('--workers', type=int, default=4, help='Collections aggregated concurrently')
+    p.add_argument('--cache-dir', type=Path, default=DEFAULT_CACHE_DIR, help='Per-collection value counts keyed by document count and max updated_at')
+    p.add_argument('--no-cache', action='store_true', help='Re-aggregate every collection and ignore cached snapshots')
+    return p.parse_args(argv)
 
 
 def resolve_mongo() -> tuple[MongoClient, str]:
@@ -107,13 +117,14 @@ def parse_marked_kernel_attrs(path: Path) -> dict[str, dict[str, Any]]:
     return marked
 
 
-def _freeze(value: Any) -> str:
+def freeze_value(value: Any) -> str:
+    """Canonical JSON token of a value; equal values (dict key order aside) give equal tokens."""
     return json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
 
 
 def classify(values: list[Any]) -> str:
     non_null = [v for v in values if v is not None]
-    unique = list(dict.fromkeys(_freeze(v) for v in non_null))
+    unique = list(dict.fromkeys(freeze_value(v) for v in non_null))
     if not unique:
         return 'null-only / no live domain'
     if set(unique).issubset({'true', 'false'}):
@@ -131,15 +142,171 @@ def canonicalize_attr_value(attr: str, value: Any) -> Any:
     return value
 
 
-def main() -> int:
-    load_operator_env()
-    args = parse_args()
-    mapping = yaml.safe_load(args.mapping.read_text(encoding='utf-8'))
-    marked_attrs = parse_marked_kernel_attrs(args.kernel_attrs)
+def select_candidates(
+    attrs: dict[str, Any],
+    marked_attrs: dict[str, dict[str, Any]],
+    forced_attrs: set[str],
+    marked_only: bool,
+    include_heuristics: bool,
+) -> list[tuple[str, str, bool, bool, bool]]:
+    candidates = []
+    for attr, src in attrs.items():
+        if not isinstance(attr, str) or not isinstance(src, str):
+            continue
+        marked = attr in marked_attrs
+        forced = attr in forced_attrs
+        heuristic = is_candidate(attr)
+        if marked_only:
+            if not (marked or forced):
+                continue
+        else:
+            if not (marked or forced or (include_heuristics and heuristic)):
+                continue
+        candidates.append((attr, src, marked, forced, heuristic))
+    return candidates
+
+
+def value_count_stages(src: str) -> list[dict[str, Any]]:
+    return [
+        {'$group': {'_id': f'${src}', 'count': {'$sum': 1}}},
+        {'$sort': {'count': -1, '_id': 1}},
+    ]
+
+
+def build_inventory_pipeline(sources: list[str]) -> list[dict[str, Any]]:
+    # Facet names cannot contain '.' or start with '$', so source paths are addressed by position.
+    return [{'$facet': {f'f{index}': value_count_stages(src) for index, src in enumerate(sources)}}]
+
+
+def aggregate_value_counts(db: Any, coll: str, sources: list[str]) -> dict[str, list[dict[str, Any]]]:
+    try:
+        facets = next(iter(db[coll].aggregate(build_inventory_pipeline(sources), allowDiskUse=True)), {})
+    except OperationFailure as exc:
+        # $facet returns a single document capped at 16MB; wide open domains overflow it.
+        print(f'[typedb-ontology-domain-inventory] {coll}: $facet failed ({exc}); falling back to one $group per attribute')
+        return {src: list(db[coll].aggregate(value_count_stages(src), allowDiskUse=True)) for src in sources}
+    return {src: list(facets.get(f'f{index}') or []) for index, src in enumerate(sources)}
+
+
+def collection_snapshot(db: Any, coll: str) -> dict[str, Any]:
+    latest = list(db[coll].find({SNAPSHOT_FIELD: {'$exists': True}}, {SNAPSHOT_FIELD: 1}).sort(SNAPSHOT_FIELD, -1).limit(1))
+    return {
+        'count': db[coll].estimated_document_count(),
+        'max_updated_at': latest[0].get(SNAPSHOT_FIELD) if latest else None,
+    }
+
+
+def snapshot_cache_path(cache_dir: Path, coll: str) -> Path:
+    return cache_dir / f'{coll}.json'
+
+
+def snapshot_cache_key(snapshot: dict[str, Any], sources: list[str]) -> str:
+    payload = json_util.dumps({'version': SNAPSHOT_CACHE_VERSION, 'snapshot': snapshot, 'sources': sorted(set(sources))}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def load_cached_value_counts(path: Path, key: str) -> dict[str, list[dict[str, Any]]] | None:
+    try:
+        payload = json_util.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get('key') != key:
+        return None
+    value_counts = payload.get('value_counts')
+    return value_counts if isinstance(value_counts, dict) else None
+
+
+def save_cached_value_counts(path: Path, key: str, value_counts: dict[str, list[dict[str, Any]]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    tmp_path.write_text(json_util.dumps({'key': key, 'value_counts': value_counts}), encoding='utf-8')
+    os.replace(tmp_path, path)
+
+
+def inventory_collection(db: Any, coll: str, sources: list[str], cache_dir: Path | None) -> tuple[dict[str, list[dict[str, Any]]], bool]:
+    """Return per-source `{_id, count}` rows for `coll` and whether they came from the snapshot cache."""
+    if cache_dir is None:
+        return aggregate_value_counts(db, coll, sources), False
+    path = snapshot_cache_path(cache_dir, coll)
+    key = snapshot_cache_key(collection_snapshot(db, coll), sources)
+    cached = load_cached_value_counts(path, key)
+    if cached is not None and all(src in cached for src in sources):
+        return cached, True
+    value_counts = aggregate_value_counts(db, coll, sources)
+    save_cached_value_counts(path, key, value_counts)
+    return value_counts, False
+
+
+def doc_path_value(doc: dict[str, Any], field_path: str) -> Any:
+    current: Any = doc
+    for part in field_path.split('.'):
+        if not isinstance(current, dict):
+            return None
+        current = current.get(part)
+    return current
+
+
+def planned_sources(candidates: list[tuple[str, str, bool, bool, bool]]) -> list[str]:
+    return list(dict.fromkeys(src for _, src, *_ in candidates))
+
+
+class ValueCountConsumer:
+    """Scan consumer (see ingest.ScanConsumer) counting raw values per source field, like the $group pipeline."""
+
+    def __init__(self, planned: list[tuple[dict[str, Any], list[tuple[str, str, bool, bool, bool]]]]) -> None:
+        self._sources = {item['collection']: planned_sources(candidates) for item, candidates in planned}
+        self._counts: dict[str, dict[str, dict[str, list[Any]]]] = {}
+
+    def wants(self, collection: str) -> bool:
+        return collection in self._sources
+
+    def projection_fields(self, collection: str) -> list[str]:
+        return list(self._sources[collection])
+
+    def begin(self, collection: str) -> None:
+        self._counts[collection] = {src: {} for src in self._sources[collection]}
+
+    def observe(self, collection: str, doc: dict[str, Any]) -> None:
+        for src, counts in self._counts[collection].items():
+            value = doc_path_value(doc, src)
+            entry = counts.setdefault(freeze_value(value), [value, 0])
+            entry[1] += 1
+
+    def end(self, collection: str) -> None:
+        return None
+
+    def value_counts(self, collection: str) -> dict[str, list[dict[str, Any]]]:
+        counts = self._counts.get(collection) or {src: {} for src in self._sources.get(collection, [])}
+        return {
+            src: [
+                {'_id': value, 'count': count}
+                for _, (value, count) in sorted(entries.items(), key=lambda item: (-item[1][1], item[0]))
+            ]
+            for src, entries in counts.items()
+        }
+
+
+def plan_inventory(
+    args: argparse.Namespace,
+    mapping: dict[str, Any],
+    marked_attrs: dict[str, dict[str, Any]],
+) -> list[tuple[dict[str, Any], list[tuple[str, str, bool, bool, bool]]]]:
     forced_attrs = {part.strip() for part in args.attrs.split(',') if part.strip()}
-    client, db_name = resolve_mongo()
-    db = client[db_name]
+    planned = []
+    for item in mapping['collections']:
+        candidates = select_candidates(item.get('attributes') or {}, marked_attrs, forced_attrs, args.marked_only, args.include_heuristics)
+        if candidates:
+            planned.append((item, candidates))
+    return planned
 
+
+def write_inventory_reports(
+    args: argparse.Namespace,
+    marked_attrs: dict[str, dict[str, Any]],
+    planned: list[tuple[dict[str, Any], list[tuple[str, str, bool, bool, bool]]]],
+    results: Iterable[tuple[dict[str, list[dict[str, Any]]], bool]],
+) -> None:
+    """Render domain_inventory_latest.{md,json}; `results` yields (value_counts, from_cache) in `planned` order."""
     lines = [
         '# Dictionary-like Domain Inventory',
         '',
@@ -150,38 +317,19 @@ def main() -> int:
         '',
     ]
     attr_rollup: dict[str, dict[str, Any]] = {}
-
-    for item in mapping['collections']:
+    cached_collections = 0
+    for (item, candidates), (value_counts, from_cache) in zip(planned, results):
         coll = item['collection']
         target = item['target_entity']
-        attrs = item.get('attributes') or {}
-        candidates = []
-        for attr, src in attrs.items():
-            if not isinstance(attr, str) or not isinstance(src, str):
-                continue
-            marked = attr in marked_attrs
-            forced = attr in forced_attrs
-            heuristic = is_candidate(attr)
-            if args.marked_only:
-                if not (marked or forced):
-                    continue
-            else:
-                if not (marked or forced or (args.include_heuristics and heuristic)):
-                    continue
-            candidates.append((attr, src, marked, forced, heuristic))
-        if not candidates:
-            continue
+        cached_collections += int(from_cache)
         lines.append(f'## {coll} -> {target}')
         for attr, src, marked, forced, heuristic in candidates:
-            rows = list(db[coll].aggregate([
-                {'$group': {'_id': f'${src}', 'count': {'$sum':1}}},
-                {'$sort': {'count': -1, '_id': 1}},
-            ]))
+            rows = list(value_counts[src])
             if attr == 'priority':
                 normalized_counter: Counter[str] = Counter()
                 for row in rows:
                     normalized_value = canonicalize_attr_value(attr, row['_id'])
-                    normalized_counter[_freeze(normalized_value)] += int(row['count'])
+                    normalized_counter[freeze_value(normalized_value)] += int(row['count'])
                 rows = [
                     {'_id': json.loads(value), 'count': count}
                     for value, count in sorted(normalized_counter.items(), key=lambda item: (-item[1], item[0]))
@@ -217,7 +365,7 @@ def main() -> int:
     args.output.write_text('\n'.join(lines).rstrip() + '\n', encoding='utf-8')
     serializable_rollup = {}
     for attr, payload in attr_rollup.items():
-        unique_values = list(dict.fromkeys(_freeze(v) for v in payload['values']))
+        unique_values = list(dict.fromkeys(freeze_value(v) for v in payload['values']))
         serializable_rollup[attr] = {
             'declared_domain': payload['declared_domain'],
             'max_values': payload['max_values'],
@@ -226,8 +374,27 @@ def main() -> int:
             'classification': classify(payload['values']),
         }
     args.json_output.write_text(json.dumps(serializable_rollup, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f'[typedb-ontology-domain-inventory] collections={len(planned)} cached={cached_collections} aggregated={len(planned) - cached_collections}')
     print(f'[typedb-ontology-domain-inventory] wrote {args.output}')
     print(f'[typedb-ontology-domain-inventory] wrote {args.json_output}')
+
+
+def main() -> int:
+    load_operator_env()
+    args = parse_args()
+    mapping = yaml.safe_load(args.mapping.read_text(encoding='utf-8'))
+    marked_attrs = parse_marked_kernel_attrs(args.kernel_attrs)
+    planned = plan_inventory(args, mapping, marked_attrs)
+    client, db_name = resolve_mongo()
+    db = client[db_name]
+
+    cache_dir = None if args.no_cache else args.cache_dir
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = [
+            pool.submit(inventory_collection, db, item['collection'], planned_sources(candidates), cache_dir)
+            for item, candidates in planned
+        ]
+        write_inventory_reports(args, marked_attrs, planned, (future.result() for future in futures))
     return 0
 
 
@@ -5,9 +5,10 @@ import argparse
 import json
 import os
 import re
+from collections import deque
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 import yaml
 from pymongo import MongoClient
@@ -45,7 +46,7 @@ def canonicalize_doc(value: Any, field_name: str | None = None) -> Any:
     return value
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Sample Mongo entity documents for ontology verification and TOON examples")
     p.add_argument("--mapping", type=Path, default=DEFAULT_MAPPING_PATH)
     p.add_argument("--output", type=Path, default=DEFAULT_OUTPUT_PATH)
@@ -60,7 +61,7 @@ def parse_args() -> argparse.Namespace:
         default="mapped",
         help="Columns to keep in TOON examples: mapped attrs + relation sources, minimal key+title-ish, or all top-level fields",
     )
-    return p.parse_args()
+    return p.parse_args(argv)
 
 
 def resolve_mongo() -> tuple[MongoClient, str]:
@@ -145,16 +146,57 @@ def render_markdown_table(rows: list[dict[str, Any]]) -> list[str]:
     return lines
 
 
-def main() -> int:
-    load_operator_env()
-    args = parse_args()
-    mapping = yaml.safe_load(args.mapping.read_text(encoding="utf-8"))
-    client, db_name = resolve_mongo()
-    db = client[db_name]
-
+def select_collections(args: argparse.Namespace, mapping: dict[str, Any]) -> list[dict[str, Any]]:
     wanted = {c.strip() for c in args.collections.split(",") if c.strip()}
-    collections_cfg = [item for item in mapping.get("collections", []) if not wanted or item["collection"] in wanted]
+    return [item for item in mapping.get("collections", []) if not wanted or item["collection"] in wanted]
+
+
+def sample_limit(args: argparse.Namespace) -> int:
+    return args.verify_limit if args.mode in {"verify", "both"} else args.toon_limit
+
+
+def fetch_latest(db: Any, coll_name: str, limit: int) -> tuple[int, list[dict[str, Any]]]:
+    coll = db[coll_name]
+    return coll.count_documents({}), list(coll.find({}, sort=[("_id", -1)]).limit(limit))
+
+
+class LatestDocsConsumer:
+    """Scan consumer (see ingest.ScanConsumer) keeping the newest `limit` documents of an `_id`-ascending pass."""
+
+    def __init__(self, collections: list[str], limit: int) -> None:
+        self._collections = set(collections)
+        self._limit = limit
+        self._latest: dict[str, deque[dict[str, Any]]] = {}
+        self._totals: dict[str, int] = {}
+
+    def wants(self, collection: str) -> bool:
+        return collection in self._collections
 
+    def projection_fields(self, collection: str) -> None:
+        # Verify samples show every top-level field.
+        return None
+
+    def begin(self, collection: str) -> None:
+        self._latest[collection] = deque(maxlen=max(0, self._limit))
+        self._totals[collection] = 0
+
+    def observe(self, collection: str, doc: dict[str, Any]) -> None:
+        self._totals[collection] += 1
+        self._latest[collection].append(dict(doc))
+
+    def end(self, collection: str) -> None:
+        return None
+
+    def latest(self, collection: str) -> tuple[int, list[dict[str, Any]]]:
+        return self._totals.get(collection, 0), list(reversed(self._latest.get(collection, ())))
+
+
+def write_sampling_reports(
+    args: argparse.Namespace,
+    collections_cfg: list[dict[str, Any]],
+    latest_for: Callable[[str], tuple[int, list[dict[str, Any]]]],
+) -> None:
+    """Render entity_sampling_latest.{md,json}; `latest_for` returns (total_docs, newest docs first)."""
     md: list[str] = [
         "# Entity Sampling Latest",
         "",
@@ -183,20 +225,12 @@ def main() -> int:
     for cfg in collections_cfg:
         coll_name = cfg["collection"]
         target_entity = cfg.get("target_entity")
-        coll = db[coll_name]
-        total = coll.count_documents({})
-        verify_docs = (
-            [canonicalize_doc(doc) for doc in list(coll.find({}, sort=[("_id", -1)]).limit(args.verify_limit))]
-            if args.mode in {"verify", "both"}
-            else []
-        )
+        total, latest_docs = latest_for(coll_name)
+        verify_docs = [canonicalize_doc(doc) for doc in latest_docs] if args.mode in {"verify", "both"} else []
         toon_fields = select_toon_fields(cfg, args.toon_columns)
         toon_docs = [trim_doc(doc, toon_fields) for doc in verify_docs[: args.toon_limit]] if args.mode == "both" else []
         if args.mode == "toon":
-            toon_docs = [
-                trim_doc(canonicalize_doc(doc), toon_fields)
-                for doc in list(coll.find({}, sort=[("_id", -1)]).limit(args.toon_limit))
-            ]
+            toon_docs = [trim_doc(canonicalize_doc(doc), toon_fields) for doc in latest_docs]
             verify_docs = []
 
         md.append(f"## {coll_name} -> {target_entity}")
@@ -237,6 +271,16 @@ def main() -> int:
     args.json_output.write_text(json.dumps(json_payload, ensure_ascii=False, indent=2, default=str), encoding="utf-8")
     print(f"[typedb-ontology-entity-sampling] wrote {args.output}")
     print(f"[typedb-ontology-entity-sampling] wrote {args.json_output}")
+
+
+def main() -> int:
+    load_operator_env()
+    args = parse_args()
+    mapping = yaml.safe_load(args.mapping.read_text(encoding="utf-8"))
+    client, db_name = resolve_mongo()
+    db = client[db_name]
+    limit = sample_limit(args)
+    write_sampling_reports(args, select_collections(args, mapping), lambda coll_name: fetch_latest(db, coll_name, limit))
     return 0
 
 
@@ -1,12 +1,18 @@
 #!/usr/bin/env python3
 import argparse
+import base64
+import gzip
+import hashlib
+import importlib.util
 import json
+import math
 import os
 import pathlib
 import re
 import subprocess
 import sys
 import time
+from collections import Counter
 from dataclasses import dataclass, field
 from datetime import date, datetime, timezone
 from typing import Any, Callable, Optional
@@ -65,7 +71,25 @@ DEFAULT_SCHEMA_PATH = TYPEDB_ROOT_DIR / "schema" / "str-ontology.tql"
 DEFAULT_MAPPING_PATH = TYPEDB_ROOT_DIR / "mappings" / "mongodb_to_typedb_v1.yaml"
 DEFAULT_DEADLETTER_PATH = TYPEDB_ROOT_DIR / "logs" / "typedb-ontology-ingest-deadletter.ndjson"
 DEFAULT_SYNC_STATE_PATH = TYPEDB_ROOT_DIR / "logs" / "typedb-ontology-sync-state.json"
+DEFAULT_DOMAIN_SKETCH_PATH = TYPEDB_ROOT_DIR / "logs" / "typedb-ontology-domain-sketches.json"
+DOMAIN_INVENTORY_SCRIPT = SCRIPT_DIR / "typedb-ontology-domain-inventory.py"
+VALIDATE_SCRIPT = SCRIPT_DIR / "typedb-ontology-validate.py"
 SCHEMA_BUILD_SCRIPT = SCRIPT_DIR / "build-typedb-schema.py"
+SCHEMA_FRAGMENTS_ROOT = TYPEDB_ROOT_DIR / "schema" / "fragments"
+DEFAULT_DOMAIN_INVENTORY_JSON_PATH = TYPEDB_ROOT_DIR / "inventory_latest" / "domain_inventory_latest.json"
+DEFAULT_SCHEMA_CACHE_DIR = TYPEDB_ROOT_DIR / "logs" / "schema-cache"
+SCHEMA_BUILD_MANIFEST_NAME = "schema-build-manifest.json"
+SCHEMA_METADATA_CACHE_VERSION = 1
+PLAN_FORMAT = "typedb-ontology-plan/v1"
+PLAN_MANIFEST_NAME = "manifest.json"
+DEFAULT_PLAN_BATCH_OPS = 500
+DOMAIN_SKETCH_FORMAT = "typedb-ontology-domain-sketches/v1"
+DOMAIN_SKETCH_TOP_K = 256
+DOMAIN_SKETCH_HLL_PRECISION = 10
+DEFAULT_TOUCHED_KEYS_PATH = TYPEDB_ROOT_DIR / "logs" / "typedb-ontology-touched-keys.json"
+TOUCHED_KEYS_FORMAT = "typedb-ontology-touched-keys/v1"
+PLAN_KEYED_ISA_PATTERN = re.compile(r'\$[A-Za-z0-9_]+ isa ([A-Za-z0-9_-]+), has ([A-Za-z0-9_-]+) ("(?:[^"\\]|\\.)*")')
+PLAN_INSERT_CLAUSE_PATTERN = re.compile(r";\s*insert\s")
 INCREMENTAL_COLLECTIONS = {
     # Stage-1 incremental scope is intentionally narrow until true
     # update/reconcile semantics are implemented for mutable collections.
@@ -159,6 +183,21 @@ VOICE_MESSAGE_CORE_ATTRS = {
 }
 
 
+_domain_inventory_spec = importlib.util.spec_from_file_location("typedb_ontology_domain_inventory_module", DOMAIN_INVENTORY_SCRIPT)
+if _domain_inventory_spec is None or _domain_inventory_spec.loader is None:
+    raise RuntimeError(f"Cannot load domain inventory helpers from {DOMAIN_INVENTORY_SCRIPT}")
+domain_inventory = importlib.util.module_from_spec(_domain_inventory_spec)
+sys.modules["typedb_ontology_domain_inventory_module"] = domain_inventory
+_domain_inventory_spec.loader.exec_module(domain_inventory)
+
+_validation_spec = importlib.util.spec_from_file_location("typedb_ontology_validate_module", VALIDATE_SCRIPT)
+if _validation_spec is None or _validation_spec.loader is None:
+    raise RuntimeError(f"Cannot load validation checks from {VALIDATE_SCRIPT}")
+validation = importlib.util.module_from_spec(_validation_spec)
+sys.modules["typedb_ontology_validate_module"] = validation
+_validation_spec.loader.exec_module(validation)
+
+
 @dataclass
 class CliOptions:
     apply: bool
@@ -184,6 +223,13 @@ class CliOptions:
     typedb_database: str
     schema_path: pathlib.Path
     mapping_path: pathlib.Path
+    emit_plan_dir: Optional[pathlib.Path] = None
+    plan_batch_ops: int = DEFAULT_PLAN_BATCH_OPS
+    full_schema_reload: bool = False
+    schema_diff: bool = False
+    domain_sketch_path: Optional[pathlib.Path] = None
+    touched_keys_path: Optional[pathlib.Path] = None
+    validation_counters: bool = False
 
 
 @dataclass
@@ -216,6 +262,8 @@ class IngestContext:
     ensured_entity_keys: set[tuple[str, str, str]] = field(default_factory=set)
     entity_updated_at_cache: dict[tuple[str, str], dict[str, datetime]] = field(default_factory=dict)
     binary_relation_cache: dict[tuple[str, str, str, str, str], dict[str, set[str]]] = field(default_factory=dict)
+    scan_consumers: list[Any] = field(default_factory=list)
+    touched_keys: Optional["TouchedKeys"] = None
 
 
 class DeadletterWriter:
@@ -243,10 +291,294 @@ class DeadletterWriter:
             self._fp.close()
 
 
-def parse_args() -> argparse.Namespace:
+def plan_key_literal_value(literal: str) -> str:
+    try:
+        value = json.loads(literal)
+    except ValueError:
+        return literal[1:-1]
+    return value if isinstance(value, str) else literal[1:-1]
+
+
+def plan_key_dependencies(query: str) -> tuple[list[tuple[str, str, str]], list[tuple[str, str, str]]]:
+    """Return (provides, requires) entity keys referenced by one TypeQL write query."""
+    match_part = ""
+    insert_part = query
+    if query.startswith("match "):
+        clause = PLAN_INSERT_CLAUSE_PATTERN.search(query)
+        if clause is None:
+            match_part, insert_part = query, ""
+        else:
+            match_part, insert_part = query[: clause.start()], query[clause.start():]
+
+    def keyed(text: str) -> list[tuple[str, str, str]]:
+        return [
+            (entity, key_attr, plan_key_literal_value(literal))
+            for entity, key_attr, literal in PLAN_KEYED_ISA_PATTERN.findall(text)
+        ]
+
+    return keyed(insert_part), keyed(match_part)
+
+
+def plan_phase_name(level: int) -> str:
+    if level == 0:
+        return "entities"
+    if level == 1:
+        return "relations"
+    return f"relations-{level}"
+
+
+class PlanWriter:
+    """Write committed TypeQL write transactions as leveled gzip NDJSON batches.
+
+    Level 0 holds pure entity inserts. A transaction that matches existing
+    entities lands one level above the highest level providing any of its
+    required keys (and never below level 1), so replaying levels in order
+    keeps every dependency satisfied while ops inside a level stay independent.
+    """
+
+    def __init__(self, root: pathlib.Path, run_id: str, batch_ops: int = DEFAULT_PLAN_BATCH_OPS) -> None:
+        root.mkdir(parents=True, exist_ok=True)
+        self._root = root
+        self._run_id = run_id
+        self._batch_ops = max(1, batch_ops)
+        self._collection = "_unscoped"
+        self._collections: list[str] = []
+        self._seq = 0
+        self._queries_total = 0
+        self._open: dict[tuple[int, str], tuple[Any, dict[str, Any]]] = {}
+        self._batch_counts: dict[tuple[int, str], int] = {}
+        self._batches: dict[int, list[dict[str, Any]]] = {}
+        self._dependent_levels: dict[tuple[str, str, str], int] = {}
+        self._provided: set[tuple[str, str, str]] = set()
+        self._required: set[tuple[str, str, str]] = set()
+
+    @property
+    def root(self) -> pathlib.Path:
+        return self._root
+
+    def begin_collection(self, collection: str) -> None:
+        self._collection = collection
+        if collection not in self._collections:
+            self._collections.append(collection)
+
+    def record(self, queries: list[str]) -> None:
+        if not queries:
+            return
+        provides: list[tuple[str, str, str]] = []
+        requires: list[tuple[str, str, str]] = []
+        for query in queries:
+            query_provides, query_requires = plan_key_dependencies(query)
+            provides.extend(query_provides)
+            requires.extend(item for item in query_requires if item not in provides)
+        provides = list(dict.fromkeys(provides))
+        requires = list(dict.fromkeys(requires))
+
+        level = 0
+        if requires or any(query.startswith("match ") for query in queries):
+            level = max([1, *(self._dependent_levels.get(key, 0) + 1 for key in requires)])
+        if level > 0:
+            for key in provides:
+                self._dependent_levels[key] = max(level, self._dependent_levels.get(key, 0))
+        self._provided.update(provides)
+        self._required.update(requires)
+
+        self._seq += 1
+        self._queries_total += len(queries)
+        fp, batch = self._batch_for(level)
+        entry = {
+            "seq": self._seq,
+            "collection": self._collection,
+            "level": level,
+            "queries": queries,
+            "provides": [list(key) for key in provides],
+            "requires": [list(key) for key in requires],
+        }
+        fp.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        batch["ops"] += 1
+        batch["queries"] += len(queries)
+        if batch["ops"] >= self._batch_ops:
+            fp.close()
+            del self._open[(level, self._collection)]
+
+    def _batch_for(self, level: int) -> tuple[Any, dict[str, Any]]:
+        slot = (level, self._collection)
+        current = self._open.get(slot)
+        if current is not None:
+            return current
+        index = self._batch_counts.get(slot, 0) + 1
+        self._batch_counts[slot] = index
+        relative = pathlib.Path(f"{level:02d}-{plan_phase_name(level)}") / f"{self._collection}-{index:05d}.ndjson.gz"
+        (self._root / relative.parent).mkdir(parents=True, exist_ok=True)
+        batch = {"path": relative.as_posix(), "collection": self._collection, "ops": 0, "queries": 0}
+        self._batches.setdefault(level, []).append(batch)
+        fp = gzip.open(self._root / relative, "wt", encoding="utf-8")
+        self._open[slot] = (fp, batch)
+        return self._open[slot]
+
+    def close(self, **metadata: Any) -> dict[str, Any]:
+        for fp, _batch in self._open.values():
+            fp.close()
+        self._open.clear()
+        collection_order = {collection: index for index, collection in enumerate(self._collections)}
+        phases = []
+        for level in sorted(self._batches):
+            batches = sorted(
+                self._batches[level],
+                key=lambda batch: (collection_order.get(batch["collection"], len(collection_order)), batch["path"]),
+            )
+            phases.append(
+                {
+                    "level": level,
+                    "name": plan_phase_name(level),
+                    "ops": sum(batch["ops"] for batch in batches),
+                    "batches": batches,
+                }
+            )
+        manifest = {
+            "format": PLAN_FORMAT,
+            "run_id": self._run_id,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            **metadata,
+            "collections": list(self._collections),
+            "ops_total": self._seq,
+            "queries_total": self._queries_total,
+            "unresolved_requires": len(self._required - self._provided),
+            "phases": phases,
+        }
+        (self._root / PLAN_MANIFEST_NAME).write_text(json.dumps(manifest, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        return manifest
+
+
+class PlanEmptyAnswer:
+    def is_concept_rows(self) -> bool:
+        return False
+
+
+class PlanEmptyPromise:
+    def resolve(self) -> PlanEmptyAnswer:
+        return PlanEmptyAnswer()
+
+
+class PlanRecordingTransaction:
+    def __init__(self, writer: PlanWriter, tx_type: TransactionType) -> None:
+        self._writer = writer
+        self._tx_type = tx_type
+        self._queries: list[str] = []
+
+    def query(self, query: str) -> PlanEmptyPromise:
+        if self._tx_type == TransactionType.WRITE:
+            self._queries.append(query)
+        return PlanEmptyPromise()
+
+    def commit(self) -> None:
+        self._writer.record(self._queries)
+        self._queries = []
+
+    def rollback(self) -> None:
+        self._queries = []
+
+    def close(self) -> None:
+        self._queries = []
+
+
+class PlanRecordingDriver:
+    """Stand-in TypeDB driver for --emit-plan: reads see an empty database, writes go to the plan."""
+
+    def __init__(self, writer: PlanWriter) -> None:
+        self._writer = writer
+
+    def transaction(self, database: str, tx_type: TransactionType) -> PlanRecordingTransaction:
+        return PlanRecordingTransaction(self._writer, tx_type)
+
+    def close(self) -> None:
+        return None
+
+
+class ValidationCounterTransaction:
+    """Write transaction that keeps validation_counter values in step with the writes it carries.
+
+    Before the first query naming a counted entity key, each counter check is probed for that key;
+    at commit the probes are repeated and the net +/- per counter is applied in the same transaction.
+    """
+
+    def __init__(self, tx: Any, driver: "ValidationCounterDriver") -> None:
+        self._tx = tx
+        self._driver = driver
+        self._before: dict[tuple[str, str], dict[str, bool]] = {}
+
+    def _probe(self, entity: str, key: str) -> dict[str, bool]:
+        result = {}
+        for check in self._driver.checks_by_entity[entity]:
+            answer = self._tx.query(validation.counter_probe_query(check, key)).resolve()
+            result[check.name] = bool(answer.is_concept_rows() and next(iter(answer.as_concept_rows().iterator), None))
+        return result
+
+    def query(self, query: str) -> Any:
+        provides, requires = plan_key_dependencies(query)
+        for entity, key_attr, key in [*requires, *provides]:
+            subject = (entity, key)
+            if entity in self._driver.checks_by_entity and key_attr == f"{entity}_id" and subject not in self._before:
+                self._before[subject] = self._probe(entity, key)
+        return self._tx.query(query)
+
+    def commit(self) -> None:
+        deltas: Counter[str] = Counter()
+        for (entity, key), before in self._before.items():
+            after = self._probe(entity, key)
+            for name, was_counted in before.items():
+                deltas[name] += int(after[name]) - int(was_counted)
+        deltas = Counter({name: delta for name, delta in deltas.items() if delta})
+        for name, delta in deltas.items():
+            self._tx.query(validation.counter_update_query(name, delta)).resolve()
+        self._tx.commit()
+        self._driver.run_deltas.update(deltas)
+        self._before = {}
+
+    def rollback(self) -> None:
+        self._before = {}
+        self._tx.rollback()
+
+    def close(self) -> None:
+        self._before = {}
+        self._tx.close()
+
+
+class ValidationCounterDriver:
+    """Driver wrapper for --validation-counters: write transactions maintain validation_counter rows."""
+
+    def __init__(self, driver: Any) -> None:
+        self._driver = driver
+        self.checks_by_entity: dict[str, list[Any]] = {}
+        for check, entity in validation.counter_checks():
+            self.checks_by_entity.setdefault(entity, []).append(check)
+        self.run_deltas: Counter[str] = Counter()
+
+    def transaction(self, database: str, tx_type: TransactionType) -> Any:
+        tx = self._driver.transaction(database, tx_type)
+        return ValidationCounterTransaction(tx, self) if tx_type == TransactionType.WRITE else tx
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._driver, name)
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Ingest MongoDB data into TypeDB ontology")
     parser.add_argument("--apply", action="store_true", help="Apply writes to TypeDB (default is dry-run)")
-    parser.add_argument("--init-schema", action="store_true", help="Load schema before ingestion")
+    parser.add_argument(
+        "--init-schema",
+        action="store_true",
+        help="Bring the schema up to date before ingestion by defining only declarations missing from the live schema",
+    )
+    parser.add_argument(
+        "--full-schema-reload",
+        action="store_true",
+        help="With --init-schema, send the whole generated schema in one SCHEMA transaction instead of the delta",
+    )
+    parser.add_argument(
+        "--schema-diff",
+        action="store_true",
+        help="Print the delta between the live TypeDB schema and the generated schema, then exit without writing",
+    )
     parser.add_argument(
         "--run-id",
         type=str,
@@ -285,6 +617,25 @@ def parse_args() -> argparse.Namespace:
         help="Path to sync state JSON for incremental mode",
     )
     parser.add_argument("--reset-sync-state", action="store_true", help="Reset stored incremental sync state")
+    parser.add_argument(
+        "--domain-sketches",
+        type=str,
+        default=str(DEFAULT_DOMAIN_SKETCH_PATH),
+        help="Path to distinct-value sketches of `# @toon inventory=inspect` attrs, merged across runs",
+    )
+    parser.add_argument("--no-domain-sketches", action="store_true", help="Do not maintain domain value sketches")
+    parser.add_argument(
+        "--touched-keys",
+        type=str,
+        default=str(DEFAULT_TOUCHED_KEYS_PATH),
+        help="Manifest of entity keys inserted or reconciled by this run (apply only); read by validate --touched-keys",
+    )
+    parser.add_argument("--no-touched-keys", action="store_true", help="Do not write the touched-keys manifest")
+    parser.add_argument(
+        "--validation-counters",
+        action="store_true",
+        help="Keep validation_counter entities in step with every write (seed once with validate --recount)",
+    )
     parser.add_argument(
         "--skip-sync-state-write",
         action="store_true",
@@ -312,6 +663,19 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Assume the target TypeDB database is empty and skip existence/reconcile checks for bulk append-only loads",
     )
+    parser.add_argument(
+        "--emit-plan",
+        type=str,
+        default=None,
+        help="Compile the run into an ordered TypeQL write plan (gzip NDJSON batches) in this directory instead of writing to TypeDB; "
+        "implies --assume-empty-db and replays with typedb-ontology-apply-plan.py",
+    )
+    parser.add_argument(
+        "--plan-batch-ops",
+        type=int,
+        default=DEFAULT_PLAN_BATCH_OPS,
+        help="Max write transactions per emitted plan batch file",
+    )
     parser.add_argument("--typedb-addresses", type=str, default=None)
     parser.add_argument("--typedb-username", type=str, default=None)
     parser.add_argument("--typedb-password", type=str, default=None)
@@ -329,7 +693,7 @@ def parse_args() -> argparse.Namespace:
         default=str(DEFAULT_MAPPING_PATH),
         help="Path to MongoDB->TypeDB mapping YAML",
     )
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 def parse_bool(raw: Optional[str], default: bool = False) -> bool:
@@ -387,6 +751,10 @@ def parse_options(args: argparse.Namespace) -> CliOptions:
         raise ValueError(f"Invalid --heartbeat-docs value: {args.heartbeat_docs}")
     if args.heartbeat_seconds is not None and args.heartbeat_seconds < 0:
         raise ValueError(f"Invalid --heartbeat-seconds value: {args.heartbeat_seconds}")
+    if args.plan_batch_ops is not None and args.plan_batch_ops <= 0:
+        raise ValueError(f"Invalid --plan-batch-ops value: {args.plan_batch_ops}")
+    if args.emit_plan and args.apply:
+        raise ValueError("--emit-plan compiles a plan without touching TypeDB; run typedb-ontology-apply-plan.py to apply it")
 
     if args.collections:
         collections = [part.strip() for part in args.collections.split(",") if part.strip()]
@@ -408,8 +776,10 @@ def parse_options(args: argparse.Namespace) -> CliOptions:
             file=sys.stderr,
         )
 
+    emit_plan_dir = pathlib.Path(args.emit_plan).resolve() if args.emit_plan else None
     options = CliOptions(
-        apply=bool(args.apply),
+        # Plan compilation drives the regular write path against PlanRecordingDriver.
+        apply=bool(args.apply) or emit_plan_dir is not None,
         init_schema=bool(args.init_schema),
         sync_mode=args.sync_mode,
         projection_scope="core" if bool(args.skip_session_derived_projections) else args.projection_scope,
@@ -419,11 +789,11 @@ def parse_options(args: argparse.Namespace) -> CliOptions:
         deadletter_path=pathlib.Path(args.deadletter).resolve(),
         sync_state_path=pathlib.Path(args.sync_state).resolve(),
         reset_sync_state=bool(args.reset_sync_state),
-        skip_sync_state_write=bool(args.skip_sync_state_write),
+        skip_sync_state_write=bool(args.skip_sync_state_write) or emit_plan_dir is not None,
         heartbeat_docs=int(args.heartbeat_docs),
         heartbeat_seconds=int(args.heartbeat_seconds),
         skip_session_derived_projections=bool(args.skip_session_derived_projections),
-        assume_empty_db=bool(args.assume_empty_db),
+        assume_empty_db=bool(args.assume_empty_db) or emit_plan_dir is not None,
         typedb_addresses=addresses,
         typedb_primary_address=addresses[0],
         typedb_username=args.typedb_username or os.getenv("TYPEDB_USERNAME") or "admin",
@@ -432,6 +802,13 @@ def parse_options(args: argparse.Namespace) -> CliOptions:
         typedb_database=args.typedb_database or os.getenv("TYPEDB_DATABASE") or "str_opsportal_v1",
         schema_path=pathlib.Path(args.schema).resolve(),
         mapping_path=pathlib.Path(args.mapping).resolve(),
+        emit_plan_dir=emit_plan_dir,
+        plan_batch_ops=int(args.plan_batch_ops),
+        full_schema_reload=bool(args.full_schema_reload),
+        schema_diff=bool(args.schema_diff),
+        domain_sketch_path=None if args.no_domain_sketches else pathlib.Path(args.domain_sketches).resolve(),
+        touched_keys_path=None if args.no_touched_keys else pathlib.Path(args.touched_keys).resolve(),
+        validation_counters=bool(args.validation_counters) and emit_plan_dir is None,
     )
     maybe_build_generated_schema(options.schema_path)
     return options
@@ -757,12 +1134,77 @@ def apply_lookup_transform(name: Optional[str], value: Any) -> Any:
     return transform(value)
 
 
-def maybe_build_generated_schema(schema_path: pathlib.Path) -> None:
+def file_sha256(path: pathlib.Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def schema_build_input_paths(domain_sketches: Optional[pathlib.Path] = None) -> list[pathlib.Path]:
+    paths = sorted(path for path in SCHEMA_FRAGMENTS_ROOT.glob("*/*.tql") if path.is_file())
+    paths.append(SCHEMA_BUILD_SCRIPT)
+    values_source = domain_sketches if domain_sketches is not None else DEFAULT_DOMAIN_INVENTORY_JSON_PATH
+    if values_source.exists():
+        paths.append(values_source)
+    return paths
+
+
+def hash_schema_build_inputs(domain_sketches: Optional[pathlib.Path] = None) -> str:
+    digest = hashlib.sha256()
+    digest.update(b"domain-sketches\0" if domain_sketches is not None else b"domain-inventory\0")
+    for path in schema_build_input_paths(domain_sketches):
+        digest.update(f"{path.parent.name}/{path.name}".encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def load_json_object(path: pathlib.Path) -> dict[str, Any]:
+    if not path.exists():
+        return {}
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def write_json_atomic(path: pathlib.Path, payload: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def maybe_build_generated_schema(schema_path: pathlib.Path, cache_dir: pathlib.Path = DEFAULT_SCHEMA_CACHE_DIR) -> None:
     if schema_path.name != "str-ontology.tql":
         return
     if not SCHEMA_BUILD_SCRIPT.exists():
         return
-    subprocess.run([sys.executable, str(SCHEMA_BUILD_SCRIPT)], check=True)
+    manifest_path = cache_dir / SCHEMA_BUILD_MANIFEST_NAME
+    manifest = load_json_object(manifest_path)
+    # build-typedb-schema.py --domain-sketches records its values source here, so rebuilds keep it.
+    domain_sketches = pathlib.Path(manifest["domain_sketches"]) if isinstance(manifest.get("domain_sketches"), str) else None
+    inputs_sha256 = hash_schema_build_inputs(domain_sketches)
+    if schema_path.exists():
+        if manifest.get("inputs_sha256") == inputs_sha256 and manifest.get("output_sha256") == file_sha256(schema_path):
+            return
+    build_args = [sys.executable, str(SCHEMA_BUILD_SCRIPT)]
+    if domain_sketches is not None:
+        build_args.extend(["--domain-sketches", str(domain_sketches)])
+    subprocess.run(build_args, check=True)
+    try:
+        write_json_atomic(
+            manifest_path,
+            {
+                "inputs_sha256": inputs_sha256,
+                "domain_sketches": str(domain_sketches) if domain_sketches is not None else None,
+                "output": str(schema_path),
+                "output_sha256": file_sha256(schema_path),
+                "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            },
+        )
+    except OSError as error:
+        print(f"[typedb-ontology-ingest] schema build manifest warning: {error}", file=sys.stderr)
 
 
 def print_stats(stats: list[CollectionStats]) -> None:
@@ -793,6 +1235,310 @@ def save_sync_state(path: pathlib.Path, state: dict[str, Any]) -> None:
     path.write_text(json.dumps(state, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
 
 
+class HyperLogLog:
+    """Distinct-count estimate over string tokens; registers merge by element-wise max."""
+
+    def __init__(self, precision: int = DOMAIN_SKETCH_HLL_PRECISION, registers: Optional[bytes] = None) -> None:
+        self.precision = precision
+        size = 1 << precision
+        self.registers = bytearray(registers) if registers is not None else bytearray(size)
+        if len(self.registers) != size:
+            raise ValueError(f"HyperLogLog expects {size} registers, got {len(self.registers)}")
+
+    def add(self, token: str) -> None:
+        digest = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+        width = 64 - self.precision
+        index = digest >> width
+        rank = width - (digest & ((1 << width) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def estimate(self) -> float:
+        size = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        raw = alpha * size * size / sum(2.0 ** -rank for rank in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * size and zeros:
+            return size * math.log(size / zeros)
+        return raw
+
+    def to_json(self) -> str:
+        return base64.b64encode(bytes(self.registers)).decode("ascii")
+
+    @classmethod
+    def from_json(cls, payload: str, precision: int = DOMAIN_SKETCH_HLL_PRECISION) -> "HyperLogLog":
+        return cls(precision, base64.b64decode(payload))
+
+
+@dataclass
+class DomainValueSketch:
+    """Space-Saving heavy hitters over at most `top_k` values plus a cardinality estimate over all of them.
+
+    A value seen while the table is full takes the slot of the least frequent one and inherits its
+    count; `errors` holds that inherited part (the count is exact when it is 0). `overflow` sums the
+    counts of evicted values, so any non-zero value means the domain outgrew `top_k`.
+    """
+
+    counts: dict[str, int] = field(default_factory=dict)
+    errors: dict[str, int] = field(default_factory=dict)
+    overflow: int = 0
+    hll: HyperLogLog = field(default_factory=HyperLogLog)
+
+    def add(self, token: str, top_k: int) -> None:
+        self.hll.add(token)
+        if token in self.counts:
+            self.counts[token] += 1
+            return
+        if len(self.counts) < top_k:
+            self.counts[token] = 1
+            return
+        evicted, floor = min(self.counts.items(), key=lambda item: (item[1], item[0]))
+        del self.counts[evicted]
+        self.errors.pop(evicted, None)
+        self.overflow += floor
+        self.counts[token] = floor + 1
+        self.errors[token] = floor
+
+    def merge(self, other: "DomainValueSketch", top_k: int) -> None:
+        merged = dict(self.counts)
+        errors = dict(self.errors)
+        for token, count in other.counts.items():
+            merged[token] = merged.get(token, 0) + count
+        for token, error in other.errors.items():
+            errors[token] = errors.get(token, 0) + error
+        ranked = sorted(merged.items(), key=lambda item: (-item[1], item[0]))
+        self.counts = dict(ranked[:top_k])
+        self.errors = {token: errors[token] for token in self.counts if errors.get(token)}
+        self.overflow += other.overflow + sum(count for _, count in ranked[top_k:])
+        self.hll.merge(other.hll)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "counts": sorted(([token, count] for token, count in self.counts.items()), key=lambda item: (-item[1], item[0])),
+            "errors": dict(sorted(self.errors.items())),
+            "overflow": self.overflow,
+            "distinct_estimate": round(self.hll.estimate()),
+            "hll": self.hll.to_json(),
+        }
+
+    @classmethod
+    def from_json(cls, payload: dict[str, Any]) -> "DomainValueSketch":
+        return cls(
+            counts={str(token): int(count) for token, count in payload.get("counts") or []},
+            errors={str(token): int(error) for token, error in (payload.get("errors") or {}).items()},
+            overflow=int(payload.get("overflow") or 0),
+            hll=HyperLogLog.from_json(payload["hll"]) if payload.get("hll") else HyperLogLog(),
+        )
+
+
+class ScanConsumer:
+    """Observer fed by the single cursor pass over a collection (for_each_doc / scan_collection_once).
+
+    Consumers in sibling scripts implement the same five methods without subclassing.
+    `projection_fields` returns the document paths the consumer reads, or None when it needs whole documents.
+    """
+
+    def wants(self, collection: str) -> bool:
+        return False
+
+    def projection_fields(self, collection: str) -> Optional[list[str]]:
+        return []
+
+    def begin(self, collection: str) -> None:
+        return None
+
+    def observe(self, collection: str, doc: dict[str, Any]) -> None:
+        return None
+
+    def end(self, collection: str) -> None:
+        return None
+
+
+class DomainSketchSet(ScanConsumer):
+    """Per-collection sketches of mapped attrs marked `# @toon inventory=inspect`, fed by for_each_doc."""
+
+    def __init__(
+        self,
+        mapping_by_collection: dict[str, dict[str, Any]],
+        marked_attrs: dict[str, dict[str, Any]],
+        top_k: int = DOMAIN_SKETCH_TOP_K,
+    ) -> None:
+        self.top_k = top_k
+        self.marked_attrs = marked_attrs
+        self.targets: dict[str, list[tuple[str, str]]] = {}
+        self.target_entities: dict[str, Any] = {}
+        for collection, cfg in mapping_by_collection.items():
+            attributes = cfg.get("attributes") or {}
+            targets = [
+                (attr, source)
+                for attr, source in attributes.items()
+                if attr in marked_attrs and isinstance(source, str) and source
+            ]
+            if targets:
+                self.targets[collection] = targets
+                self.target_entities[collection] = cfg.get("target_entity")
+        self.sketches: dict[str, dict[str, DomainValueSketch]] = {}
+
+    def wants(self, collection: str) -> bool:
+        return collection in self.targets
+
+    def projection_fields(self, collection: str) -> list[str]:
+        return [source for _, source in self.targets.get(collection, [])]
+
+    def begin(self, collection: str) -> None:
+        if collection in self.targets:
+            self.sketches[collection] = {attr: DomainValueSketch() for attr, _ in self.targets[collection]}
+
+    def observe(self, collection: str, doc: dict[str, Any]) -> None:
+        sketches = self.sketches.get(collection)
+        if sketches is None:
+            return
+        for attr, source in self.targets[collection]:
+            value = domain_inventory.canonicalize_attr_value(attr, resolve_doc_path(doc, source))
+            sketches[attr].add(domain_inventory.freeze_value(value), self.top_k)
+
+    def merge_into(self, state: dict[str, Any], *, replace: bool, run_id: str) -> dict[str, Any]:
+        """Fold this run's sketches into persisted `state`; `replace` drops prior counts of scanned collections."""
+        collections = state.setdefault("collections", {})
+        for collection, sketches in self.sketches.items():
+            previous = {} if replace else (collections.get(collection) or {}).get("attrs") or {}
+            attrs: dict[str, Any] = {}
+            for attr, source in self.targets[collection]:
+                sketch = sketches[attr]
+                if attr in previous and previous[attr].get("source_field") == source:
+                    merged = DomainValueSketch.from_json(previous[attr])
+                    merged.merge(sketch, self.top_k)
+                    sketch = merged
+                meta = self.marked_attrs.get(attr) or {}
+                attrs[attr] = {
+                    "source_field": source,
+                    "declared_domain": meta.get("domain"),
+                    "max_values": int(meta["max_values"]) if str(meta.get("max_values", "")).isdigit() else None,
+                    **sketch.to_json(),
+                }
+            collections[collection] = {
+                "target_entity": self.target_entities.get(collection),
+                "run_id": run_id,
+                "mode": "replace" if replace else "merge",
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+                "attrs": attrs,
+            }
+        state["format"] = DOMAIN_SKETCH_FORMAT
+        state["top_k"] = self.top_k
+        state["hll_precision"] = DOMAIN_SKETCH_HLL_PRECISION
+        return state
+
+
+class TouchedKeys(ScanConsumer):
+    """Entity keys inserted or reconciled by this run, grouped by the collection being ingested.
+
+    Registered as a scan consumer only to learn the current collection; writers report keys
+    through `note_touched_key`. The manifest lets validate scope orphan/contract checks to them.
+    """
+
+    def __init__(self) -> None:
+        self.collection: Optional[str] = None
+        self.keys: dict[str, dict[str, tuple[str, set[str]]]] = {}
+
+    def wants(self, collection: str) -> bool:
+        return True
+
+    def begin(self, collection: str) -> None:
+        self.collection = collection
+
+    def end(self, collection: str) -> None:
+        self.collection = None
+
+    def add(self, entity: str, key_attr: str, key_value: str) -> None:
+        by_entity = self.keys.setdefault(self.collection or "_unscoped", {})
+        _, keys = by_entity.setdefault(entity, (key_attr, set()))
+        keys.add(key_value)
+
+    def total(self) -> int:
+        return sum(len(keys) for by_entity in self.keys.values() for _, keys in by_entity.values())
+
+    def merge_into(self, manifest: dict[str, Any], *, run_id: str, sync_mode: str) -> dict[str, Any]:
+        """Union with `manifest` when it belongs to the same run (staged syncs share a run id), else start over."""
+        if manifest.get("format") != TOUCHED_KEYS_FORMAT or manifest.get("run_id") != run_id:
+            manifest = {"collections": {}}
+        collections = manifest.setdefault("collections", {})
+        for collection, by_entity in self.keys.items():
+            entries = collections.setdefault(collection, {})
+            for entity, (key_attr, keys) in by_entity.items():
+                entry = entries.setdefault(entity, {"key_attr": key_attr, "keys": []})
+                entry["keys"] = sorted(set(entry.get("keys") or []) | keys)
+        manifest["format"] = TOUCHED_KEYS_FORMAT
+        manifest["run_id"] = run_id
+        manifest["sync_mode"] = sync_mode
+        manifest["updated_at"] = datetime.now(timezone.utc).isoformat()
+        return manifest
+
+
+def note_touched_key(ctx: IngestContext, entity: Optional[str], key_attr: Optional[str], key_value: Optional[str]) -> None:
+    touched_keys = getattr(ctx, "touched_keys", None)
+    if touched_keys is not None and entity and key_attr and key_value:
+        touched_keys.add(entity, key_attr, key_value)
+
+
+def scan_projection(projection: Optional[dict[str, int]], consumers: list[Any], collection: str) -> Optional[dict[str, int]]:
+    """Union of the caller's projection and every consumer's fields; None fetches whole documents."""
+    if projection is None:
+        return None
+    paths: list[str] = []
+    for consumer in consumers:
+        fields = consumer.projection_fields(collection)
+        if fields is None:
+            return None
+        paths.extend(fields)
+    return projection_with_paths(projection, paths)
+
+
+def scan_collection_once(db: Any, collection: str, consumers: list[Any], limit: Optional[int] = None) -> int:
+    """Feed one `_id`-ordered pass over `collection` to every consumer that wants it; returns docs scanned."""
+    active = [consumer for consumer in consumers if consumer.wants(collection)]
+    if not active:
+        return 0
+    for consumer in active:
+        consumer.begin(collection)
+    cursor = db[collection].find({}, scan_projection({"_id": 1}, active, collection)).sort("_id", 1)
+    if limit is not None:
+        cursor = cursor.limit(limit)
+    scanned = 0
+    for raw_doc in cursor:
+        doc = dict(raw_doc)
+        scanned += 1
+        for consumer in active:
+            consumer.observe(collection, doc)
+    for consumer in active:
+        consumer.end(collection)
+    return scanned
+
+
+def load_domain_sketch_state(path: pathlib.Path) -> dict[str, Any]:
+    state = load_json_object(path)
+    if state.get("format") != DOMAIN_SKETCH_FORMAT or state.get("hll_precision") != DOMAIN_SKETCH_HLL_PRECISION:
+        return {"collections": {}}
+    return state
+
+
+def projection_with_paths(projection: dict[str, int], paths: list[str]) -> dict[str, int]:
+    """Add inclusion paths to a Mongo projection without creating parent/child path collisions."""
+    merged = dict(projection)
+    for path in paths:
+        parts = path.split(".")
+        if any(".".join(parts[:index]) in merged for index in range(1, len(parts) + 1)):
+            continue
+        for existing in [key for key in merged if key.startswith(f"{path}.")]:
+            del merged[existing]
+        merged[path] = 1
+    return merged
+
+
 def parse_iso_datetime(value: Any) -> Optional[datetime]:
     if not isinstance(value, str) or not value.strip():
         return None
@@ -1233,6 +1979,7 @@ def insert_query(
     try:
         execute_query_in_transaction(ctx.typedb_driver, ctx.options.typedb_database, TransactionType.WRITE, query)
         stats.inserted += 1
+        note_touched_key(ctx, entity, key_attr, key_value)
         return True
     except Exception as error:
         if "[CNT9]" in str(error):
@@ -1403,6 +2150,7 @@ def reconcile_owned_attributes_bulk(
                 f"insert $e has {attr} {desired_literal};"
             )
     execute_queries_in_transaction(ctx.typedb_driver, ctx.options.typedb_database, TransactionType.WRITE, queries)
+    note_touched_key(ctx, entity, key_attr, key_value)
 
 
 def reconcile_relation(
@@ -1448,6 +2196,7 @@ def reconcile_relation(
         f"delete $r;"
     )
     delete_query_if_exists(ctx.typedb_driver, ctx.options.typedb_database, match_existing, delete_existing)
+    note_touched_key(ctx, source_entity, source_key_attr, source_key_value)
 
     if owner_value is None:
         return
@@ -1481,6 +2230,7 @@ def upsert_entity(
             append_mapped_attr(fields, attr, attr_type, raw_value)
         query = f"{', '.join(fields)};"
         execute_query_in_transaction(ctx.typedb_driver, ctx.options.typedb_database, TransactionType.WRITE, query)
+        note_touched_key(ctx, entity, key_attr, key_value)
         return
 
     if ctx.options.assume_empty_db:
@@ -1489,6 +2239,7 @@ def upsert_entity(
             append_mapped_attr(fields, attr, attr_type, raw_value)
         query = f"{', '.join(fields)};"
         execute_query_in_transaction(ctx.typedb_driver, ctx.options.typedb_database, TransactionType.WRITE, query)
+        note_touched_key(ctx, entity, key_attr, key_value)
         return
 
     exists_query = f"match $x isa {entity}, has {key_attr} {lit_string(key_value)}; limit 1;"
@@ -1519,6 +2270,7 @@ def upsert_entity(
         append_mapped_attr(fields, attr, attr_type, raw_value)
     query = f"{', '.join(fields)};"
     execute_query_in_transaction(ctx.typedb_driver, ctx.options.typedb_database, TransactionType.WRITE, query)
+    note_touched_key(ctx, entity, key_attr, key_value)
 
 
 def derive_canonical_voice_session_url(session_id: Optional[str]) -> Optional[str]:
@@ -2519,6 +3271,10 @@ def for_each_doc(
     stats = CollectionStats(collection=collection)
     stats.last_heartbeat_at = time.time()
     query = build_collection_query(ctx, collection)
+    consumers = [consumer for consumer in ctx.scan_consumers if consumer.wants(collection)]
+    for consumer in consumers:
+        consumer.begin(collection)
+    projection = scan_projection(projection, consumers, collection)
     cursor = ctx.db[collection].find(query, projection).sort("_id", 1)
     if ctx.options.limit is not None:
         cursor = cursor.limit(ctx.options.limit)
@@ -2526,10 +3282,14 @@ def for_each_doc(
     for raw_doc in cursor:
         doc = dict(raw_doc)
         stats.scanned += 1
+        for consumer in consumers:
+            consumer.observe(collection, doc)
         handler(doc, stats)
         update_sync_state_for_doc(ctx, collection, doc)
         emit_collection_heartbeat(ctx, stats)
 
+    for consumer in consumers:
+        consumer.end(collection)
     emit_collection_heartbeat(ctx, stats, force=True)
     return stats
 
@@ -3489,16 +4249,73 @@ def load_mapping_by_collection(path: pathlib.Path) -> dict[str, dict[str, Any]]:
     return by_collection
 
 
-def parse_schema_metadata(
-    schema_path: pathlib.Path,
-) -> tuple[
+SchemaMetadata = tuple[
     dict[str, str],
     dict[str, set[str]],
     dict[str, list[str]],
     dict[tuple[str, str], set[str]],
-]:
+]
+
+
+def schema_metadata_cache_path(cache_dir: pathlib.Path, schema_sha256: str) -> pathlib.Path:
+    return cache_dir / f"schema-metadata-{schema_sha256[:24]}.json"
+
+
+def load_schema_metadata_cache(path: pathlib.Path, schema_sha256: str) -> Optional[SchemaMetadata]:
+    payload = load_json_object(path)
+    if payload.get("version") != SCHEMA_METADATA_CACHE_VERSION or payload.get("schema_sha256") != schema_sha256:
+        return None
+    try:
+        return (
+            dict(payload["attr_types"]),
+            {entity: set(attrs) for entity, attrs in payload["entity_owned_attrs"].items()},
+            {relation: list(roles) for relation, roles in payload["relation_roles"].items()},
+            {(entity, relation): set(roles) for entity, relation, roles in payload["entity_relation_roles"]},
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def save_schema_metadata_cache(path: pathlib.Path, schema_sha256: str, metadata: SchemaMetadata) -> None:
+    attr_types, entity_owned_attrs, relation_roles, entity_relation_roles = metadata
+    payload = {
+        "version": SCHEMA_METADATA_CACHE_VERSION,
+        "schema_sha256": schema_sha256,
+        "attr_types": attr_types,
+        "entity_owned_attrs": {entity: sorted(attrs) for entity, attrs in entity_owned_attrs.items()},
+        "relation_roles": relation_roles,
+        "entity_relation_roles": [
+            [entity, relation, sorted(roles)] for (entity, relation), roles in entity_relation_roles.items()
+        ],
+    }
+    try:
+        write_json_atomic(path, payload)
+        for stale in path.parent.glob("schema-metadata-*.json"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+    except OSError as error:
+        print(f"[typedb-ontology-ingest] schema metadata cache warning: {error}", file=sys.stderr)
+
+
+def parse_schema_metadata(
+    schema_path: pathlib.Path,
+    cache_dir: Optional[pathlib.Path] = DEFAULT_SCHEMA_CACHE_DIR,
+) -> SchemaMetadata:
     text = schema_path.read_text(encoding="utf-8")
+    if cache_dir is None:
+        return parse_schema_metadata_text(text)
+
+    schema_sha256 = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    cache_path = schema_metadata_cache_path(cache_dir, schema_sha256)
+    cached = load_schema_metadata_cache(cache_path, schema_sha256)
+    if cached is not None:
+        return cached
+    metadata = parse_schema_metadata_text(text)
+    save_schema_metadata_cache(cache_path, schema_sha256, metadata)
+    return metadata
 
+
+def parse_schema_metadata_text(text: str) -> SchemaMetadata:
     attr_types: dict[str, str] = {}
     for match in re.finditer(r"^attribute\s+([a-zA-Z0-9_]+),\s+value\s+([a-zA-Z0-9_]+);", text, flags=re.M):
         attr_types[match.group(1)] = match.group(2)
@@ -4154,13 +4971,153 @@ def ingest_collection_from_mapping(ctx: IngestContext, collection: str) -> Colle
     return for_each_doc(ctx, collection, handler, projection=projection)
 
 
-def init_typedb(options: CliOptions) -> Any:
-    driver = TypeDB.driver(
+def run_mode_label(options: CliOptions) -> str:
+    if options.emit_plan_dir is not None:
+        return "plan"
+    return "apply" if options.apply else "dry-run"
+
+
+@dataclass
+class SchemaDelta:
+    missing: list[str] = field(default_factory=list)
+    changed: list[tuple[str, str]] = field(default_factory=list)
+    extra: list[str] = field(default_factory=list)
+
+
+def split_typeql_top_level(text: str, separator: str) -> list[str]:
+    parts: list[str] = []
+    current: list[str] = []
+    depth = 0
+    quote: Optional[str] = None
+    escape = False
+    for char in text:
+        if quote is not None:
+            current.append(char)
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == quote:
+                quote = None
+            continue
+        if char in {'"', "'"}:
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth = max(0, depth - 1)
+        elif char == separator and depth == 0:
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    parts.append("".join(current))
+    return parts
+
+
+def strip_typeql_comments(text: str) -> str:
+    return "\n".join(split_typeql_top_level(line, "#")[0] for line in text.splitlines())
+
+
+def normalize_typeql_clause(clause: str) -> str:
+    return " ".join(clause.split()).replace("( ", "(").replace(" )", ")")
+
+
+def schema_declarations(text: str) -> dict[tuple[str, ...], str]:
+    """Index a TypeQL type schema by type header and owns/plays/relates declaration.
+
+    Values are single-statement define bodies, so a missing key renders
+    directly into a delta `define` query.
+    """
+    body = strip_typeql_comments(text).strip()
+    if body.startswith("define"):
+        body = body[len("define"):]
+    declarations: dict[tuple[str, ...], str] = {}
+    for statement in split_typeql_top_level(body, ";"):
+        clauses = [normalize_typeql_clause(clause) for clause in split_typeql_top_level(statement, ",")]
+        clauses = [clause for clause in clauses if clause]
+        if not clauses:
+            continue
+        head = clauses[0].split()
+        if len(head) < 2 or head[0] not in {"entity", "relation", "attribute"}:
+            continue
+        kind, type_name = head[0], head[1]
+        header = [" ".join(head)]
+        for clause in clauses[1:]:
+            words = clause.split()
+            if words[0] == "value" or words[0] == "sub" or words[0].startswith("@"):
+                header.append(clause)
+            elif words[0] == "owns" and len(words) >= 2:
+                declarations[("owns", type_name, words[1])] = f"{kind} {type_name}, {clause}"
+            elif words[0] == "plays" and len(words) >= 2:
+                declarations[("plays", type_name, words[1])] = f"{kind} {type_name}, {clause}"
+            elif words[0] == "relates" and len(words) >= 2:
+                declarations[("relates", type_name, words[1])] = f"{kind} {type_name}, {clause}"
+        declarations[("type", type_name)] = ", ".join(header)
+    return declarations
+
+
+def diff_schema(live_text: str, generated_text: str) -> SchemaDelta:
+    live = schema_declarations(live_text)
+    generated = schema_declarations(generated_text)
+    delta = SchemaDelta()
+    # Type headers first so owns/plays/relates in the same define resolve.
+    ordered_keys = sorted(generated, key=lambda key: 0 if key[0] == "type" else 1)
+    for key in ordered_keys:
+        statement = generated[key]
+        if key not in live:
+            delta.missing.append(statement)
+        elif live[key] != statement:
+            delta.changed.append((live[key], statement))
+    delta.extra = [statement for key, statement in live.items() if key not in generated]
+    return delta
+
+
+def render_schema_delta_query(delta: SchemaDelta) -> str:
+    if not delta.missing:
+        return ""
+    return "define\n" + "\n".join(f"{statement};" for statement in delta.missing) + "\n"
+
+
+def print_schema_delta(delta: SchemaDelta) -> None:
+    print(
+        f"[typedb-ontology-ingest] schema_delta missing={len(delta.missing)} "
+        f"changed={len(delta.changed)} live_only={len(delta.extra)}"
+    )
+    for statement in delta.missing:
+        print(f"  + {statement};")
+    for live_statement, generated_statement in delta.changed:
+        print(f"  ~ {live_statement};  ->  {generated_statement};")
+    for statement in delta.extra:
+        print(f"  - {statement};  (live only, kept)")
+
+
+def apply_schema_delta(driver: Any, database: str, schema: str, *, dry_run: bool = False) -> SchemaDelta:
+    delta = diff_schema(driver.databases.get(database).type_schema(), schema)
+    print_schema_delta(delta)
+    if delta.changed:
+        print(
+            "[typedb-ontology-ingest] warning: changed declarations are not applied by the schema delta; "
+            "use --full-schema-reload on a scratch database or migrate them explicitly",
+            file=sys.stderr,
+        )
+    query = render_schema_delta_query(delta)
+    if query and not dry_run:
+        execute_query_in_transaction(driver, database, TransactionType.SCHEMA, query)
+    return delta
+
+
+def connect_typedb(options: CliOptions) -> Any:
+    return TypeDB.driver(
         options.typedb_primary_address,
         Credentials(options.typedb_username, options.typedb_password),
         DriverOptions(is_tls_enabled=options.typedb_tls_enabled),
     )
 
+
+def init_typedb(options: CliOptions) -> Any:
+    driver = connect_typedb(options)
+
     exists = driver.databases.contains(options.typedb_database)
     if not exists:
         driver.databases.create(options.typedb_database)
@@ -4168,12 +5125,37 @@ def init_typedb(options: CliOptions) -> Any:
 
     if not exists or options.init_schema:
         schema = options.schema_path.read_text(encoding="utf-8")
-        execute_query_in_transaction(driver, options.typedb_database, TransactionType.SCHEMA, schema)
-        print(f"[typedb-ontology-ingest] schema loaded from {options.schema_path}")
+        if not exists or options.full_schema_reload:
+            execute_query_in_transaction(driver, options.typedb_database, TransactionType.SCHEMA, schema)
+            print(f"[typedb-ontology-ingest] schema loaded from {options.schema_path}")
+        else:
+            apply_schema_delta(driver, options.typedb_database, schema)
+            print(f"[typedb-ontology-ingest] schema delta applied from {options.schema_path}")
 
     return driver
 
 
+def print_live_schema_diff(options: CliOptions) -> int:
+    driver = None
+    try:
+        driver = connect_typedb(options)
+        if not driver.databases.contains(options.typedb_database):
+            print(f"[typedb-ontology-ingest] database {options.typedb_database} does not exist; full schema would be loaded")
+            return 0
+        schema = options.schema_path.read_text(encoding="utf-8")
+        apply_schema_delta(driver, options.typedb_database, schema, dry_run=True)
+        return 0
+    except Exception as error:
+        print(f"[typedb-ontology-ingest] failed: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if driver is not None:
+            try:
+                driver.close()
+            except Exception:
+                pass
+
+
 INGESTERS: dict[str, Callable[[IngestContext], CollectionStats]] = {
     "automation_customers": lambda ctx: ingest_collection_from_mapping(ctx, "automation_customers"),
     "automation_projects": lambda ctx: ingest_collection_from_mapping(ctx, "automation_projects"),
@@ -4190,9 +5172,8 @@ INGESTERS: dict[str, Callable[[IngestContext], CollectionStats]] = {
 }
 
 
-def main() -> int:
-    load_operator_env()
-    options = parse_options(parse_args())
+def run_ingest(options: CliOptions, extra_consumers: Optional[list[Any]] = None) -> int:
+    """Run one ingest pass; `extra_consumers` observe every document the ingesters read (see ScanConsumer)."""
     mapping_by_collection = load_mapping_by_collection(options.mapping_path)
     missing_from_mapping = [collection for collection in options.collections if collection not in mapping_by_collection]
     if missing_from_mapping:
@@ -4210,7 +5191,7 @@ def main() -> int:
     ) = parse_schema_metadata(options.schema_path)
 
     print(
-        f"[typedb-ontology-ingest] mode={'apply' if options.apply else 'dry-run'} "
+        f"[typedb-ontology-ingest] mode={run_mode_label(options)} "
         f"run_id={options.run_id} "
         f"sync_mode={options.sync_mode} "
         f"projection_scope={options.projection_scope} "
@@ -4224,12 +5205,18 @@ def main() -> int:
     sync_state = load_sync_state(options.sync_state_path, reset=options.reset_sync_state)
     mongo_client = MongoClient(resolve_mongo_uri())
     typedb_driver = None
+    plan_writer: Optional[PlanWriter] = None
 
     try:
         db = mongo_client[resolve_db_name()]
 
-        if options.apply:
+        if options.emit_plan_dir is not None:
+            plan_writer = PlanWriter(options.emit_plan_dir, options.run_id, options.plan_batch_ops)
+            typedb_driver = PlanRecordingDriver(plan_writer)
+        elif options.apply:
             typedb_driver = init_typedb(options)
+            if options.validation_counters:
+                typedb_driver = ValidationCounterDriver(typedb_driver)
 
         ctx = IngestContext(
             db=db,
@@ -4244,10 +5231,22 @@ def main() -> int:
             sync_state=sync_state,
             run_started_at=time.time(),
         )
+        domain_sketches: Optional[DomainSketchSet] = None
+        if options.domain_sketch_path is not None:
+            domain_sketches = DomainSketchSet(
+                mapping_by_collection, domain_inventory.parse_marked_kernel_attrs(domain_inventory.DEFAULT_KERNEL_ATTRS_PATH)
+            )
+            ctx.scan_consumers.append(domain_sketches)
+        if options.touched_keys_path is not None and options.apply and plan_writer is None:
+            ctx.touched_keys = TouchedKeys()
+            ctx.scan_consumers.append(ctx.touched_keys)
+        ctx.scan_consumers.extend(extra_consumers or [])
         stats: list[CollectionStats] = []
 
         for collection in options.collections:
             start = time.time()
+            if plan_writer is not None:
+                plan_writer.begin_collection(collection)
             ingester = INGESTERS.get(collection)
             if ingester is not None:
                 result = ingester(ctx)
@@ -4265,12 +5264,50 @@ def main() -> int:
 
         print_stats(stats)
         print(f"[typedb-ontology-ingest] deadletter={deadletter.path}")
+        if plan_writer is not None:
+            manifest = plan_writer.close(
+                schema_path=str(options.schema_path),
+                sync_mode=options.sync_mode,
+                projection_scope=options.projection_scope,
+                limit=options.limit,
+            )
+            print(
+                f"[typedb-ontology-ingest] plan={plan_writer.root / PLAN_MANIFEST_NAME} "
+                f"ops={manifest['ops_total']} queries={manifest['queries_total']} "
+                f"phases={len(manifest['phases'])} unresolved_requires={manifest['unresolved_requires']}"
+            )
         if options.apply:
             if options.skip_sync_state_write:
                 print(f"[typedb-ontology-ingest] sync_state_write=skipped path={options.sync_state_path}")
             else:
                 save_sync_state(options.sync_state_path, ctx.sync_state)
                 print(f"[typedb-ontology-ingest] sync_state={options.sync_state_path}")
+        if domain_sketches is not None and options.domain_sketch_path is not None:
+            # Partial scans merge into earlier runs, but only when sync state advances too;
+            # otherwise the next incremental run would count the same documents again.
+            replace = options.sync_mode == "full" and options.limit is None
+            if replace or (options.apply and not options.skip_sync_state_write):
+                state = domain_sketches.merge_into(
+                    load_domain_sketch_state(options.domain_sketch_path), replace=replace, run_id=options.run_id
+                )
+                write_json_atomic(options.domain_sketch_path, state)
+                print(
+                    f"[typedb-ontology-ingest] domain_sketches={options.domain_sketch_path} "
+                    f"collections={len(domain_sketches.sketches)} mode={'replace' if replace else 'merge'}"
+                )
+            else:
+                # E.g. the core step of typedb-sync-chain.sh: its collections are merged by whichever step
+                # advances their sync state, or refreshed by the next full run.
+                print("[typedb-ontology-ingest] domain_sketches=skipped reason=sync_state_not_advanced")
+        if isinstance(typedb_driver, ValidationCounterDriver):
+            changed = ",".join(f"{name}{delta:+d}" for name, delta in sorted(typedb_driver.run_deltas.items()) if delta)
+            print(f"[typedb-ontology-ingest] validation_counters={changed or 'unchanged'}")
+        if ctx.touched_keys is not None and options.touched_keys_path is not None:
+            manifest = ctx.touched_keys.merge_into(
+                load_json_object(options.touched_keys_path), run_id=options.run_id, sync_mode=options.sync_mode
+            )
+            write_json_atomic(options.touched_keys_path, manifest)
+            print(f"[typedb-ontology-ingest] touched_keys={options.touched_keys_path} keys={ctx.touched_keys.total()}")
         return 0
     except Exception as error:
         print(f"[typedb-ontology-ingest] failed: {error}", file=sys.stderr)
@@ -4288,5 +5325,13 @@ def main() -> int:
         deadletter.close()
 
 
+def main() -> int:
+    load_operator_env()
+    options = parse_options(parse_args())
+    if options.schema_diff:
+        return print_live_schema_diff(options)
+    return run_ingest(options)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Optional
+
+import yaml
+from pymongo import MongoClient
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+
+def load_script(module_name: str, filename: str) -> Any:
+    path = SCRIPT_DIR / filename
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f'Cannot load {path}')
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+contract_check = load_script('typedb_ontology_contract_check_module', 'typedb-ontology-contract-check.py')
+entity_sampling = load_script('typedb_ontology_entity_sampling_module', 'typedb-ontology-entity-sampling.py')
+# Reuse the instances the contract check and ingest already loaded.
+ingest = contract_check.ingest
+domain_inventory = ingest.domain_inventory
+
+
+class PassLog:
+    """Scan consumer recording every collection pass, so the driver only scans what ingest did not."""
+
+    def __init__(self) -> None:
+        self.passes: Counter[str] = Counter()
+
+    def wants(self, collection: str) -> bool:
+        return True
+
+    def projection_fields(self, collection: str) -> list[str]:
+        return []
+
+    def begin(self, collection: str) -> None:
+        self.passes[collection] += 1
+
+    def observe(self, collection: str, doc: dict[str, Any]) -> None:
+        return None
+
+    def end(self, collection: str) -> None:
+        return None
+
+
+def parse_args(argv: Optional[list[str]] = None) -> tuple[argparse.Namespace, list[str]]:
+    parser = argparse.ArgumentParser(
+        description='Run ingest, contract-check, domain-inventory and entity-sampling from one Mongo pass per collection',
+        epilog='Unrecognised arguments are passed to typedb-ontology-ingest.py (e.g. --apply, --collections, --limit).',
+    )
+    parser.add_argument('--skip-contract-check', action='store_true', help='Do not run the contract validator consumer')
+    parser.add_argument('--skip-domain-inventory', action='store_true', help='Do not write domain_inventory_latest.*')
+    parser.add_argument('--skip-entity-sampling', action='store_true', help='Do not write entity_sampling_latest.*')
+    return parser.parse_known_args(argv)
+
+
+def remaining_collections(collections: list[str], consumers: list[Any], passes: Counter[str]) -> list[str]:
+    return [collection for collection in collections if not passes[collection] and any(c.wants(collection) for c in consumers)]
+
+
+def main() -> int:
+    ingest.load_operator_env()
+    args, ingest_argv = parse_args()
+    options = ingest.parse_options(ingest.parse_args(ingest_argv))
+    if options.sync_mode != 'full':
+        raise ValueError('scan-all feeds whole-collection reports; run it with --sync-mode full')
+    mapping = yaml.safe_load(options.mapping_path.read_text(encoding='utf-8'))
+    mapping_collections = [item['collection'] for item in mapping.get('collections', [])]
+    consumers: list[Any] = []
+
+    contract = None
+    if not args.skip_contract_check:
+        contract_args = contract_check.parse_args(['--schema', str(options.schema_path), '--mapping', str(options.mapping_path)])
+        contract_collections, mapping_by_collection, schema_metadata = contract_check.load_contract_inputs(contract_args)
+        contract = contract_check.ContractScanConsumer(
+            mapping_by_collection, contract_check.scannable_collections(contract_collections, mapping_by_collection, schema_metadata)
+        )
+        consumers.append(contract)
+
+    inventory = None
+    if not args.skip_domain_inventory:
+        inventory_args = domain_inventory.parse_args(['--mapping', str(options.mapping_path)])
+        marked_attrs = domain_inventory.parse_marked_kernel_attrs(inventory_args.kernel_attrs)
+        planned = domain_inventory.plan_inventory(inventory_args, mapping, marked_attrs)
+        inventory = domain_inventory.ValueCountConsumer(planned)
+        consumers.append(inventory)
+
+    sampler = None
+    if not args.skip_entity_sampling:
+        sampling_args = entity_sampling.parse_args(['--mapping', str(options.mapping_path)])
+        sampling_collections = entity_sampling.select_collections(sampling_args, mapping)
+        sampler = entity_sampling.LatestDocsConsumer(
+            [item['collection'] for item in sampling_collections], entity_sampling.sample_limit(sampling_args)
+        )
+        consumers.append(sampler)
+
+    started_at = time.time()
+    pass_log = PassLog()
+    status = ingest.run_ingest(options, extra_consumers=[*consumers, pass_log])
+    if status != 0:
+        return status
+
+    leftover = remaining_collections(mapping_collections, consumers, pass_log.passes)
+    if leftover:
+        mongo = MongoClient(ingest.resolve_mongo_uri())
+        try:
+            db = mongo[ingest.resolve_db_name()]
+            for collection in leftover:
+                ingest.scan_collection_once(db, collection, [*consumers, pass_log], limit=options.limit)
+        finally:
+            mongo.close()
+    repeated = sorted(collection for collection, count in pass_log.passes.items() if count > 1)
+    print(
+        f'[typedb-ontology-scan-all] collections={len(pass_log.passes)} ingest_passes={len(pass_log.passes) - len(leftover)} '
+        f'extra_passes={len(leftover)} repeated={",".join(repeated) or "none"} duration_ms={int((time.time() - started_at) * 1000)}'
+    )
+
+    exit_code = 0
+    if contract is not None:
+        issues, total_scanned = contract_check.check_collections(
+            contract_args, contract_collections, mapping_by_collection, schema_metadata, contract.scan, contract.scan
+        )
+        exit_code = contract_check.print_contract_report(contract_args, contract_collections, issues, total_scanned, started_at)
+    if inventory is not None:
+        domain_inventory.write_inventory_reports(
+            inventory_args, marked_attrs, planned, ((inventory.value_counts(item['collection']), False) for item, _ in planned)
+        )
+    if sampler is not None:
+        entity_sampling.write_sampling_reports(sampling_args, sampling_collections, sampler.latest)
+    return exit_code
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
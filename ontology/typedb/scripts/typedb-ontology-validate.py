@@ -1,12 +1,32 @@
 #!/usr/bin/env python3
 import argparse
+import json
 import os
+import re
 import sys
-from dataclasses import dataclass
-from typing import Callable, Optional
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional
 
 from dotenv import load_dotenv
-from typedb.driver import Credentials, DriverOptions, TransactionType, TypeDB
+from typedb.driver import Credentials, DriverOptions, TransactionOptions, TransactionType, TypeDB
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_QUERIES_PATH = ROOT_DIR / "queries" / "validation_v1.tql"
+VALIDATE_REPORT_FORMAT = "typedb-ontology-validate-v1"
+TOUCHED_KEYS_FORMAT = "typedb-ontology-touched-keys/v1"
+CHECK_SUBJECT_PATTERN = re.compile(r"^match \$(\w+) isa (\w+)\b")
+READ_COUNTERS_QUERY = (
+    "match $c isa validation_counter, has validation_counter_id $id, has counter_value $value; select $id, $value;"
+)
+# Set by writers that bypass ingest --validation-counters (apply-plan); cleared by a complete --recount.
+COUNTERS_STALE_ID = "counters_stale"
+# Extra time the runner waits past a check's timeout for the server-side abort before giving up on it.
+TIMEOUT_GRACE_SECONDS = 5.0
 
 
 @dataclass
@@ -14,16 +34,71 @@ class AggregateCheck:
     name: str
     query: str
     warn_if: Optional[Callable[[int], bool]] = None
+    suite: str = "checks"
+    title: str = ""
+    # Scoped runs split the check into key-batched queries whose counts are summed.
+    batches: list[str] = field(default_factory=list)
+
+
+@dataclass
+class CheckResult:
+    name: str
+    suite: str
+    status: str
+    value: Optional[int]
+    latency_ms: int
+    title: str = ""
+    error: str = ""
+    previous: Optional[int] = None
+
+    @property
+    def delta(self) -> Optional[int]:
+        if self.value is None or self.previous is None:
+            return None
+        return self.value - self.previous
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Validate TypeDB ontology ingestion")
     parser.add_argument("--typedb-addresses", type=str, default=None)
     parser.add_argument("--typedb-username", type=str, default=None)
     parser.add_argument("--typedb-password", type=str, default=None)
     parser.add_argument("--typedb-database", type=str, default=None)
     parser.add_argument("--typedb-tls-enabled", type=str, default=None)
-    return parser.parse_args()
+    parser.add_argument(
+        "--suite",
+        choices=("checks", "tql", "all"),
+        default="checks",
+        help="checks = built-in aggregate checks, tql = queries from --queries, all = both",
+    )
+    parser.add_argument("--queries", type=Path, default=DEFAULT_QUERIES_PATH, help="TypeQL query pack for --suite tql/all")
+    parser.add_argument("--workers", type=int, default=8, help="Checks running concurrently, one read transaction each")
+    parser.add_argument("--timeout-seconds", type=float, default=120.0, help="Per-check transaction timeout")
+    parser.add_argument(
+        "--json-out",
+        type=Path,
+        default=None,
+        help="Write results as JSON; an existing report at this path is used as the baseline for per-check deltas",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--touched-keys",
+        type=Path,
+        default=None,
+        help="Ingest touched-keys manifest; evaluate only orphan/contract checks, and only for the listed keys",
+    )
+    mode.add_argument(
+        "--counters",
+        action="store_true",
+        help="Read the validation_counter values maintained by ingest --validation-counters instead of counting",
+    )
+    mode.add_argument(
+        "--recount",
+        action="store_true",
+        help="Run the selected suite plus any counter-backed checks, then overwrite the counters (seeds them, repairs drift)",
+    )
+    parser.add_argument("--key-batch-size", type=int, default=100, help="Keys per disjunction in --touched-keys mode")
+    return parser.parse_args(argv)
 
 
 def parse_bool(raw: Optional[str], default: bool = False) -> bool:
@@ -160,6 +235,27 @@ CHECKS = [
     ),
 ]
 
+# Checks whose value is a sum of per-entity contributions that depend only on the entity and its
+# own links, so ingest can keep a validation_counter exact by probing each written key.
+COUNTER_CHECK_NAMES = (
+    "projects_total",
+    "tasks_total",
+    "voice_sessions_total",
+    "voice_messages_total",
+    "voice_history_steps_total",
+    "voice_session_merge_logs_total",
+    "forecast_rows_total",
+    "orphan_tasks_without_project",
+    "orphan_messages_without_session",
+    "orphan_forecasts_without_project",
+    "orphan_history_steps_without_session",
+    "orphan_session_merge_logs_without_target_session",
+    "sessions_missing_runtime_tag",
+    "messages_missing_runtime_tag",
+    "merge_logs_missing_runtime_tag",
+    "tasks_missing_runtime_tag",
+)
+
 
 def extract_count(answer: any) -> int:
     if not answer.is_concept_rows():
@@ -196,11 +292,196 @@ def extract_count(answer: any) -> int:
     return 0
 
 
-def run_count(driver: any, database: str, query: str) -> int:
+def load_tql_checks(path: Path) -> list[AggregateCheck]:
+    """Split a query pack into one check per `match` block, translated to TypeDB 3 syntax.
+
+    The pack keeps the TypeQL 2 `get ...; count;` / `get ...; limit N;` and `$rel (...) isa rel`
+    forms; these become `reduce $count = count;`, `select ...; limit N;` and `$rel isa rel (...)`. Row-listing queries report the number
+    of rows returned. Any query with a `not { ... }` clause is a contract gate and warns above 0.
+    """
+    checks: list[AggregateCheck] = []
+    title = ""
+    for block in re.split(r"\n\s*\n", path.read_text(encoding="utf-8")):
+        query_lines: list[str] = []
+        for line in block.splitlines():
+            stripped = line.strip()
+            if stripped.startswith("#"):
+                if not query_lines:
+                    title = stripped.lstrip("#").strip()
+                continue
+            if stripped:
+                query_lines.append(stripped)
+        if not query_lines or query_lines[0] != "match":
+            continue
+        query = " ".join(query_lines)
+        query = re.sub(r"\bget\s+[^;]+;\s*count;", "reduce $count = count;", query)
+        query = re.sub(r"\bget\s+([^;]+);", r"select \1;", query)
+        query = re.sub(r"(\$\w+)\s+(\([^)]*\))\s+isa\s+(\w+)", r"\1 isa \3 \2", query)
+        checks.append(
+            AggregateCheck(
+                f"tql_{len(checks) + 1:02d}",
+                query,
+                warn_if=(lambda value: value > 0) if "not {" in query else None,
+                suite="tql",
+                title=title,
+            )
+        )
+    return checks
+
+
+def load_touched_keys(path: Path) -> tuple[str, dict[str, tuple[str, list[str]]]]:
+    """Read an ingest touched-keys manifest as (run_id, {entity: (key_attr, keys)}) across collections."""
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if payload.get("format") != TOUCHED_KEYS_FORMAT:
+        raise ValueError(f"Not a touched-keys manifest: {path}")
+    merged: dict[str, tuple[str, set[str]]] = {}
+    for by_entity in (payload.get("collections") or {}).values():
+        for entity, entry in by_entity.items():
+            key_attr, keys = merged.setdefault(entity, (entry["key_attr"], set()))
+            keys.update(entry.get("keys") or [])
+    return str(payload.get("run_id") or ""), {entity: (key_attr, sorted(keys)) for entity, (key_attr, keys) in merged.items()}
+
+
+def typeql_string(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def bind_subject_keys(check: AggregateCheck, key_attr: str, keys: list[str]) -> str:
+    """Prefix the check with a key disjunction on its subject variable (`match $x isa <entity>...`)."""
+    match = CHECK_SUBJECT_PATTERN.match(check.query)
+    if match is None:
+        raise ValueError(f"Check has no `match $var isa <entity>` subject: {check.name}")
+    variable = match.group(1)
+    if len(keys) == 1:
+        return f"match ${variable} has {key_attr} {typeql_string(keys[0])}; {check.query[len('match ') :]}"
+    disjunction = " or ".join(f"{{ ${variable} has {key_attr} {typeql_string(key)}; }}" for key in keys)
+    return f"match {disjunction}; {check.query[len('match ') :]}"
+
+
+def scope_checks(
+    checks: list[AggregateCheck], touched: dict[str, tuple[str, list[str]]], batch_size: int
+) -> tuple[list[AggregateCheck], list[str]]:
+    """Restrict orphan/contract checks (those with a `not { ... }` clause) to touched keys.
+
+    The subject variable gets a key disjunction, so each batch is a handful of key lookups
+    instead of an anti-join over every entity of the type. Checks whose subject type was not
+    touched, and plain totals, are skipped.
+    """
+    scoped: list[AggregateCheck] = []
+    skipped: list[str] = []
+    size = max(1, batch_size)
+    for check in checks:
+        match = CHECK_SUBJECT_PATTERN.match(check.query)
+        if "not {" not in check.query or match is None or match.group(2) not in touched:
+            skipped.append(check.name)
+            continue
+        key_attr, keys = touched[match.group(2)]
+        batches = [bind_subject_keys(check, key_attr, keys[start : start + size]) for start in range(0, len(keys), size)]
+        scoped.append(
+            AggregateCheck(check.name, batches[0], check.warn_if, suite=check.suite, title=check.title, batches=batches)
+        )
+    return scoped, skipped
+
+
+def counter_checks() -> list[tuple[AggregateCheck, str]]:
+    """(check, subject entity) for every check backed by a validation_counter."""
+    by_name = {check.name: check for check in CHECKS}
+    return [(by_name[name], CHECK_SUBJECT_PATTERN.match(by_name[name].query).group(2)) for name in COUNTER_CHECK_NAMES]
+
+
+def counter_probe_query(check: AggregateCheck, key: str) -> str:
+    """Does the entity with this key count towards `check`? (rows = yes). Keys follow the `<entity>_id` convention."""
+    entity = CHECK_SUBJECT_PATTERN.match(check.query).group(2)
+    bound = bind_subject_keys(check, f"{entity}_id", [key])
+    return re.sub(r"reduce \$count = count;$", "limit 1;", bound)
+
+
+def counter_update_query(name: str, delta: int) -> str:
+    operator = "+" if delta >= 0 else "-"
+    return (
+        f"match $c isa validation_counter, has validation_counter_id {typeql_string(name)}, has counter_value $v; "
+        f"let $n = $v {operator} {abs(delta)}; update $c has counter_value $n;"
+    )
+
+
+def counter_set_queries(counter_id: str, value: int) -> list[str]:
+    return [
+        f"match $c isa validation_counter, has validation_counter_id {typeql_string(counter_id)}; delete $c;",
+        f"insert $c isa validation_counter, has validation_counter_id {typeql_string(counter_id)}, has counter_value {int(value)};",
+    ]
+
+
+def attribute_value(concept: any) -> Any:
+    if concept is None or not concept.is_attribute():
+        return None
+    attribute = concept.as_attribute()
+    if attribute.is_integer():
+        return int(attribute.get_integer())
+    if attribute.is_string():
+        return attribute.get_string()
+    return None
+
+
+def read_counters(driver: any, database: str) -> dict[str, int]:
+    """All running counters (and the stale marker) in one read."""
     tx = driver.transaction(database, TransactionType.READ)
     try:
-        answer = tx.query(query).resolve()
-        return extract_count(answer)
+        answer = tx.query(READ_COUNTERS_QUERY).resolve()
+        counters: dict[str, int] = {}
+        if answer.is_concept_rows():
+            for row in answer.as_concept_rows().iterator:
+                name, value = attribute_value(row.get("id")), attribute_value(row.get("value"))
+                if isinstance(name, str) and isinstance(value, int):
+                    counters[name] = value
+        return counters
+    finally:
+        try:
+            tx.close()
+        except Exception:
+            pass
+
+
+def counter_results(counters: dict[str, int]) -> list[CheckResult]:
+    stale = bool(counters.get(COUNTERS_STALE_ID))
+    results = []
+    for check, _ in counter_checks():
+        value = counters.get(check.name)
+        if value is None:
+            results.append(CheckResult(check.name, "counters", "ERROR", None, 0, error="counter missing; run --recount"))
+            continue
+        if stale:
+            results.append(
+                CheckResult(check.name, "counters", "ERROR", value, 0, error="counters stale after writes outside ingest; run --recount")
+            )
+            continue
+        is_warn = bool(check.warn_if(value)) if check.warn_if else False
+        results.append(CheckResult(check.name, "counters", "WARN" if is_warn else "OK", value, 0))
+    return results
+
+
+def write_counters(driver: any, database: str, values: dict[str, int]) -> bool:
+    """Overwrite the counters; the stale marker is cleared only when every counter was recomputed.
+
+    Returns whether the marker was cleared.
+    """
+    complete = all(name in values for name in COUNTER_CHECK_NAMES)
+    if complete:
+        values = {**values, COUNTERS_STALE_ID: 0}
+    _write_queries(driver, database, [query for name, value in values.items() for query in counter_set_queries(name, value)])
+    return complete
+
+
+def mark_counters_stale(driver: any, database: str) -> None:
+    """Flag the counters as unreliable until the next --recount (writes that did not maintain them)."""
+    _write_queries(driver, database, counter_set_queries(COUNTERS_STALE_ID, 1))
+
+
+def _write_queries(driver: any, database: str, queries: list[str]) -> None:
+    tx = driver.transaction(database, TransactionType.WRITE)
+    try:
+        for query in queries:
+            tx.query(query).resolve()
+        tx.commit()
     finally:
         try:
             tx.close()
@@ -208,6 +489,164 @@ def run_count(driver: any, database: str, query: str) -> int:
             pass
 
 
+def is_aggregate_query(query: str) -> bool:
+    return bool(re.search(r"\breduce\b", query))
+
+
+def count_rows(answer: any) -> int:
+    if not answer.is_concept_rows():
+        return 0
+    return sum(1 for _ in answer.as_concept_rows().iterator)
+
+
+class CheckRunner:
+    """Runs checks on a shared driver, one read transaction per check, tracking open transactions
+    so the coordinator can close the ones that outlive their timeout."""
+
+    def __init__(self, driver: any, database: str, timeout_seconds: float) -> None:
+        self.driver = driver
+        self.database = database
+        self.timeout_seconds = timeout_seconds
+        self.started_at: dict[int, float] = {}
+        self._open: dict[int, any] = {}
+        self._lock = threading.Lock()
+
+    def run(self, index: int, check: AggregateCheck) -> CheckResult:
+        started = time.monotonic()
+        with self._lock:
+            self.started_at[index] = started
+        tx = None
+        try:
+            tx = self.driver.transaction(
+                self.database,
+                TransactionType.READ,
+                TransactionOptions(transaction_timeout_millis=int(self.timeout_seconds * 1000)),
+            )
+            with self._lock:
+                self._open[index] = tx
+            value = 0
+            for query in check.batches or [check.query]:
+                answer = tx.query(query).resolve()
+                value += extract_count(answer) if is_aggregate_query(query) else count_rows(answer)
+            is_warn = bool(check.warn_if(value)) if check.warn_if else False
+            return CheckResult(
+                check.name, check.suite, "WARN" if is_warn else "OK", value, elapsed_ms(started), title=check.title
+            )
+        except Exception as error:
+            status = "TIMEOUT" if time.monotonic() - started >= self.timeout_seconds else "ERROR"
+            return CheckResult(check.name, check.suite, status, None, elapsed_ms(started), title=check.title, error=str(error))
+        finally:
+            with self._lock:
+                self._open.pop(index, None)
+            if tx is not None:
+                try:
+                    tx.close()
+                except Exception:
+                    pass
+
+    def abandon(self, index: int) -> None:
+        with self._lock:
+            tx = self._open.pop(index, None)
+        if tx is not None:
+            try:
+                tx.close()
+            except Exception:
+                pass
+
+
+def elapsed_ms(started: float) -> int:
+    return int((time.monotonic() - started) * 1000)
+
+
+def run_checks(
+    driver: any, database: str, checks: list[AggregateCheck], workers: int, timeout_seconds: float
+) -> list[CheckResult]:
+    """Run checks on a bounded pool; wall time tracks the slowest check rather than the sum."""
+    runner = CheckRunner(driver, database, timeout_seconds)
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    futures: dict[Future, int] = {pool.submit(runner.run, index, check): index for index, check in enumerate(checks)}
+    results: dict[int, CheckResult] = {}
+    pending = set(futures)
+    try:
+        while pending:
+            done, pending = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[futures[future]] = future.result()
+            now = time.monotonic()
+            for future in list(pending):
+                index = futures[future]
+                started = runner.started_at.get(index)
+                if started is None or now - started < timeout_seconds + TIMEOUT_GRACE_SECONDS:
+                    continue
+                # The server did not abort the transaction in time; stop waiting on it.
+                runner.abandon(index)
+                check = checks[index]
+                results[index] = CheckResult(
+                    check.name, check.suite, "TIMEOUT", None, elapsed_ms(started), title=check.title, error="client-side timeout"
+                )
+                pending.discard(future)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return [results[index] for index in range(len(checks))]
+
+
+def load_previous_values(path: Optional[Path], scope: str = "full") -> dict[str, int]:
+    # Touched-key counts are not comparable with full-graph counts, or with another run's keys.
+    if scope == "touched-keys" or path is None or not path.exists():
+        return {}
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if payload.get("format") != VALIDATE_REPORT_FORMAT or payload.get("scope", "full") == "touched-keys":
+        return {}
+    return {
+        item["name"]: item["value"]
+        for item in payload.get("checks", [])
+        if isinstance(item, dict) and isinstance(item.get("value"), int)
+    }
+
+
+def summarize_results(results: list[CheckResult]) -> dict[str, Any]:
+    summary: dict[str, Any] = {"checks": len(results)}
+    for status in ("OK", "WARN", "ERROR", "TIMEOUT"):
+        summary[status.lower()] = sum(1 for result in results if result.status == status)
+    slowest = max(results, key=lambda result: result.latency_ms, default=None)
+    summary["slowest"] = {"name": slowest.name, "latency_ms": slowest.latency_ms} if slowest else None
+    summary["latency_ms_total"] = sum(result.latency_ms for result in results)
+    return summary
+
+
+def write_validate_report(
+    path: Path, database: str, results: list[CheckResult], wall_ms: int, scope: str = "full"
+) -> None:
+    payload = {
+        "format": VALIDATE_REPORT_FORMAT,
+        "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "database": database,
+        "scope": scope,
+        "wall_ms": wall_ms,
+        "summary": summarize_results(results),
+        "checks": [{**asdict(result), "delta": result.delta} for result in results],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def format_result(result: CheckResult) -> str:
+    if result.value is None:
+        line = f"{result.status} {result.name} latency_ms={result.latency_ms} error={result.error}"
+    else:
+        line = f"{result.status} {result.name}={result.value} latency_ms={result.latency_ms}"
+        if result.delta:
+            line += f" delta={result.delta:+d}"
+    if result.title:
+        line += f" ({result.title})"
+    return f"[typedb-ontology-validate] {line}"
+
+
 def main() -> int:
     load_dotenv()
     args = parse_args()
@@ -227,7 +666,32 @@ def main() -> int:
     typedb_database = args.typedb_database or os.getenv("TYPEDB_DATABASE") or "str_opsportal_v1"
     typedb_tls_enabled = parse_bool(args.typedb_tls_enabled or os.getenv("TYPEDB_TLS_ENABLED"), default=False)
 
-    print(f"[typedb-ontology-validate] addresses={','.join(addresses)} db={typedb_database}")
+    checks: list[AggregateCheck] = []
+    if args.suite in {"checks", "all"}:
+        checks.extend(CHECKS)
+    if args.suite in {"tql", "all"}:
+        checks.extend(load_tql_checks(args.queries))
+    scope = "full"
+    if args.counters:
+        scope = "counters"
+        checks = [check for check, _ in counter_checks()]
+    elif args.recount:
+        scope = "recount"
+        selected = {check.name for check in checks}
+        checks.extend(check for check, _ in counter_checks() if check.name not in selected)
+    elif args.touched_keys is not None:
+        touched_run_id, touched = load_touched_keys(args.touched_keys)
+        checks, skipped = scope_checks(checks, touched, args.key_batch_size)
+        scope = "touched-keys"
+        print(
+            f"[typedb-ontology-validate] scope=touched-keys run_id={touched_run_id or 'unknown'} "
+            f"keys={sum(len(keys) for _, keys in touched.values())} scoped_checks={len(checks)} skipped={len(skipped)}"
+        )
+
+    print(
+        f"[typedb-ontology-validate] addresses={','.join(addresses)} db={typedb_database} "
+        f"suite={args.suite} scope={scope} checks={len(checks)} workers={args.workers} timeout_s={args.timeout_seconds:g}"
+    )
 
     try:
         driver = TypeDB.driver(
@@ -239,14 +703,51 @@ def main() -> int:
         if not driver.databases.contains(typedb_database):
             raise RuntimeError(f"TypeDB database does not exist: {typedb_database}")
 
-        for check in CHECKS:
-            value = run_count(driver, typedb_database, check.query)
-            is_warn = bool(check.warn_if(value)) if check.warn_if else False
-            level = "WARN" if is_warn else "OK"
-            print(f"[typedb-ontology-validate] {level} {check.name}={value}")
+        previous = load_previous_values(args.json_out, scope)
+        started = time.monotonic()
+        if args.counters:
+            results = counter_results(read_counters(driver, typedb_database))
+        else:
+            if args.recount:
+                # Deltas then show counter drift rather than change since the last report.
+                previous = read_counters(driver, typedb_database)
+            results = run_checks(driver, typedb_database, checks, args.workers, args.timeout_seconds)
+        if args.recount:
+            recounted = {
+                result.name: result.value
+                for result in results
+                if result.name in COUNTER_CHECK_NAMES and result.value is not None
+            }
+            complete = write_counters(driver, typedb_database, recounted)
+            drifted = sum(1 for name, value in recounted.items() if previous.get(name) != value)
+            print(f"[typedb-ontology-validate] recount counters={len(recounted)} drifted={drifted}")
+            if not complete:
+                missing = [name for name in COUNTER_CHECK_NAMES if name not in recounted]
+                print(
+                    f"[typedb-ontology-validate] recount incomplete; counters stay stale missing={','.join(missing)}",
+                    file=sys.stderr,
+                )
+        wall_ms = elapsed_ms(started)
+        for result in results:
+            result.previous = previous.get(result.name)
+            print(format_result(result))
+
+        summary = summarize_results(results)
+        slowest = summary["slowest"]
+        print(
+            f"[typedb-ontology-validate] checks={summary['checks']} ok={summary['ok']} warn={summary['warn']} "
+            f"error={summary['error']} timeout={summary['timeout']} wall_ms={wall_ms} "
+            f"latency_ms_total={summary['latency_ms_total']} "
+            f"slowest={slowest['name'] + ':' + str(slowest['latency_ms']) if slowest else 'none'}"
+        )
+        if args.json_out is not None:
+            write_validate_report(args.json_out, typedb_database, results, wall_ms, scope)
+            print(f"[typedb-ontology-validate] report={args.json_out}")
 
         driver.close()
-        return 0
+        if args.recount and not complete:
+            return 1
+        return 1 if summary["error"] or summary["timeout"] else 0
     except Exception as error:
         print(f"[typedb-ontology-validate] failed: {error}", file=sys.stderr)
         return 1
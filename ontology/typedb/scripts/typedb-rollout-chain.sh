@@ -78,12 +78,20 @@ run_rollout() {
   } 2>&1 | tee -a "$cleanup_log"
   local cleanup_exit=${PIPESTATUS[0]}
 
+  local validate_stamp="$LOG_DIR/.typedb-validate-${run_id}.stamp"
+  touch "$validate_stamp"
   write_rollout_state "$run_id" "running" "cleanup_validate" "$session_name" "$cleanup_log" "$cleanup_deadletter" "$backfill_log" "$backfill_deadletter" "starting validate after cleanup apply"
   {
     echo "[typedb-rollout-chain] run_id=${run_id} phase=8wn1_validate start=$(date -u +%FT%TZ)"
-    npm run ontology:typedb:validate
+    # Checks run concurrently; the step takes about as long as the slowest check.
+    npm run ontology:typedb:validate -- --workers 8 --json-out "$(validate_latest_report)"
   } 2>&1 | tee -a "$cleanup_log"
   local validate_exit=${PIPESTATUS[0]}
+  # Keep the per-run copy only when this validate actually rewrote the latest report.
+  if [ "$(validate_latest_report)" -nt "$validate_stamp" ]; then
+    cp "$(validate_latest_report)" "$(validate_report_for_run "$run_id")"
+  fi
+  rm -f "$validate_stamp"
   echo "[typedb-rollout-chain] run_id=${run_id} cleanup_exit=${cleanup_exit} validate_exit=${validate_exit} done=$(date -u +%FT%TZ)" | tee -a "$cleanup_log"
 
   if [ "$cleanup_exit" -ne 0 ] || [ "$validate_exit" -ne 0 ]; then
@@ -32,6 +32,15 @@ backfill_deadletter_for_run() {
   printf '%s/typedb-6zjr-backfill-deadletter-%s.ndjson\n' "$LOG_DIR" "$1"
 }
 
+validate_report_for_run() {
+  printf '%s/typedb-validate-%s.json\n' "$LOG_DIR" "$1"
+}
+
+# Stable path: each validate run diffs against the previous one here, then is copied to its per-run report.
+validate_latest_report() {
+  printf '%s/typedb-validate-latest.json\n' "$LOG_DIR"
+}
+
 ensure_log_dir() {
   mkdir -p "$LOG_DIR"
 }
@@ -92,6 +101,7 @@ clear_rollout_logs() {
     -name 'typedb-*-cleanup-*.log' -o \
     -name 'typedb-*-backfill-*.log' -o \
     -name 'typedb-*-deadletter-*.ndjson' -o \
+    -name 'typedb-validate-*.json' -o \
     -name 'typedb-historical-backfill-*.log' -o \
     -name 'typedb-historical-backfill-*.pid' -o \
     -name 'typedb-ontology-historical-backfill*.log' -o \
@@ -100,5 +110,5 @@ clear_rollout_logs() {
     -name 'test-*.log' -o \
     -name 'test-*.pid' -o \
     -name 'typedb-rollout-state.json' \
-  \) -print -delete
+  \) ! -name 'typedb-validate-latest.json' -print -delete
 }
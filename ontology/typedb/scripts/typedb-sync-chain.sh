@@ -7,6 +7,8 @@ BACKEND_DIR="$(cd "$ROOT_DIR/../.." && pwd)/backend"
 LOG_DIR="$ROOT_DIR/logs"
 DEFAULT_SYNC_STATE="$LOG_DIR/typedb-ontology-sync-state.json"
 RUN_ID="${RUN_ID:-$(date -u +%Y%m%dT%H%M%SZ)}"
+# Opt-in: the database needs the validation_counter types (ingest --init-schema) and seeded values (validate --recount) first.
+VALIDATION_COUNTERS="${TYPEDB_SYNC_VALIDATION_COUNTERS:-0}"
 
 ensure_log_dir() {
   mkdir -p "$LOG_DIR"
@@ -45,6 +47,10 @@ main() {
   local core_deadletter="$LOG_DIR/typedb-sync-core-${RUN_ID}.ndjson"
   local enrich_deadletter="$LOG_DIR/typedb-sync-enrich-${RUN_ID}.ndjson"
   local apply_flag=()
+  local counters_flag=()
+  if [[ "$VALIDATION_COUNTERS" == "1" ]]; then
+    counters_flag=(--validation-counters)
+  fi
   if [[ "$mode" == "apply" ]]; then
     apply_flag=(--apply)
   elif [[ "$mode" != "dry" ]]; then
@@ -66,6 +72,7 @@ main() {
     --sync-mode incremental \
     --projection-scope core \
     --run-id "$RUN_ID" \
+    "${counters_flag[@]}" \
     --deadletter "$core_deadletter" \
     --sync-state "$sync_state_tmp" \
     --skip-sync-state-write \
@@ -78,6 +85,7 @@ main() {
     --sync-mode incremental \
     --projection-scope derived \
     --run-id "$RUN_ID" \
+    "${counters_flag[@]}" \
     --deadletter "$enrich_deadletter" \
     --sync-state "$sync_state_tmp" \
     --collections automation_voice_bot_sessions,automation_voice_bot_messages \
@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+import contextlib
+import importlib.util
+import io
+import math
+import re
+import sys
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from bson import Decimal128, ObjectId
+
+
+ROOT = Path(__file__).resolve().parents[1]
+CONTRACT_CHECK_PATH = ROOT / "scripts" / "typedb-ontology-contract-check.py"
+
+spec = importlib.util.spec_from_file_location("typedb_ontology_contract_check_test_module", CONTRACT_CHECK_PATH)
+if spec is None or spec.loader is None:
+    raise RuntimeError(f"Cannot load module from {CONTRACT_CHECK_PATH}")
+contract_check = importlib.util.module_from_spec(spec)
+sys.modules["typedb_ontology_contract_check_test_module"] = contract_check
+spec.loader.exec_module(contract_check)
+
+ingest = contract_check.ingest
+MAPPING_BY_COLLECTION = ingest.load_mapping_by_collection(ingest.DEFAULT_MAPPING_PATH)
+
+
+class Missing:
+    pass
+
+
+MISSING = Missing()
+
+
+def bson_type(value: Any) -> str:
+    if value is MISSING:
+        return "missing"
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, float):
+        return "double"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, ObjectId):
+        return "objectId"
+    if isinstance(value, datetime):
+        return "date"
+    if isinstance(value, list):
+        return "array"
+    if isinstance(value, dict):
+        return "object"
+    if isinstance(value, Decimal128):
+        return "decimal"
+    raise TypeError(value)
+
+
+def truthy(value: Any) -> bool:
+    return value not in (MISSING, None, False, 0)
+
+
+def same_value(left: Any, right: Any) -> bool:
+    if isinstance(left, float) and isinstance(right, float) and math.isnan(left) and math.isnan(right):
+        return True
+    return type(left) is type(right) and left == right
+
+
+def evaluate(expr: Any, variables: dict[str, Any]) -> Any:
+    """Evaluate the aggregation-expression subset the contract check compiles."""
+    if isinstance(expr, str) and expr.startswith("$$"):
+        return variables[expr[2:]]
+    if isinstance(expr, list):
+        return [evaluate(item, variables) for item in expr]
+    if not isinstance(expr, dict):
+        return expr
+    (op, arg), = expr.items()
+    if op == "$getField":
+        source = evaluate(arg["input"], variables)
+        return source.get(arg["field"], MISSING) if isinstance(source, dict) else MISSING
+    if op == "$let":
+        scope = dict(variables)
+        scope.update({name: evaluate(value, variables) for name, value in arg["vars"].items()})
+        return evaluate(arg["in"], scope)
+    if op == "$cond":
+        return evaluate(arg[1] if truthy(evaluate(arg[0], variables)) else arg[2], variables)
+    if op == "$switch":
+        for branch in arg["branches"]:
+            if truthy(evaluate(branch["case"], variables)):
+                return evaluate(branch["then"], variables)
+        return evaluate(arg["default"], variables)
+    if op == "$type":
+        return bson_type(evaluate(arg, variables))
+    if op == "$in":
+        needle, haystack = evaluate(arg, variables)
+        return any(same_value(needle, item) for item in haystack)
+    if op == "$eq":
+        left, right = evaluate(arg, variables)
+        return same_value(left, right)
+    if op == "$ne":
+        left, right = evaluate(arg, variables)
+        return not same_value(left, right)
+    if op == "$not":
+        return not truthy(evaluate(arg[0], variables))
+    if op == "$or":
+        return any(truthy(evaluate(item, variables)) for item in arg)
+    if op == "$and":
+        return all(truthy(evaluate(item, variables)) for item in arg)
+    if op == "$trim":
+        value = evaluate(arg["input"], variables)
+        if not isinstance(value, str):
+            raise TypeError("$trim requires a string")
+        return value.strip()
+    if op == "$toString":
+        return str(evaluate(arg, variables))
+    if op == "$toLower":
+        value = evaluate(arg, variables)
+        return "" if value in (MISSING, None) else str(value).lower()
+    if op == "$regexMatch":
+        return re.search(arg["regex"], evaluate(arg["input"], variables)) is not None
+    if op == "$sum":
+        return evaluate(arg, variables)
+    raise NotImplementedError(op)
+
+
+def run_pipeline(docs: list[dict[str, Any]], pipeline: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    rows = list(docs)
+    for stage in pipeline:
+        (op, arg), = stage.items()
+        if op == "$limit":
+            rows = rows[:arg]
+        elif op == "$sample":
+            # Deterministic stand-in: the first `size` documents.
+            rows = rows[: arg["size"]]
+        elif op == "$match":
+            rows = [row for row in rows if truthy(evaluate(arg["$expr"], {"ROOT": row}))]
+        elif op == "$facet":
+            rows = [{name: run_pipeline(rows, sub_pipeline) for name, sub_pipeline in arg.items()}]
+        elif op == "$group":
+            groups: dict[Any, dict[str, Any]] = {}
+            for row in rows:
+                key = evaluate(arg["_id"], {"ROOT": row})
+                group = groups.setdefault(key, {"_id": key, **{name: 0 for name in arg if name != "_id"}})
+                for name, accumulator in arg.items():
+                    if name != "_id":
+                        group[name] += evaluate(accumulator, {"ROOT": row})
+            rows = list(groups.values())
+        elif op == "$sort":
+            for field_name, direction in reversed(list(arg.items())):
+                rows.sort(key=lambda row: (row[field_name] is None, row[field_name]), reverse=direction < 0)
+        else:
+            raise NotImplementedError(op)
+    return rows
+
+
+class FakeCursor:
+    def __init__(self, docs: list[dict[str, Any]]) -> None:
+        self._docs = docs
+
+    def limit(self, value: int) -> "FakeCursor":
+        return FakeCursor(self._docs[:value])
+
+    def __iter__(self):
+        return iter(self._docs)
+
+
+class FakeCollection:
+    def __init__(self, docs: list[dict[str, Any]]) -> None:
+        self.docs = docs
+        self.pipelines: list[list[dict[str, Any]]] = []
+
+    def find(self, query: dict[str, Any]) -> FakeCursor:
+        return FakeCursor(self.docs)
+
+    def estimated_document_count(self) -> int:
+        return len(self.docs)
+
+    def aggregate(self, pipeline: list[dict[str, Any]], allowDiskUse: bool = False) -> list[dict[str, Any]]:
+        self.pipelines.append(pipeline)
+        return run_pipeline(self.docs, pipeline)
+
+
+SESSION_ID = "65f0c0ffee0000000000abcd"
+
+TASK_DOCS: list[dict[str, Any]] = [
+    {"_id": ObjectId(), "task_status": "  ", "status": "Ready", "project_id": ObjectId(), "source_ref": f"https://copilot/voice/session/{SESSION_ID}"},
+    {"_id": ObjectId(), "status": None, "type": "bug", "project_id": "  ", "source_ref": SESSION_ID, "performer_id": 7},
+    {"_id": ObjectId(), "issue_type": "", "project_id": float("nan"), "source_ref": "not-a-session", "task_type_id": True},
+    {"_id": ObjectId(), "task_status": "Done", "project_id": [], "source_ref": ObjectId(SESSION_ID), "performer_id": Decimal128("1")},
+    {"_id": ObjectId(), "project_id": {"nested": 1}, "source_ref": ["x"], "created_at": datetime(2026, 3, 1, tzinfo=timezone.utc)},
+]
+
+MESSAGE_DOCS: list[dict[str, Any]] = [
+    {"_id": ObjectId(), "transcription": {"provider": "whisper", "model": ""}},
+    {"_id": ObjectId(), "transcription": [{"provider": "whisper"}]},
+    {"_id": ObjectId(), "transcription": "plain"},
+    {"_id": ObjectId(), "transcription": {"provider": None}},
+    {"_id": ObjectId()},
+]
+
+REASONING_DOCS: list[dict[str, Any]] = [
+    {"_id": ObjectId(), "kind": " Assumption "},
+    {"_id": ObjectId(), "kind": "hypothesis"},
+    {"_id": ObjectId(), "kind": "hypothesis"},
+    {"_id": ObjectId(), "kind": "  "},
+    {"_id": ObjectId(), "kind": 3},
+    {"_id": ObjectId(), "kind": "open_question"},
+]
+
+VISUAL_DOCS: list[dict[str, Any]] = [
+    {"_id": ObjectId(), "evidence_link_id": ObjectId()},
+    {"_id": ObjectId(), "evidence_link_id": " "},
+    {"_id": ObjectId(), "evidence_link_id": 12},
+    {"_id": ObjectId(), "evidence_link_id": False},
+    {"_id": ObjectId()},
+]
+
+
+def scan_both(collection: str, docs: list[dict[str, Any]], limit: int | None = None):
+    db = {collection: FakeCollection(docs)}
+    cfg = MAPPING_BY_COLLECTION[collection]
+    aggregated = contract_check.scan_collection(db, collection, cfg, limit, 5, "aggregate")
+    scanned = contract_check.scan_collection(db, collection, cfg, limit, 5, "python")
+    return aggregated, scanned, db[collection]
+
+
+class ContractCheckAggregationTests(unittest.TestCase):
+    def test_aggregate_scan_matches_python_scan(self) -> None:
+        cases = {
+            "automation_tasks": TASK_DOCS,
+            "automation_voice_bot_messages": MESSAGE_DOCS,
+            "automation_reasoning_items": REASONING_DOCS,
+            "automation_visual_observations": VISUAL_DOCS,
+        }
+        for collection, docs in cases.items():
+            with self.subTest(collection=collection):
+                aggregated, scanned, fake = scan_both(collection, docs)
+                self.assertEqual(len(fake.pipelines), 1)
+                self.assertEqual(aggregated.scanned, scanned.scanned)
+                self.assertEqual(aggregated.missing_paths, {k: v for k, v in scanned.missing_paths.items() if v})
+                self.assertEqual(aggregated.empty_relation_keys, {k: v for k, v in scanned.empty_relation_keys.items() if v})
+                self.assertEqual(aggregated.missing_evidence_link_ids, scanned.missing_evidence_link_ids)
+                self.assertEqual(sorted(map(repr, aggregated.unsupported_kinds)), sorted(map(repr, scanned.unsupported_kinds)))
+
+    def test_limit_and_unsupported_kind_sample_are_applied_in_the_pipeline(self) -> None:
+        aggregated, scanned, _ = scan_both("automation_reasoning_items", REASONING_DOCS, limit=3)
+        self.assertEqual(aggregated.scanned, 3)
+        self.assertEqual(aggregated.unsupported_kinds, ["hypothesis"])
+        self.assertEqual(scanned.unsupported_kinds, ["hypothesis"])
+
+        pipeline = contract_check.build_contract_pipeline(
+            "automation_reasoning_items", MAPPING_BY_COLLECTION["automation_reasoning_items"], None, 2
+        )
+        self.assertEqual(pipeline[0]["$facet"]["unsupported_kinds"][-1], {"$limit": 2})
+
+    def test_unknown_server_transform_falls_back_to_python_scan(self) -> None:
+        cfg = {
+            "target_entity": "task",
+            "attributes": {"title": "title"},
+            "relations": [{"relation": "r", "owner_lookup": {"entity": "e", "by": "id", "from": "ref", "transform": "custom"}}],
+        }
+        self.assertFalse(contract_check.supports_aggregate_scan(cfg))
+        self.assertTrue(contract_check.supports_aggregate_scan(MAPPING_BY_COLLECTION["automation_tasks"]))
+
+
+class ContractCheckSamplingTests(unittest.TestCase):
+    def test_sample_spec_accepts_counts_and_fractions(self) -> None:
+        self.assertIsNone(contract_check.parse_sample_spec(None))
+        self.assertEqual(contract_check.parse_sample_spec("500"), ("count", 500.0))
+        self.assertEqual(contract_check.parse_sample_spec("0.05"), ("fraction", 0.05))
+        self.assertEqual(contract_check.parse_sample_spec("1.0"), ("fraction", 1.0))
+        for raw in ("0", "-3", "2.5", "1.5e0", "abc"):
+            with self.subTest(raw=raw), self.assertRaises(ValueError):
+                contract_check.parse_sample_spec(raw)
+        with contextlib.redirect_stderr(io.StringIO()) as stderr, self.assertRaises(SystemExit):
+            contract_check.parse_args(["--sample", "half"])
+        self.assertIn("Invalid --sample value: half", stderr.getvalue())
+
+        self.assertEqual(contract_check.resolve_sample_size(1000, ("fraction", 0.05)), 50)
+        self.assertEqual(contract_check.resolve_sample_size(1000, ("count", 200.0)), 200)
+        self.assertIsNone(contract_check.resolve_sample_size(100, ("count", 200.0)))
+        self.assertIsNone(contract_check.resolve_sample_size(100, ("fraction", 1.0)))
+
+    def test_wilson_interval_bounds(self) -> None:
+        low, high = contract_check.wilson_interval(50, 100)
+        self.assertAlmostEqual(low, 0.4038, places=3)
+        self.assertAlmostEqual(high, 0.5962, places=3)
+        low, high = contract_check.wilson_interval(20, 20)
+        self.assertAlmostEqual(low, 0.8389, places=3)
+        self.assertEqual(high, 1.0)
+        self.assertEqual(contract_check.wilson_interval(0, 0), (0.0, 1.0))
+
+    def test_sampled_scan_uses_sample_stage_and_records_population(self) -> None:
+        for scan_mode in ("aggregate", "python"):
+            with self.subTest(scan_mode=scan_mode):
+                fake = FakeCollection(REASONING_DOCS)
+                db = {"automation_reasoning_items": fake}
+                scan = contract_check.scan_collection(
+                    db, "automation_reasoning_items", MAPPING_BY_COLLECTION["automation_reasoning_items"],
+                    None, 5, scan_mode, ("count", 3.0),
+                )
+                self.assertTrue(scan.sampled)
+                self.assertEqual((scan.scanned, scan.population), (3, len(REASONING_DOCS)))
+                self.assertEqual(fake.pipelines[0][0], {"$sample": {"size": 3}})
+
+        fake = FakeCollection(REASONING_DOCS)
+        scan = contract_check.scan_collection(
+            {"automation_reasoning_items": fake}, "automation_reasoning_items",
+            MAPPING_BY_COLLECTION["automation_reasoning_items"], None, 5, "aggregate", ("fraction", 1.0),
+        )
+        self.assertFalse(scan.sampled)
+        self.assertNotIn({"$sample": {"size": len(REASONING_DOCS)}}, fake.pipelines[0])
+
+    def test_borderline_all_docs_finding_is_escalated_to_full_scan(self) -> None:
+        sample = contract_check.CollectionScan(
+            scanned=20, missing_paths={"a <- src_a": 20, "b <- src_b": 20}, sampled=True, population=5000
+        )
+        full = contract_check.CollectionScan(scanned=5000, missing_paths={"a <- src_a": 5000, "b <- src_b": 4999})
+        full_scans: list[int] = []
+
+        def full_scan():
+            full_scans.append(1)
+            return full
+
+        findings = contract_check.all_docs_findings(sample, full_scan, 0.99)
+        self.assertEqual(
+            findings,
+            [("path_unresolved_all_docs", "a <- src_a unresolved in all 5000 scanned docs (escalated from sample)")],
+        )
+        self.assertEqual(len(full_scans), 2)
+
+        findings = contract_check.all_docs_findings(sample, full_scan, 0.8)
+        self.assertEqual(len(full_scans), 2)
+        self.assertEqual([kind for kind, _ in findings], ["path_unresolved_all_docs"] * 2)
+        self.assertIn("sampled docs of ~5000 (rate=100.0% ci95=[83.9%, 100.0%])", findings[0][1])
+        self.assertEqual(
+            contract_check.classify_issue_level("automation_tasks", "path_unresolved_all_docs", findings[0][1]),
+            contract_check.classify_issue_level("automation_tasks", "path_unresolved_all_docs", "a <- src_a unresolved in all 20 scanned docs"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
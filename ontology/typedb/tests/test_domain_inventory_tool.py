@@ -2,8 +2,14 @@ from __future__ import annotations
 
 import importlib.util
 import sys
+import tempfile
 import unittest
+from collections import Counter
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any
+
+from pymongo.errors import OperationFailure
 
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -45,5 +51,92 @@ class DomainInventoryToolTest(unittest.TestCase):
         self.assertEqual(tool.normalize_priority_value("custom"), "custom")
 
 
+
+def group_counts(docs: list[dict[str, Any]], src: str) -> list[dict[str, Any]]:
+    counts = Counter(doc.get(src) for doc in docs)
+    return [{"_id": value, "count": count} for value, count in sorted(counts.items(), key=lambda item: (-item[1], str(item[0])))]
+
+
+class FakeCursor:
+    def __init__(self, docs: list[dict[str, Any]]) -> None:
+        self._docs = docs
+
+    def sort(self, field_name: str, direction: int) -> "FakeCursor":
+        return FakeCursor(sorted(self._docs, key=lambda doc: doc[field_name], reverse=direction < 0))
+
+    def limit(self, value: int) -> "FakeCursor":
+        return FakeCursor(self._docs[:value])
+
+    def __iter__(self):
+        return iter(self._docs)
+
+
+class FakeCollection:
+    def __init__(self, docs: list[dict[str, Any]], facet_fails: bool = False) -> None:
+        self.docs = docs
+        self.facet_fails = facet_fails
+        self.pipelines: list[list[dict[str, Any]]] = []
+
+    def estimated_document_count(self) -> int:
+        return len(self.docs)
+
+    def find(self, query: dict[str, Any], projection: dict[str, Any]) -> FakeCursor:
+        return FakeCursor([doc for doc in self.docs if "updated_at" in doc])
+
+    def aggregate(self, pipeline: list[dict[str, Any]], allowDiskUse: bool = False):
+        self.pipelines.append(pipeline)
+        stage = pipeline[0]
+        if "$facet" in stage:
+            if self.facet_fails:
+                raise OperationFailure("BSONObjectTooLarge")
+            return iter([{name: group_counts(self.docs, sub[0]["$group"]["_id"][1:]) for name, sub in stage["$facet"].items()}])
+        return iter(group_counts(self.docs, stage["$group"]["_id"][1:]))
+
+
+def task_docs() -> list[dict[str, Any]]:
+    stamp = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    return [
+        {"status": "Ready", "priority": "P1", "updated_at": stamp},
+        {"status": "Ready", "priority": "P2", "updated_at": stamp},
+        {"status": "Done", "updated_at": stamp},
+    ]
+
+
+class DomainInventorySnapshotTest(unittest.TestCase):
+    def test_collection_is_aggregated_with_one_facet_pipeline(self) -> None:
+        db = {"automation_tasks": FakeCollection(task_docs())}
+        value_counts, from_cache = tool.inventory_collection(db, "automation_tasks", ["status", "priority"], None)
+        self.assertFalse(from_cache)
+        self.assertEqual(len(db["automation_tasks"].pipelines), 1)
+        self.assertEqual(value_counts["status"], [{"_id": "Ready", "count": 2}, {"_id": "Done", "count": 1}])
+        self.assertEqual(sum(row["count"] for row in value_counts["priority"]), 3)
+
+    def test_unchanged_snapshot_is_served_from_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_dir = Path(tmp)
+            fake = FakeCollection(task_docs())
+            db = {"automation_tasks": fake}
+            first, _ = tool.inventory_collection(db, "automation_tasks", ["status"], cache_dir)
+            second, from_cache = tool.inventory_collection(db, "automation_tasks", ["status"], cache_dir)
+            self.assertTrue(from_cache)
+            self.assertEqual(second, first)
+            self.assertEqual(len(fake.pipelines), 1)
+
+            # A new source field or a newer updated_at both force re-aggregation.
+            _, from_cache = tool.inventory_collection(db, "automation_tasks", ["status", "priority"], cache_dir)
+            self.assertFalse(from_cache)
+            fake.docs[0] = {**fake.docs[0], "status": "Archived", "updated_at": datetime(2026, 3, 2, tzinfo=timezone.utc)}
+            refreshed, from_cache = tool.inventory_collection(db, "automation_tasks", ["status", "priority"], cache_dir)
+            self.assertFalse(from_cache)
+            self.assertIn({"_id": "Archived", "count": 1}, refreshed["status"])
+            self.assertEqual(len(fake.pipelines), 3)
+
+    def test_oversized_facet_falls_back_to_per_attribute_groups(self) -> None:
+        fake = FakeCollection(task_docs(), facet_fails=True)
+        value_counts = tool.aggregate_value_counts({"automation_tasks": fake}, "automation_tasks", ["status", "priority"])
+        self.assertEqual(len(fake.pipelines), 3)
+        self.assertEqual(value_counts["status"][0], {"_id": "Ready", "count": 2})
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import contextlib
+import importlib.util
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+
+ROOT = Path(__file__).resolve().parents[1]
+INGEST_PATH = ROOT / "scripts" / "typedb-ontology-ingest.py"
+BUILD_PATH = ROOT / "scripts" / "build-typedb-schema.py"
+
+
+def load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot load module from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+ingest = load_module("typedb_ontology_ingest_sketch_test_module", INGEST_PATH)
+build = load_module("build_typedb_schema_sketch_test_module", BUILD_PATH)
+
+MAPPING = {
+    "automation_tasks": {
+        "target_entity": "task",
+        "attributes": {"title": "name", "status": "task_status", "priority": "priority"},
+    },
+    "automation_voice_bot_messages": {
+        "target_entity": "voice_message",
+        "attributes": {"mime_type": "file.mime_type", "text": "text"},
+    },
+}
+MARKED = {
+    "status": {"inventory": "inspect", "domain": "dictionary", "max_values": "50"},
+    "priority": {"inventory": "inspect", "domain": "dictionary", "max_values": "20"},
+    "mime_type": {"inventory": "inspect", "domain": "dictionary", "max_values": "2"},
+}
+
+
+class FakeCursor:
+    def __init__(self, docs: list[dict]) -> None:
+        self._docs = docs
+
+    def sort(self, field_name: str, direction: int) -> "FakeCursor":
+        return self
+
+    def __iter__(self):
+        return iter(self._docs)
+
+
+class FakeCollection:
+    def __init__(self, docs: list[dict]) -> None:
+        self.docs = docs
+        self.projections: list[object] = []
+
+    def find(self, query: dict, projection: object = None) -> FakeCursor:
+        self.projections.append(projection)
+        return FakeCursor(self.docs)
+
+
+def scan(sketches, collection: str, docs: list[dict], projection: dict | None = None) -> FakeCollection:
+    fake = FakeCollection(docs)
+    ctx = SimpleNamespace(
+        db={collection: fake},
+        options=SimpleNamespace(sync_mode="full", limit=None, heartbeat_docs=0, heartbeat_seconds=0, run_id="r"),
+        sync_state={"collections": {}},
+        run_started_at=0.0,
+        scan_consumers=[sketches],
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        ingest.for_each_doc(ctx, collection, lambda doc, stats: None, projection=projection)
+    return fake
+
+
+class HyperLogLogTests(unittest.TestCase):
+    def test_estimate_and_merge(self) -> None:
+        left, right = ingest.HyperLogLog(), ingest.HyperLogLog()
+        for index in range(3000):
+            left.add(f"v{index}")
+        for index in range(2000, 5000):
+            right.add(f"v{index}")
+        self.assertAlmostEqual(left.estimate(), 3000, delta=300)
+        left.merge(right)
+        self.assertAlmostEqual(left.estimate(), 5000, delta=500)
+        before = bytes(left.registers)
+        left.merge(right)
+        self.assertEqual(bytes(left.registers), before)
+        restored = ingest.HyperLogLog.from_json(left.to_json())
+        self.assertEqual(restored.registers, left.registers)
+
+    def test_small_cardinalities_are_near_exact(self) -> None:
+        sketch = ingest.HyperLogLog()
+        for index in range(12):
+            sketch.add(str(index))
+            sketch.add(str(index))
+        self.assertEqual(round(sketch.estimate()), 12)
+
+
+class DomainSketchTests(unittest.TestCase):
+    def test_top_k_keeps_the_most_frequent_values(self) -> None:
+        sketch = ingest.DomainValueSketch()
+        for token in ["a", "b", "a", "c"]:
+            sketch.add(token, top_k=3)
+        self.assertEqual((sketch.counts, sketch.errors, sketch.overflow), ({"a": 2, "b": 1, "c": 1}, {}, 0))
+
+        # Rare values arriving first must not lock "hot" out of the table.
+        sketch = ingest.DomainValueSketch()
+        for index in range(6):
+            sketch.add(f"rare-{index}", top_k=2)
+        for _ in range(5):
+            sketch.add("hot", top_k=2)
+        self.assertIn("hot", sketch.counts)
+        self.assertGreaterEqual(sketch.counts["hot"] - sketch.errors["hot"], 1)
+        self.assertLessEqual(sketch.counts["hot"] - sketch.errors["hot"], 5)
+        self.assertGreater(sketch.overflow, 0)
+
+        other = ingest.DomainValueSketch()
+        for token in ["c", "c", "c", "c", "c", "c", "c"]:
+            other.add(token, top_k=2)
+        sketch.merge(other, top_k=2)
+        self.assertEqual(set(sketch.counts), {"c", "hot"})
+        restored = ingest.DomainValueSketch.from_json(json.loads(json.dumps(sketch.to_json())))
+        self.assertEqual((restored.counts, restored.errors, restored.overflow), (sketch.counts, sketch.errors, sketch.overflow))
+        self.assertEqual(round(sketch.hll.estimate()), 8)
+
+    def test_for_each_doc_feeds_marked_attrs_and_extends_projection(self) -> None:
+        sketches = ingest.DomainSketchSet(MAPPING, MARKED)
+        self.assertEqual(sketches.targets["automation_tasks"], [("status", "task_status"), ("priority", "priority")])
+        scan(
+            sketches,
+            "automation_tasks",
+            [
+                {"task_status": "Ready", "priority": "P1"},
+                {"task_status": "Ready", "priority": "\U0001F525 P1"},
+                {"task_status": "Done"},
+            ],
+        )
+        counts = {attr: sketch.counts for attr, sketch in sketches.sketches["automation_tasks"].items()}
+        self.assertEqual(counts, {"status": {'"Ready"': 2, '"Done"': 1}, "priority": {'"P1"': 2, "null": 1}})
+
+        fake = scan(sketches, "automation_voice_bot_messages", [{"file": {"mime_type": "audio/ogg"}}], projection={"_id": 1, "file": 1})
+        self.assertEqual(fake.projections, [{"_id": 1, "file": 1}])
+        fake = scan(sketches, "automation_voice_bot_messages", [{"file": {"mime_type": "audio/ogg"}}], projection={"_id": 1})
+        self.assertEqual(fake.projections, [{"_id": 1, "file.mime_type": 1}])
+        self.assertEqual(
+            ingest.projection_with_paths({"_id": 1, "file.mime_type": 1, "file.size": 1}, ["file"]),
+            {"_id": 1, "file": 1},
+        )
+
+    def test_state_merges_across_runs_and_full_runs_replace(self) -> None:
+        first = ingest.DomainSketchSet(MAPPING, MARKED)
+        scan(first, "automation_tasks", [{"task_status": "Ready"}, {"task_status": "Done"}])
+        state = first.merge_into({}, replace=True, run_id="r1")
+
+        second = ingest.DomainSketchSet(MAPPING, MARKED)
+        scan(second, "automation_tasks", [{"task_status": "Ready"}, {"task_status": "Blocked"}])
+        state = second.merge_into(json.loads(json.dumps(state)), replace=False, run_id="r2")
+        status = state["collections"]["automation_tasks"]["attrs"]["status"]
+        self.assertEqual(status["counts"], [['"Ready"', 2], ['"Blocked"', 1], ['"Done"', 1]])
+        self.assertEqual(status["distinct_estimate"], 3)
+        self.assertEqual(status["max_values"], 50)
+
+        state = second.merge_into(state, replace=True, run_id="r3")
+        status = state["collections"]["automation_tasks"]["attrs"]["status"]
+        self.assertEqual(status["counts"], [['"Blocked"', 1], ['"Ready"', 1]])
+        self.assertEqual(state["collections"]["automation_tasks"]["mode"], "replace")
+
+
+class BuildFromSketchesTests(unittest.TestCase):
+    def test_build_renders_toon_values_from_sketch_state(self) -> None:
+        sketches = ingest.DomainSketchSet(MAPPING, MARKED)
+        scan(sketches, "automation_tasks", [{"task_status": "Ready", "priority": "P2"}, {"task_status": "Done", "priority": "p1"}])
+        scan(
+            sketches,
+            "automation_voice_bot_messages",
+            [{"file": {"mime_type": value}} for value in ("audio/ogg", "image/png", "video/mp4")],
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "sketches.json"
+            ingest.write_json_atomic(path, sketches.merge_into({}, replace=True, run_id="r1"))
+            inventory = build.load_domain_sketches(path)
+
+        self.assertEqual(inventory["status"]["values"], ['"Done"', '"Ready"'])
+        self.assertEqual(inventory["status"]["collections"][0]["source_field"], "task_status")
+        self.assertEqual(build.render_toon_values("status", inventory), "# @toon values: Done | Ready")
+        self.assertEqual(build.render_toon_values("priority", inventory), "# @toon values: P1 | P2")
+        self.assertEqual(
+            build.render_toon_values("mime_type", inventory),
+            "# @toon values: <too many values; see domain_inventory_latest.md>",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -206,6 +206,60 @@ class IngestHelpersTest(unittest.TestCase):
         self.assertEqual(stats.inserted, 1)
         self.assertEqual(len(executed_queries), 1)
 
+    def test_touched_keys_record_inserts_and_reconciles_per_collection(self) -> None:
+        ctx = DummyCtx("incremental", {"collections": {}}, apply=True)
+        ctx.touched_keys = ingest.TouchedKeys()
+        stats = ingest.CollectionStats(collection="automation_voice_bot_messages")
+        original_execute = ingest.execute_query_in_transaction
+        original_execute_many = ingest.execute_queries_in_transaction
+        original_query_has_rows = ingest.query_has_rows
+        try:
+            ingest.execute_query_in_transaction = lambda *args, **kwargs: None
+            ingest.execute_queries_in_transaction = lambda *args, **kwargs: None
+            ingest.query_has_rows = lambda driver, database, query: '"msg-2"' in query
+            ctx.touched_keys.begin("automation_voice_bot_messages")
+            for key in ("msg-1", "msg-2"):
+                ingest.insert_query(
+                    ctx,
+                    stats,
+                    "automation_voice_bot_messages",
+                    key,
+                    f'insert $m isa voice_message, has voice_message_id "{key}";',
+                    {"_id": key},
+                    entity="voice_message",
+                    key_attr="voice_message_id",
+                    key_value=key,
+                )
+            ctx.touched_keys.end("automation_voice_bot_messages")
+            ctx.touched_keys.begin("automation_tasks")
+            ingest.reconcile_owned_attributes_bulk(
+                ctx, entity="task", key_attr="task_id", key_value="task-1", desired_attrs=[("status", '"Ready"')]
+            )
+        finally:
+            ingest.execute_query_in_transaction = original_execute
+            ingest.execute_queries_in_transaction = original_execute_many
+            ingest.query_has_rows = original_query_has_rows
+
+        # msg-2 already existed and was skipped without a write, so it is not touched.
+        manifest = ctx.touched_keys.merge_into({}, run_id="r1", sync_mode="incremental")
+        self.assertEqual(
+            manifest["collections"],
+            {
+                "automation_voice_bot_messages": {"voice_message": {"key_attr": "voice_message_id", "keys": ["msg-1"]}},
+                "automation_tasks": {"task": {"key_attr": "task_id", "keys": ["task-1"]}},
+            },
+        )
+
+        # A later stage of the same run unions keys; a new run starts a fresh manifest.
+        later = ingest.TouchedKeys()
+        later.begin("automation_voice_bot_messages")
+        later.add("voice_message", "voice_message_id", "msg-3")
+        merged = later.merge_into(manifest, run_id="r1", sync_mode="incremental")
+        self.assertEqual(merged["collections"]["automation_voice_bot_messages"]["voice_message"]["keys"], ["msg-1", "msg-3"])
+        fresh = later.merge_into(merged, run_id="r2", sync_mode="incremental")
+        self.assertEqual(list(fresh["collections"]), ["automation_voice_bot_messages"])
+        self.assertEqual(fresh["collections"]["automation_voice_bot_messages"]["voice_message"]["keys"], ["msg-3"])
+
     def test_voice_session_core_scope_skips_derived_projections(self) -> None:
         ctx = DummyCtx("full", {"collections": {}}, apply=True)
         ctx.options.projection_scope = "core"
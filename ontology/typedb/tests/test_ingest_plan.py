@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import gzip
+import importlib.util
+import json
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+
+ROOT = Path(__file__).resolve().parents[1]
+INGEST_PATH = ROOT / "scripts" / "typedb-ontology-ingest.py"
+APPLY_PLAN_PATH = ROOT / "scripts" / "typedb-ontology-apply-plan.py"
+
+
+def load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Cannot load module from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+ingest = load_module("typedb_ontology_ingest_plan_test_module", INGEST_PATH)
+apply_plan_module = load_module("typedb_ontology_apply_plan_test_module", APPLY_PLAN_PATH)
+
+def read_batch(root: Path, relative: str) -> list[dict]:
+    with gzip.open(root / relative, "rt", encoding="utf-8") as fp:
+        return [json.loads(line) for line in fp if line.strip()]
+
+
+def entity_insert(entity: str, key_attr: str, key: str) -> str:
+    return f"insert $e isa {entity}, has {key_attr} {ingest.lit_string(key)};"
+
+
+def relation_insert(left: tuple[str, str, str], right: tuple[str, str, str], relation: str) -> str:
+    return (
+        f"match $a isa {left[0]}, has {left[1]} {ingest.lit_string(left[2])}; "
+        f"$b isa {right[0]}, has {right[1]} {ingest.lit_string(right[2])}; "
+        f"insert (left: $a, right: $b) isa {relation};"
+    )
+
+
+class PlanCompileTests(unittest.TestCase):
+    def test_key_dependencies_split_match_and_insert_clauses(self) -> None:
+        provides, requires = ingest.plan_key_dependencies(entity_insert("task", "task_id", 'a"b'))
+        self.assertEqual(provides, [("task", "task_id", 'a"b')])
+        self.assertEqual(requires, [])
+
+        provides, requires = ingest.plan_key_dependencies(
+            relation_insert(("project", "project_id", "p1"), ("task", "task_id", "t1"), "project_has_task")
+        )
+        self.assertEqual(provides, [])
+        self.assertEqual(requires, [("project", "project_id", "p1"), ("task", "task_id", "t1")])
+
+    def test_writer_levels_ops_by_dependency_and_rotates_batches(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            writer = ingest.PlanWriter(root, "run-1", batch_ops=2)
+            writer.begin_collection("automation_tasks")
+            for key in ("t1", "t2", "t3"):
+                writer.record([entity_insert("task", "task_id", key)])
+            writer.record([relation_insert(("project", "project_id", "p1"), ("task", "task_id", "t1"), "project_has_task")])
+            writer.begin_collection("automation_voice_bot_messages")
+            writer.record(
+                [
+                    "match $m isa voice_message, has voice_message_id \"m1\"; "
+                    "insert $c isa transcript_chunk, has transcript_chunk_id \"m1:0\"; "
+                    "(voice_message: $m, transcript_chunk: $c) isa voice_message_chunked_as_transcript_chunk;"
+                ]
+            )
+            writer.record([relation_insert(("transcript_chunk", "transcript_chunk_id", "m1:0"), ("task", "task_id", "t2"), "chunk_mentions_task")])
+            manifest = writer.close(schema_path="schema.tql")
+
+            self.assertEqual(manifest["format"], ingest.PLAN_FORMAT)
+            self.assertEqual([phase["name"] for phase in manifest["phases"]], ["entities", "relations", "relations-2"])
+            self.assertEqual([phase["ops"] for phase in manifest["phases"]], [3, 2, 1])
+            self.assertEqual(manifest["collections"], ["automation_tasks", "automation_voice_bot_messages"])
+            self.assertEqual(manifest["ops_total"], 6)
+            # project p1 and voice_message m1 are never inserted by this plan.
+            self.assertEqual(manifest["unresolved_requires"], 2)
+
+            entity_batches = manifest["phases"][0]["batches"]
+            self.assertEqual([batch["ops"] for batch in entity_batches], [2, 1])
+            self.assertEqual(
+                [op["provides"] for batch in entity_batches for op in read_batch(root, batch["path"])],
+                [[["task", "task_id", "t1"]], [["task", "task_id", "t2"]], [["task", "task_id", "t3"]]],
+            )
+            dependent = read_batch(root, manifest["phases"][2]["batches"][0]["path"])
+            self.assertEqual(dependent[0]["requires"][0], ["transcript_chunk", "transcript_chunk_id", "m1:0"])
+            self.assertEqual(json.loads((root / ingest.PLAN_MANIFEST_NAME).read_text(encoding="utf-8")), manifest)
+
+    def test_recording_driver_captures_committed_writes_and_reads_as_empty(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = ingest.PlanWriter(Path(tmp), "run-1")
+            writer.begin_collection("automation_voice_bot_messages")
+            ctx = SimpleNamespace(
+                options=SimpleNamespace(apply=True, projection_scope="full", typedb_database="plan"),
+                typedb_driver=ingest.PlanRecordingDriver(writer),
+            )
+            self.assertFalse(ingest.query_has_rows(ctx.typedb_driver, "plan", "match $x isa task; limit 1;"))
+
+            ingest.reconcile_transcript_chunks(ctx, voice_message_id="m1", chunks=[("m1:0", "hello"), ("m1:1", "world")])
+            manifest = writer.close()
+
+            self.assertEqual([phase["name"] for phase in manifest["phases"]], ["entities", "relations"])
+            entity_ops = read_batch(Path(tmp), manifest["phases"][0]["batches"][0]["path"])
+            relation_ops = read_batch(Path(tmp), manifest["phases"][1]["batches"][0]["path"])
+            # One plan op per committed transaction, queries kept together.
+            self.assertEqual([len(op["queries"]) for op in entity_ops], [2])
+            self.assertEqual([len(op["queries"]) for op in relation_ops], [2])
+            self.assertIn(["voice_message", "voice_message_id", "m1"], relation_ops[0]["requires"])
+
+
+class FakeTransaction:
+    def __init__(self, driver: "FakeDriver") -> None:
+        self._driver = driver
+        self._queries: list[str] = []
+
+    def query(self, query: str):
+        if "duplicate" in query:
+            raise RuntimeError("[CNT9] key already exists")
+        self._queries.append(query)
+        return SimpleNamespace(resolve=lambda: None)
+
+    def commit(self) -> None:
+        with self._driver.lock:
+            self._driver.commits.append(list(self._queries))
+
+    def rollback(self) -> None:
+        self._queries = []
+
+    def close(self) -> None:
+        return None
+
+
+class FakeDriver:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.commits: list[list[str]] = []
+
+    def transaction(self, database: str, tx_type) -> FakeTransaction:
+        return FakeTransaction(self)
+
+
+class RecordingDeadletter:
+    def __init__(self) -> None:
+        self.entries: list[dict] = []
+
+    def write(self, entry: dict) -> None:
+        self.entries.append(entry)
+
+
+class ApplyPlanTests(unittest.TestCase):
+    def test_apply_runs_phases_in_order_with_group_commits_and_isolates_failures(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            writer = ingest.PlanWriter(root, "run-1", batch_ops=3)
+            writer.begin_collection("automation_tasks")
+            for key in ("t1", "t2", "t3", "t4", "duplicate", "t5"):
+                writer.record([entity_insert("task", "task_id", key)])
+            for key in ("t1", "t2", "t3"):
+                writer.record([relation_insert(("project", "project_id", "p1"), ("task", "task_id", key), "project_has_task")])
+            manifest = writer.close()
+
+            driver = FakeDriver()
+            deadletter = RecordingDeadletter()
+            total = apply_plan_module.apply_plan(
+                driver, "scratch", root, manifest, writers=4, group_ops=2, deadletter=deadletter
+            )
+
+            self.assertEqual((total.ops, total.applied, total.skipped, total.failed), (9, 8, 1, 0))
+            self.assertEqual(total.group_fallbacks, 1)
+            self.assertEqual(deadletter.entries, [])
+            committed = [query for commit in driver.commits for query in commit]
+            last_entity = max(index for index, query in enumerate(committed) if query.startswith("insert"))
+            first_relation = min(index for index, query in enumerate(committed) if query.startswith("match"))
+            self.assertLess(last_entity, first_relation)
+            self.assertTrue(any(len(commit) == 2 for commit in driver.commits))
+
+
+if __name__ == "__main__":
+    unittest.main()
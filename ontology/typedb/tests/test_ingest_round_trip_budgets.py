@@ -0,0 +1,473 @@
+from __future__ import annotations
+
+import contextlib
+import importlib.util
+import io
+import re
+import sys
+import time
+import unittest
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+
+ROOT = Path(__file__).resolve().parents[1]
+INGEST_PATH = ROOT / "scripts" / "typedb-ontology-ingest.py"
+
+spec = importlib.util.spec_from_file_location("typedb_ontology_ingest_round_trip_test_module", INGEST_PATH)
+if spec is None or spec.loader is None:
+    raise RuntimeError(f"Cannot load module from {INGEST_PATH}")
+ingest = importlib.util.module_from_spec(spec)
+sys.modules["typedb_ontology_ingest_round_trip_test_module"] = ingest
+spec.loader.exec_module(ingest)
+
+UPDATED_AT = datetime(2026, 3, 15, 7, 0, 0)
+CREATED_AT = datetime(2026, 3, 1, 7, 0, 0)
+UPDATED_AT_INDEX_RE = re.compile(r"^match \$e isa ([a-z0-9_]+), has ([a-z0-9_]+) \$key, has updated_at \$updated_at;$")
+
+
+class FakeAttribute:
+    def __init__(self, value: Any) -> None:
+        self._value = value
+
+    def is_datetime(self) -> bool:
+        return isinstance(self._value, datetime)
+
+    def get_datetime(self) -> str:
+        return self._value.isoformat()
+
+    def is_date(self) -> bool:
+        return False
+
+    def is_string(self) -> bool:
+        return isinstance(self._value, str)
+
+    def get_string(self) -> str:
+        return self._value
+
+    def is_integer(self) -> bool:
+        return False
+
+    def is_double(self) -> bool:
+        return False
+
+    def is_decimal(self) -> bool:
+        return False
+
+    def is_boolean(self) -> bool:
+        return False
+
+
+class FakeConcept:
+    def __init__(self, value: Any) -> None:
+        self._value = value
+
+    def is_attribute(self) -> bool:
+        return True
+
+    def as_attribute(self) -> FakeAttribute:
+        return FakeAttribute(self._value)
+
+    def is_value(self) -> bool:
+        return False
+
+
+class FakeRow:
+    def __init__(self, values: dict[str, Any]) -> None:
+        self._values = values
+
+    def column_names(self) -> list[str]:
+        return list(self._values)
+
+    def get(self, column: str) -> Optional[FakeConcept]:
+        if column not in self._values:
+            return None
+        return FakeConcept(self._values[column])
+
+
+class FakeAnswer:
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self._rows = rows
+
+    def is_concept_rows(self) -> bool:
+        return True
+
+    def as_concept_rows(self) -> "FakeAnswer":
+        return self
+
+    @property
+    def iterator(self):
+        return iter(FakeRow(row) for row in self._rows)
+
+
+class FakePromise:
+    def __init__(self, answer: FakeAnswer) -> None:
+        self._answer = answer
+
+    def resolve(self) -> FakeAnswer:
+        return self._answer
+
+
+@dataclass
+class RoundTripCost:
+    reads: int = 0
+    writes: int = 0
+    statements: int = 0
+
+    def __sub__(self, other: "RoundTripCost") -> "RoundTripCost":
+        return RoundTripCost(
+            reads=self.reads - other.reads,
+            writes=self.writes - other.writes,
+            statements=self.statements - other.statements,
+        )
+
+
+@dataclass
+class RoundTripAccountant:
+    """Counts TypeDB round-trips and splits them per processed Mongo document."""
+
+    totals: RoundTripCost = field(default_factory=RoundTripCost)
+    per_doc: list[RoundTripCost] = field(default_factory=list)
+
+    def snapshot(self) -> RoundTripCost:
+        return RoundTripCost(self.totals.reads, self.totals.writes, self.totals.statements)
+
+    def warmup(self) -> RoundTripCost:
+        return self.per_doc[0] if self.per_doc else RoundTripCost()
+
+    def steady_state(self) -> RoundTripCost:
+        # First document pays for per-collection index loads; later ones show the real per-doc price.
+        tail = self.per_doc[1:]
+        if not tail:
+            return RoundTripCost()
+        return RoundTripCost(
+            reads=max(item.reads for item in tail),
+            writes=max(item.writes for item in tail),
+            statements=max(item.statements for item in tail),
+        )
+
+
+class RecordingTransaction:
+    def __init__(self, driver: "RecordingDriver", tx_type: Any) -> None:
+        self._driver = driver
+        self._tx_type = tx_type
+
+    def query(self, query: str) -> FakePromise:
+        if self._tx_type == ingest.TransactionType.WRITE:
+            self._driver.accountant.totals.statements += 1
+            return FakePromise(FakeAnswer([]))
+        return FakePromise(FakeAnswer(self._driver.respond(query)))
+
+    def commit(self) -> None:
+        return None
+
+    def rollback(self) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+
+class RecordingDriver:
+    """TypeDB driver stand-in: READ answers come from a seeded key/updated_at view, WRITEs are only counted."""
+
+    def __init__(self, accountant: RoundTripAccountant, *, seeded: bool) -> None:
+        self.accountant = accountant
+        self.seeded = seeded
+
+    def transaction(self, _database: str, tx_type: Any) -> RecordingTransaction:
+        if tx_type == ingest.TransactionType.READ:
+            self.accountant.totals.reads += 1
+        elif tx_type == ingest.TransactionType.WRITE:
+            self.accountant.totals.writes += 1
+        return RecordingTransaction(self, tx_type)
+
+    def respond(self, query: str) -> list[dict[str, Any]]:
+        if not self.seeded:
+            return []
+        index_match = UPDATED_AT_INDEX_RE.match(query.strip())
+        if index_match:
+            return [{"key": key, "updated_at": UPDATED_AT} for key in SEEDED_KEYS.get(index_match.group(1), [])]
+        if " get $left_key, $right_key;" in query:
+            return []
+        return [{"hit": "1"}]
+
+
+class FakeCursor:
+    def __init__(self, docs: list[dict[str, Any]]) -> None:
+        self._docs = docs
+
+    def sort(self, *_args: Any) -> "FakeCursor":
+        return self
+
+    def limit(self, count: int) -> "FakeCursor":
+        return FakeCursor(self._docs[:count])
+
+    def __iter__(self):
+        return iter(self._docs)
+
+
+class FakeCollection:
+    def __init__(self, docs: list[dict[str, Any]]) -> None:
+        self._docs = docs
+
+    def find(self, _query: dict[str, Any], _projection: Optional[dict[str, int]] = None) -> FakeCursor:
+        return FakeCursor(self._docs)
+
+
+class FakeDb(dict):
+    def __missing__(self, key: str) -> FakeCollection:
+        return FakeCollection([])
+
+
+class NullDeadletter:
+    path = Path("/dev/null")
+
+    def write(self, _entry: dict[str, Any]) -> None:
+        return None
+
+
+def session_doc(index: int) -> dict[str, Any]:
+    return {
+        "_id": f"session-{index}",
+        "project_id": "project-1",
+        "session_name": f"Session {index}",
+        "is_active": False,
+        "created_at": CREATED_AT,
+        "updated_at": UPDATED_AT,
+    }
+
+
+def message_doc(index: int) -> dict[str, Any]:
+    return {
+        "_id": f"message-{index}",
+        "session_id": "session-1",
+        "message_type": "voice",
+        "text": f"message {index}",
+        "created_at": CREATED_AT,
+        "updated_at": UPDATED_AT,
+    }
+
+
+def task_doc(index: int) -> dict[str, Any]:
+    return {
+        "_id": f"task-{index}",
+        "id": f"task-{index}",
+        "name": f"Task {index}",
+        "project_id": "project-1",
+        "task_status": "Draft",
+        "created_at": CREATED_AT,
+        "updated_at": UPDATED_AT,
+    }
+
+
+DOC_COUNT = 4
+SEEDED_KEYS: dict[str, list[str]] = {
+    "voice_session": [f"session-{index}" for index in range(DOC_COUNT)],
+    "voice_message": [f"message-{index}" for index in range(DOC_COUNT)],
+    "task": [f"task-{index}" for index in range(DOC_COUNT)],
+}
+
+SCHEMA_METADATA = ingest.parse_schema_metadata(ingest.DEFAULT_SCHEMA_PATH, cache_dir=None)
+MAPPING_BY_COLLECTION = ingest.load_mapping_by_collection(ingest.DEFAULT_MAPPING_PATH)
+
+
+def build_options(*, sync_mode: str, projection_scope: str, assume_empty_db: bool) -> Any:
+    return ingest.CliOptions(
+        apply=True,
+        init_schema=False,
+        sync_mode=sync_mode,
+        projection_scope=projection_scope,
+        run_id="round-trip-test",
+        limit=None,
+        collections=[],
+        deadletter_path=Path("/dev/null"),
+        sync_state_path=Path("/dev/null"),
+        reset_sync_state=False,
+        skip_sync_state_write=True,
+        heartbeat_docs=0,
+        heartbeat_seconds=0,
+        skip_session_derived_projections=False,
+        assume_empty_db=assume_empty_db,
+        typedb_addresses=["127.0.0.1:1729"],
+        typedb_primary_address="127.0.0.1:1729",
+        typedb_username="admin",
+        typedb_password="password",
+        typedb_tls_enabled=False,
+        typedb_database="round_trip_test",
+        schema_path=ingest.DEFAULT_SCHEMA_PATH,
+        mapping_path=ingest.DEFAULT_MAPPING_PATH,
+    )
+
+
+def run_ingester(
+    ingester: Callable[[Any], Any],
+    collection: str,
+    docs: list[dict[str, Any]],
+    *,
+    sync_mode: str = "full",
+    projection_scope: str = "full",
+    assume_empty_db: bool = False,
+    seeded: bool = False,
+) -> RoundTripAccountant:
+    accountant = RoundTripAccountant()
+    schema_attr_types, entity_owned_attrs, relation_roles, entity_relation_roles = SCHEMA_METADATA
+    ctx = ingest.IngestContext(
+        db=FakeDb({collection: FakeCollection(docs)}),
+        typedb_driver=RecordingDriver(accountant, seeded=seeded),
+        options=build_options(sync_mode=sync_mode, projection_scope=projection_scope, assume_empty_db=assume_empty_db),
+        deadletter=NullDeadletter(),
+        mapping_by_collection=MAPPING_BY_COLLECTION,
+        schema_attr_types=schema_attr_types,
+        entity_owned_attrs=entity_owned_attrs,
+        relation_roles=relation_roles,
+        entity_relation_roles=entity_relation_roles,
+        sync_state={"collections": {}},
+        run_started_at=time.time(),
+    )
+    original_for_each_doc = ingest.for_each_doc
+
+    def accounted_for_each_doc(_ctx, _collection, handler, projection=None):
+        def accounted_handler(doc, stats):
+            before = accountant.snapshot()
+            handler(doc, stats)
+            accountant.per_doc.append(accountant.snapshot() - before)
+
+        return original_for_each_doc(_ctx, _collection, accounted_handler, projection=projection)
+
+    ingest.for_each_doc = accounted_for_each_doc
+    ingest.VOICE_SESSION_PROJECT_CACHE.clear()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            ingester(ctx)
+    finally:
+        ingest.for_each_doc = original_for_each_doc
+    return accountant
+
+
+MODES: dict[str, dict[str, Any]] = {
+    "full": {"sync_mode": "full", "projection_scope": "full"},
+    "incremental": {"sync_mode": "incremental", "projection_scope": "full"},
+    "core": {"sync_mode": "incremental", "projection_scope": "core"},
+    "derived": {"sync_mode": "incremental", "projection_scope": "derived"},
+    "assume-empty": {"sync_mode": "full", "projection_scope": "full", "assume_empty_db": True},
+}
+
+INGESTERS: dict[str, tuple[Callable[[Any], Any], str, Callable[[int], dict[str, Any]]]] = {
+    "voice_session": (ingest.ingest_voice_sessions, "automation_voice_bot_sessions", session_doc),
+    "voice_message": (ingest.ingest_voice_messages, "automation_voice_bot_messages", message_doc),
+    "task": (
+        lambda ctx: ingest.ingest_collection_from_mapping(ctx, "automation_tasks"),
+        "automation_tasks",
+        task_doc,
+    ),
+}
+
+# Steady-state per-document budgets: (ingester, mode, db state) -> max (reads, writes, statements).
+# Raising a number here is a deliberate performance decision and should be called out in review.
+BUDGETS: dict[tuple[str, str, str], RoundTripCost] = {
+    ("voice_session", "full", "new"): RoundTripCost(reads=4, writes=4, statements=4),
+    ("voice_session", "full", "unchanged"): RoundTripCost(reads=3, writes=3, statements=12),
+    ("voice_session", "incremental", "new"): RoundTripCost(reads=6, writes=4, statements=4),
+    ("voice_session", "incremental", "unchanged"): RoundTripCost(reads=3, writes=3, statements=12),
+    ("voice_session", "core", "new"): RoundTripCost(reads=4, writes=2, statements=2),
+    ("voice_session", "core", "unchanged"): RoundTripCost(reads=1, writes=0, statements=0),
+    ("voice_session", "derived", "new"): RoundTripCost(reads=2, writes=2, statements=2),
+    ("voice_session", "derived", "unchanged"): RoundTripCost(reads=2, writes=3, statements=12),
+    ("voice_session", "assume-empty", "new"): RoundTripCost(reads=0, writes=3, statements=3),
+    ("voice_message", "full", "new"): RoundTripCost(reads=5, writes=5, statements=5),
+    ("voice_message", "full", "unchanged"): RoundTripCost(reads=4, writes=5, statements=18),
+    ("voice_message", "incremental", "new"): RoundTripCost(reads=8, writes=5, statements=5),
+    ("voice_message", "incremental", "unchanged"): RoundTripCost(reads=5, writes=6, statements=19),
+    ("voice_message", "core", "new"): RoundTripCost(reads=4, writes=2, statements=2),
+    ("voice_message", "core", "unchanged"): RoundTripCost(reads=1, writes=0, statements=0),
+    ("voice_message", "derived", "new"): RoundTripCost(reads=11, writes=3, statements=3),
+    ("voice_message", "derived", "unchanged"): RoundTripCost(reads=11, writes=14, statements=14),
+    ("voice_message", "assume-empty", "new"): RoundTripCost(reads=0, writes=3, statements=3),
+    ("task", "full", "new"): RoundTripCost(reads=5, writes=3, statements=3),
+    ("task", "full", "unchanged"): RoundTripCost(reads=2, writes=0, statements=0),
+    ("task", "incremental", "new"): RoundTripCost(reads=6, writes=3, statements=3),
+    ("task", "incremental", "unchanged"): RoundTripCost(reads=2, writes=0, statements=0),
+    ("task", "core", "new"): RoundTripCost(reads=6, writes=3, statements=3),
+    ("task", "core", "unchanged"): RoundTripCost(reads=2, writes=0, statements=0),
+    ("task", "derived", "new"): RoundTripCost(reads=6, writes=3, statements=3),
+    ("task", "derived", "unchanged"): RoundTripCost(reads=2, writes=0, statements=0),
+    ("task", "assume-empty", "new"): RoundTripCost(reads=2, writes=2, statements=2),
+}
+
+# One-time per-collection cost paid by the first document (updated_at/relation index loads, dictionary upserts).
+WARMUP_ALLOWANCE = RoundTripCost(reads=2, writes=1, statements=4)
+
+
+def within(cost: RoundTripCost, budget: RoundTripCost) -> bool:
+    return cost.reads <= budget.reads and cost.writes <= budget.writes and cost.statements <= budget.statements
+
+
+class IngestRoundTripBudgetTest(unittest.TestCase):
+    def test_budget_table_covers_every_ingester_and_mode(self) -> None:
+        for ingester_name in INGESTERS:
+            for mode in MODES:
+                states = ["new"] if mode == "assume-empty" else ["new", "unchanged"]
+                for state in states:
+                    self.assertIn((ingester_name, mode, state), BUDGETS)
+
+    def test_per_document_round_trips_stay_within_budget(self) -> None:
+        for (ingester_name, mode, state), budget in BUDGETS.items():
+            ingester, collection, make_doc = INGESTERS[ingester_name]
+            with self.subTest(ingester=ingester_name, mode=mode, state=state):
+                ledger = run_ingester(
+                    ingester,
+                    collection,
+                    [make_doc(index) for index in range(DOC_COUNT)],
+                    seeded=state == "unchanged",
+                    **MODES[mode],
+                )
+                self.assertEqual(len(ledger.per_doc), DOC_COUNT)
+                steady = ledger.steady_state()
+                self.assertTrue(within(steady, budget), f"steady-state {steady} exceeds budget {budget}")
+                warmup_budget = RoundTripCost(
+                    reads=budget.reads + WARMUP_ALLOWANCE.reads,
+                    writes=budget.writes + WARMUP_ALLOWANCE.writes,
+                    statements=budget.statements + WARMUP_ALLOWANCE.statements,
+                )
+                warmup = ledger.warmup()
+                self.assertTrue(within(warmup, warmup_budget), f"warm-up {warmup} exceeds budget {warmup_budget}")
+
+    def test_unchanged_voice_session_in_incremental_core_is_read_only(self) -> None:
+        ingester, collection, make_doc = INGESTERS["voice_session"]
+        ledger = run_ingester(
+            ingester,
+            collection,
+            [make_doc(index) for index in range(DOC_COUNT)],
+            seeded=True,
+            **MODES["core"],
+        )
+        self.assertEqual(ledger.totals.writes, 0)
+        self.assertLessEqual(ledger.steady_state().reads, 1)
+
+    def test_added_per_document_probe_breaks_the_budget(self) -> None:
+        ingester, collection, make_doc = INGESTERS["voice_session"]
+        original_match = ingest.entity_has_matching_updated_at
+
+        def probing_match(ctx, **kwargs):
+            exists_query = f"match $x isa voice_session, has voice_session_id {ingest.lit_string(kwargs['key_value'])}; limit 1;"
+            ingest.query_has_rows(ctx.typedb_driver, ctx.options.typedb_database, exists_query)
+            return original_match(ctx, **kwargs)
+
+        ingest.entity_has_matching_updated_at = probing_match
+        try:
+            ledger = run_ingester(
+                ingester,
+                collection,
+                [make_doc(index) for index in range(DOC_COUNT)],
+                seeded=True,
+                **MODES["core"],
+            )
+        finally:
+            ingest.entity_has_matching_updated_at = original_match
+        self.assertFalse(within(ledger.steady_state(), BUDGETS[("voice_session", "core", "unchanged")]))
+
+if __name__ == "__main__":
+    unittest.main()
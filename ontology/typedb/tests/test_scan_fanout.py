@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import contextlib
+import importlib.util
+import io
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+from bson import ObjectId
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SCAN_ALL_PATH = ROOT / "scripts" / "typedb-ontology-scan-all.py"
+
+spec = importlib.util.spec_from_file_location("typedb_ontology_scan_all_test_module", SCAN_ALL_PATH)
+if spec is None or spec.loader is None:
+    raise RuntimeError(f"Cannot load module from {SCAN_ALL_PATH}")
+scan_all = importlib.util.module_from_spec(spec)
+sys.modules["typedb_ontology_scan_all_test_module"] = scan_all
+spec.loader.exec_module(scan_all)
+
+ingest = scan_all.ingest
+contract_check = scan_all.contract_check
+domain_inventory = scan_all.domain_inventory
+entity_sampling = scan_all.entity_sampling
+MAPPING_BY_COLLECTION = ingest.load_mapping_by_collection(ingest.DEFAULT_MAPPING_PATH)
+
+TASK_DOCS = [
+    {"_id": ObjectId(), "task_status": "Ready", "priority": "P1", "project_id": ObjectId(), "source_ref": "x"},
+    {"_id": ObjectId(), "task_status": "Ready", "priority": "\U0001F525 P2", "name": "Two"},
+    {"_id": ObjectId(), "task_status": "Done", "performer_id": 7},
+]
+
+
+class FakeCursor:
+    def __init__(self, docs: list[dict]) -> None:
+        self._docs = docs
+
+    def sort(self, field_name: str, direction: int) -> "FakeCursor":
+        return FakeCursor(sorted(self._docs, key=lambda doc: doc[field_name], reverse=direction < 0))
+
+    def limit(self, value: int) -> "FakeCursor":
+        return FakeCursor(self._docs[:value])
+
+    def __iter__(self):
+        return iter(self._docs)
+
+
+class FakeCollection:
+    def __init__(self, docs: list[dict]) -> None:
+        self.docs = docs
+        self.finds: list[tuple[dict, object]] = []
+
+    def find(self, query: dict, projection: object = None) -> FakeCursor:
+        self.finds.append((query, projection))
+        return FakeCursor(self.docs)
+
+
+class FieldConsumer:
+    def __init__(self, collection: str, fields: list[str] | None) -> None:
+        self.collection = collection
+        self.fields = fields
+        self.seen: list[dict] = []
+
+    def wants(self, collection: str) -> bool:
+        return collection == self.collection
+
+    def projection_fields(self, collection: str):
+        return self.fields
+
+    def begin(self, collection: str) -> None:
+        self.seen = []
+
+    def observe(self, collection: str, doc: dict) -> None:
+        self.seen.append(doc)
+
+    def end(self, collection: str) -> None:
+        return None
+
+
+def fanout_ctx(db: dict, consumers: list) -> SimpleNamespace:
+    return SimpleNamespace(
+        db=db,
+        options=SimpleNamespace(sync_mode="full", limit=None, heartbeat_docs=0, heartbeat_seconds=0, run_id="r"),
+        sync_state={"collections": {}},
+        run_started_at=0.0,
+        scan_consumers=consumers,
+    )
+
+
+class ScanFanoutTests(unittest.TestCase):
+    def test_projection_is_the_union_of_consumer_needs(self) -> None:
+        fake = FakeCollection(TASK_DOCS)
+        handled: list[dict] = []
+        narrow = FieldConsumer("automation_tasks", ["task_status"])
+        other = FieldConsumer("automation_projects", None)
+        ctx = fanout_ctx({"automation_tasks": fake}, [narrow, other])
+        with contextlib.redirect_stdout(io.StringIO()):
+            ingest.for_each_doc(ctx, "automation_tasks", lambda doc, stats: handled.append(doc), projection={"_id": 1})
+        self.assertEqual(fake.finds, [({}, {"_id": 1, "task_status": 1})])
+        self.assertEqual(len(handled), 3)
+        self.assertEqual(narrow.seen, handled)
+        self.assertEqual(other.seen, [])
+
+        whole = FieldConsumer("automation_tasks", None)
+        ctx.scan_consumers = [narrow, whole]
+        with contextlib.redirect_stdout(io.StringIO()):
+            ingest.for_each_doc(ctx, "automation_tasks", lambda doc, stats: None, projection={"_id": 1})
+        self.assertIsNone(fake.finds[-1][1])
+
+    def test_scan_collection_once_skips_collections_nobody_wants(self) -> None:
+        db = {"automation_tasks": FakeCollection(TASK_DOCS)}
+        consumer = FieldConsumer("automation_tasks", ["priority"])
+        self.assertEqual(ingest.scan_collection_once(db, "automation_projects", [consumer]), 0)
+        self.assertEqual(ingest.scan_collection_once(db, "automation_tasks", [consumer], limit=2), 2)
+        self.assertEqual(db["automation_tasks"].finds, [({}, {"_id": 1, "priority": 1})])
+
+    def test_consumers_match_the_standalone_tools(self) -> None:
+        contract = contract_check.ContractScanConsumer(MAPPING_BY_COLLECTION, ["automation_tasks"])
+        mapping = {"collections": [{"collection": "automation_tasks", **MAPPING_BY_COLLECTION["automation_tasks"]}]}
+        inventory_args = domain_inventory.parse_args([])
+        planned = domain_inventory.plan_inventory(inventory_args, mapping, {"status": {"inventory": "inspect"}})
+        inventory = domain_inventory.ValueCountConsumer(planned)
+        sampler = entity_sampling.LatestDocsConsumer(["automation_tasks"], 2)
+        db = {"automation_tasks": FakeCollection(TASK_DOCS)}
+
+        scanned = ingest.scan_collection_once(db, "automation_tasks", [contract, inventory, sampler])
+        self.assertEqual(scanned, 3)
+        self.assertEqual(len(db["automation_tasks"].finds), 1)
+        # The sampler needs whole documents, so the shared pass drops the projection.
+        self.assertIsNone(db["automation_tasks"].finds[0][1])
+
+        standalone = contract_check.scan_collection_python(
+            {"automation_tasks": FakeCollection(TASK_DOCS)}, "automation_tasks", MAPPING_BY_COLLECTION["automation_tasks"], None
+        )
+        self.assertEqual(contract.scan("automation_tasks"), standalone)
+        self.assertEqual(
+            inventory.value_counts("automation_tasks"),
+            {"task_status": [{"_id": "Ready", "count": 2}, {"_id": "Done", "count": 1}]},
+        )
+        total, latest = sampler.latest("automation_tasks")
+        self.assertEqual(total, 3)
+        self.assertEqual([doc["_id"] for doc in latest], [TASK_DOCS[2]["_id"], TASK_DOCS[1]["_id"]])
+
+    def test_driver_only_rescans_collections_ingest_did_not_pass(self) -> None:
+        log = scan_all.PassLog()
+        log.begin("automation_tasks")
+        consumers = [FieldConsumer("automation_tasks", []), FieldConsumer("automation_projects", [])]
+        self.assertEqual(
+            scan_all.remaining_collections(["automation_tasks", "automation_projects", "finops_fx_rates"], consumers, log.passes),
+            ["automation_projects"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import importlib.util
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+INGEST_PATH = ROOT / "scripts" / "typedb-ontology-ingest.py"
+
+spec = importlib.util.spec_from_file_location("typedb_ontology_ingest_schema_cache_test_module", INGEST_PATH)
+if spec is None or spec.loader is None:
+    raise RuntimeError(f"Cannot load module from {INGEST_PATH}")
+ingest = importlib.util.module_from_spec(spec)
+sys.modules["typedb_ontology_ingest_schema_cache_test_module"] = ingest
+spec.loader.exec_module(ingest)
+
+
+class SchemaMetadataCacheTests(unittest.TestCase):
+    def test_cached_metadata_round_trips_and_skips_parsing(self) -> None:
+        expected = ingest.parse_schema_metadata(ingest.DEFAULT_SCHEMA_PATH, cache_dir=None)
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_dir = Path(tmp)
+            first = ingest.parse_schema_metadata(ingest.DEFAULT_SCHEMA_PATH, cache_dir=cache_dir)
+            self.assertEqual(first, expected)
+            self.assertEqual(len(list(cache_dir.glob("schema-metadata-*.json"))), 1)
+
+            original = ingest.parse_schema_metadata_text
+
+            def fail_parse(text: str):
+                raise AssertionError("schema should be served from cache")
+
+            ingest.parse_schema_metadata_text = fail_parse
+            try:
+                second = ingest.parse_schema_metadata(ingest.DEFAULT_SCHEMA_PATH, cache_dir=cache_dir)
+            finally:
+                ingest.parse_schema_metadata_text = original
+            self.assertEqual(second, expected)
+
+    def test_schema_change_invalidates_and_prunes_stale_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_dir = Path(tmp) / "cache"
+            schema_path = Path(tmp) / "schema.tql"
+            schema_path.write_text("define\nattribute a_id, value string;\nentity a,\n  owns a_id @key;\n", encoding="utf-8")
+            attr_types, owned, _, _ = ingest.parse_schema_metadata(schema_path, cache_dir=cache_dir)
+            self.assertEqual((attr_types, owned), ({"a_id": "string"}, {"a": {"a_id"}}))
+
+            schema_path.write_text(
+                "define\nattribute a_id, value string;\nattribute note, value string;\nentity a,\n  owns a_id @key,\n  owns note;\n",
+                encoding="utf-8",
+            )
+            attr_types, owned, _, _ = ingest.parse_schema_metadata(schema_path, cache_dir=cache_dir)
+            self.assertEqual(owned, {"a": {"a_id", "note"}})
+            self.assertIn("note", attr_types)
+            self.assertEqual(len(list(cache_dir.glob("schema-metadata-*.json"))), 1)
+
+
+class SchemaBuildSkipTests(unittest.TestCase):
+    def test_build_runs_only_when_inputs_or_output_change(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_root = Path(tmp)
+            fragments = tmp_root / "fragments"
+            shutil.copytree(ingest.SCHEMA_FRAGMENTS_ROOT / "00-kernel", fragments / "00-kernel")
+            schema_path = tmp_root / "str-ontology.tql"
+            schema_path.write_text("define\n", encoding="utf-8")
+            cache_dir = tmp_root / "cache"
+            builds: list[list[str]] = []
+
+            original_root = ingest.SCHEMA_FRAGMENTS_ROOT
+            original_run = ingest.subprocess.run
+            ingest.SCHEMA_FRAGMENTS_ROOT = fragments
+            ingest.subprocess.run = lambda args, check: builds.append(args)
+            try:
+                ingest.maybe_build_generated_schema(schema_path, cache_dir=cache_dir)
+                ingest.maybe_build_generated_schema(schema_path, cache_dir=cache_dir)
+                self.assertEqual(len(builds), 1)
+
+                fragment = sorted((fragments / "00-kernel").glob("*.tql"))[0]
+                fragment.write_text(fragment.read_text(encoding="utf-8") + "\n# edited\n", encoding="utf-8")
+                ingest.maybe_build_generated_schema(schema_path, cache_dir=cache_dir)
+                self.assertEqual(len(builds), 2)
+
+                schema_path.write_text("define\n# hand edit\n", encoding="utf-8")
+                ingest.maybe_build_generated_schema(schema_path, cache_dir=cache_dir)
+                self.assertEqual(len(builds), 3)
+                ingest.maybe_build_generated_schema(schema_path, cache_dir=cache_dir)
+                self.assertEqual(len(builds), 3)
+            finally:
+                ingest.SCHEMA_FRAGMENTS_ROOT = original_root
+                ingest.subprocess.run = original_run
+
+    def test_rebuild_keeps_the_recorded_sketch_source(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_root = Path(tmp)
+            fragments = tmp_root / "fragments"
+            shutil.copytree(ingest.SCHEMA_FRAGMENTS_ROOT / "00-kernel", fragments / "00-kernel")
+            schema_path = tmp_root / "str-ontology.tql"
+            schema_path.write_text("define\n", encoding="utf-8")
+            sketch_path = tmp_root / "sketches.json"
+            sketch_path.write_text('{"collections": {}}', encoding="utf-8")
+            cache_dir = tmp_root / "cache"
+            cache_dir.mkdir()
+            # What build-typedb-schema.py --domain-sketches leaves behind.
+            (cache_dir / ingest.SCHEMA_BUILD_MANIFEST_NAME).write_text(
+                '{"domain_sketches": "%s"}' % sketch_path.as_posix(), encoding="utf-8"
+            )
+            builds: list[list[str]] = []
+
+            original_root = ingest.SCHEMA_FRAGMENTS_ROOT
+            original_run = ingest.subprocess.run
+            ingest.SCHEMA_FRAGMENTS_ROOT = fragments
+            ingest.subprocess.run = lambda args, check: builds.append(args)
+            try:
+                ingest.maybe_build_generated_schema(schema_path, cache_dir=cache_dir)
+                ingest.maybe_build_generated_schema(schema_path, cache_dir=cache_dir)
+                self.assertEqual(len(builds), 1)
+                self.assertEqual(builds[0][-2:], ["--domain-sketches", str(sketch_path)])
+
+                sketch_path.write_text('{"collections": {"automation_tasks": {}}}', encoding="utf-8")
+                ingest.maybe_build_generated_schema(schema_path, cache_dir=cache_dir)
+                self.assertEqual(len(builds), 2)
+                self.assertEqual(builds[1][-2:], ["--domain-sketches", str(sketch_path)])
+            finally:
+                ingest.SCHEMA_FRAGMENTS_ROOT = original_root
+                ingest.subprocess.run = original_run
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import contextlib
+import importlib.util
+import io
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+INGEST_PATH = ROOT / "scripts" / "typedb-ontology-ingest.py"
+GENERATED_SCHEMA_PATH = ROOT / "schema" / "str-ontology.tql"
+
+spec = importlib.util.spec_from_file_location("typedb_ontology_ingest_schema_delta_test_module", INGEST_PATH)
+if spec is None or spec.loader is None:
+    raise RuntimeError(f"Cannot load module from {INGEST_PATH}")
+ingest = importlib.util.module_from_spec(spec)
+sys.modules["typedb_ontology_ingest_schema_delta_test_module"] = ingest
+spec.loader.exec_module(ingest)
+
+
+GENERATED = """define
+
+# @toon inventory=inspect domain=state max_values=10
+attribute activity_state, value string;
+attribute client_id, value string;
+attribute name, value string;
+attribute note, value string;
+
+entity client,
+  owns client_id @key,
+  owns name,
+  owns note,
+  owns activity_state @values("active", "inactive", "unknown"),
+  plays client_owns_project:owner_client;
+
+relation client_owns_project,
+  relates owner_client,
+  relates owned_project;
+"""
+
+# Same schema as the server renders it, minus `note` and with a stale @values domain.
+LIVE = """define
+  attribute activity_state, value string;
+  attribute client_id, value string;
+  attribute name, value string;
+  attribute legacy_flag, value boolean;
+  entity client, owns client_id @key, owns name, owns activity_state @values("active", "inactive"),
+    plays client_owns_project:owner_client;
+  relation client_owns_project, relates owner_client, relates owned_project;
+"""
+
+
+class FakeDatabase:
+    def __init__(self, type_schema: str) -> None:
+        self._type_schema = type_schema
+
+    def type_schema(self) -> str:
+        return self._type_schema
+
+
+class FakeDatabases:
+    def __init__(self, type_schema: str) -> None:
+        self._database = FakeDatabase(type_schema)
+
+    def get(self, name: str) -> FakeDatabase:
+        return self._database
+
+
+class FakeTransaction:
+    def __init__(self, log: list[tuple[object, str]], tx_type: object) -> None:
+        self._log = log
+        self._tx_type = tx_type
+
+    def query(self, query: str):
+        self._log.append((self._tx_type, query))
+        return self
+
+    def resolve(self) -> None:
+        return None
+
+    def commit(self) -> None:
+        return None
+
+    def rollback(self) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+
+class FakeDriver:
+    def __init__(self, type_schema: str) -> None:
+        self.databases = FakeDatabases(type_schema)
+        self.queries: list[tuple[object, str]] = []
+
+    def transaction(self, database: str, tx_type: object) -> FakeTransaction:
+        return FakeTransaction(self.queries, tx_type)
+
+
+class SchemaDeltaTests(unittest.TestCase):
+    def test_generated_schema_has_no_delta_against_itself(self) -> None:
+        text = GENERATED_SCHEMA_PATH.read_text(encoding="utf-8")
+        declarations = ingest.schema_declarations(text)
+        _, _, relation_roles, _ = ingest.parse_schema_metadata(GENERATED_SCHEMA_PATH, cache_dir=None)
+        self.assertEqual(
+            sum(1 for key in declarations if key[0] == "relates"),
+            sum(len(roles) for roles in relation_roles.values()),
+        )
+        delta = ingest.diff_schema(text, text)
+        self.assertEqual((delta.missing, delta.changed, delta.extra), ([], [], []))
+
+    def test_diff_reports_missing_changed_and_live_only_declarations(self) -> None:
+        delta = ingest.diff_schema(LIVE, GENERATED)
+        self.assertEqual(delta.missing, ["attribute note, value string", "entity client, owns note"])
+        self.assertEqual(
+            delta.changed,
+            [
+                (
+                    'entity client, owns activity_state @values("active", "inactive")',
+                    'entity client, owns activity_state @values("active", "inactive", "unknown")',
+                )
+            ],
+        )
+        self.assertEqual(delta.extra, ["attribute legacy_flag, value boolean"])
+        self.assertEqual(
+            ingest.render_schema_delta_query(delta),
+            "define\nattribute note, value string;\nentity client, owns note;\n",
+        )
+
+    def test_apply_sends_only_missing_defines_and_dry_run_sends_nothing(self) -> None:
+        driver = FakeDriver(LIVE)
+        with contextlib.redirect_stdout(io.StringIO()) as out, contextlib.redirect_stderr(io.StringIO()):
+            ingest.apply_schema_delta(driver, "db", GENERATED, dry_run=True)
+        self.assertEqual(driver.queries, [])
+        self.assertIn("+ entity client, owns note;", out.getvalue())
+
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            ingest.apply_schema_delta(driver, "db", GENERATED)
+        self.assertEqual(
+            driver.queries,
+            [(ingest.TransactionType.SCHEMA, "define\nattribute note, value string;\nentity client, owns note;")],
+        )
+
+    def test_up_to_date_schema_opens_no_schema_transaction(self) -> None:
+        driver = FakeDriver(GENERATED)
+        with contextlib.redirect_stdout(io.StringIO()):
+            delta = ingest.apply_schema_delta(driver, "db", GENERATED)
+        self.assertEqual(delta.missing, [])
+        self.assertEqual(driver.queries, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+VALIDATE_PATH = ROOT / "scripts" / "typedb-ontology-validate.py"
+
+spec = importlib.util.spec_from_file_location("typedb_ontology_validate_test_module", VALIDATE_PATH)
+if spec is None or spec.loader is None:
+    raise RuntimeError(f"Cannot load module from {VALIDATE_PATH}")
+validate = importlib.util.module_from_spec(spec)
+sys.modules["typedb_ontology_validate_test_module"] = validate
+spec.loader.exec_module(validate)
+
+
+class FakeValue:
+    def __init__(self, value: int) -> None:
+        self._value = value
+
+    def is_value(self) -> bool:
+        return True
+
+    def as_value(self) -> "FakeValue":
+        return self
+
+    def is_integer(self) -> bool:
+        return True
+
+    def get_integer(self) -> int:
+        return self._value
+
+
+class FakeRow:
+    def __init__(self, value: int) -> None:
+        self._value = FakeValue(value)
+
+    def column_names(self) -> list[str]:
+        return ["count"]
+
+    def get(self, column: str) -> FakeValue:
+        return self._value
+
+
+class FakeAnswer:
+    def __init__(self, rows: list[FakeRow]) -> None:
+        self.iterator = iter(rows)
+
+    def is_concept_rows(self) -> bool:
+        return True
+
+    def as_concept_rows(self) -> "FakeAnswer":
+        return self
+
+    def resolve(self) -> "FakeAnswer":
+        return self
+
+
+class FakeTransaction:
+    def __init__(self, driver: "FakeDriver") -> None:
+        self._driver = driver
+        self.closed = threading.Event()
+
+    def query(self, query: str) -> FakeAnswer:
+        delay, value = self._driver.plan[query]
+        with self._driver.lock:
+            self._driver.active += 1
+            self._driver.peak = max(self._driver.peak, self._driver.active)
+        try:
+            if self.closed.wait(delay):
+                raise RuntimeError("transaction closed")
+        finally:
+            with self._driver.lock:
+                self._driver.active -= 1
+        if value is None:
+            raise RuntimeError("query failed")
+        if query.rstrip().endswith("count;"):
+            return FakeAnswer([FakeRow(value)])
+        return FakeAnswer([FakeRow(0) for _ in range(value)])
+
+    def close(self) -> None:
+        self.closed.set()
+
+
+class FakeDriver:
+    def __init__(self, plan: dict[str, tuple[float, int | None]]) -> None:
+        self.plan = plan
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.options: list[object] = []
+
+    def transaction(self, database: str, tx_type: object, options: object = None) -> FakeTransaction:
+        self.options.append(options)
+        return FakeTransaction(self)
+
+
+def count_check(name: str, warn: bool = False) -> object:
+    return validate.AggregateCheck(
+        name, f"match $x isa {name}; reduce $count = count;", warn_if=(lambda value: value > 0) if warn else None
+    )
+
+
+class ValidateRunnerTests(unittest.TestCase):
+    def test_checks_run_concurrently_with_bounded_pool(self) -> None:
+        checks = [count_check(f"type_{index}") for index in range(6)]
+        driver = FakeDriver({check.query: (0.2, index) for index, check in enumerate(checks)})
+        started = time.monotonic()
+        results = validate.run_checks(driver, "db", checks, workers=3, timeout_seconds=5)
+        elapsed = time.monotonic() - started
+
+        self.assertEqual([result.value for result in results], list(range(6)))
+        self.assertEqual(driver.peak, 3)
+        self.assertLess(elapsed, 0.2 * 6 * 0.75)
+        self.assertTrue(all(result.latency_ms >= 150 for result in results))
+        self.assertEqual(driver.options[0].transaction_timeout_millis, 5000)
+
+    def test_timeouts_and_errors_are_reported_per_check(self) -> None:
+        fast, slow, broken = count_check("fast", warn=True), count_check("slow"), count_check("broken")
+        driver = FakeDriver({fast.query: (0, 2), slow.query: (30, 1), broken.query: (0, None)})
+        original_grace = validate.TIMEOUT_GRACE_SECONDS
+        validate.TIMEOUT_GRACE_SECONDS = 0.05
+        try:
+            results = validate.run_checks(driver, "db", [fast, slow, broken], workers=3, timeout_seconds=0.1)
+        finally:
+            validate.TIMEOUT_GRACE_SECONDS = original_grace
+
+        self.assertEqual([result.status for result in results], ["WARN", "TIMEOUT", "ERROR"])
+        self.assertEqual(results[0].value, 2)
+        self.assertIsNone(results[1].value)
+        self.assertEqual(results[2].error, "query failed")
+
+    def test_query_pack_is_translated_to_typedb3_checks(self) -> None:
+        checks = validate.load_tql_checks(validate.DEFAULT_QUERIES_PATH)
+        self.assertTrue(checks)
+        for check in checks:
+            self.assertNotRegex(check.query, r"\bget\b")
+            self.assertTrue(check.query.startswith("match "))
+        by_title = {check.title: check for check in checks}
+        orphan = by_title["6.1 Task without Project relation"]
+        self.assertTrue(orphan.query.endswith("reduce $count = count;"))
+        self.assertTrue(orphan.warn_if(1))
+        links = by_title["2) Project -> Task links"]
+        self.assertIn("$rel isa project_has_task (owner_project: $p, task: $t);", links.query)
+        self.assertTrue(links.query.endswith("select $project_id, $task_id; limit 50;"))
+        self.assertIsNone(links.warn_if)
+
+        driver = FakeDriver({links.query: (0, 7)})
+        (result,) = validate.run_checks(driver, "db", [links], workers=1, timeout_seconds=5)
+        self.assertEqual((result.status, result.value, result.suite), ("OK", 7, "tql"))
+
+    def test_json_report_carries_deltas_against_previous_report(self) -> None:
+        check = count_check("orphans", warn=True)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "validate.json"
+            first = validate.run_checks(FakeDriver({check.query: (0, 3)}), "db", [check], workers=1, timeout_seconds=5)
+            validate.write_validate_report(path, "db", first, wall_ms=10)
+            self.assertEqual(validate.load_previous_values(path), {"orphans": 3})
+
+            second = validate.run_checks(FakeDriver({check.query: (0, 1)}), "db", [check], workers=1, timeout_seconds=5)
+            second[0].previous = validate.load_previous_values(path).get("orphans")
+            validate.write_validate_report(path, "db", second, wall_ms=10)
+            payload = json.loads(path.read_text(encoding="utf-8"))
+
+        self.assertEqual(payload["format"], validate.VALIDATE_REPORT_FORMAT)
+        self.assertEqual(payload["checks"][0]["delta"], -2)
+        self.assertEqual(payload["summary"]["warn"], 1)
+        self.assertEqual(payload["summary"]["slowest"]["name"], "orphans")
+
+
+class TouchedKeysScopeTests(unittest.TestCase):
+    def write_manifest(self, tmp: str, keys: list[str]) -> Path:
+        path = Path(tmp) / "touched.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "format": validate.TOUCHED_KEYS_FORMAT,
+                    "run_id": "r1",
+                    "collections": {
+                        "automation_voice_bot_messages": {
+                            "voice_message": {"key_attr": "voice_message_id", "keys": keys[:150]},
+                        },
+                        "automation_voice_bot_sessions": {
+                            "voice_message": {"key_attr": "voice_message_id", "keys": keys[150:]},
+                        },
+                    },
+                }
+            ),
+            encoding="utf-8",
+        )
+        return path
+
+    def test_orphan_checks_are_batched_over_touched_keys(self) -> None:
+        keys = [f"msg-{index:03d}" for index in range(200)]
+        with tempfile.TemporaryDirectory() as tmp:
+            run_id, touched = validate.load_touched_keys(self.write_manifest(tmp, keys))
+        self.assertEqual(run_id, "r1")
+        self.assertEqual(touched["voice_message"], ("voice_message_id", keys))
+
+        scoped, skipped = validate.scope_checks(validate.CHECKS, touched, batch_size=80)
+        self.assertEqual(
+            [check.name for check in scoped],
+            [
+                "orphan_messages_without_session",
+                "messages_missing_runtime_tag",
+                "messages_with_missing_image_anchor_parent",
+            ],
+        )
+        self.assertIn("voice_messages_total", skipped)
+        self.assertIn("orphan_tasks_without_project", skipped)
+
+        orphan = scoped[0]
+        self.assertEqual(len(orphan.batches), 3)
+        self.assertTrue(orphan.batches[0].startswith('match { $m has voice_message_id "msg-000"; } or { $m has voice_message_id "msg-001"; }'))
+        self.assertEqual(orphan.batches[2].count("voice_message_id"), 40)
+        self.assertTrue(orphan.batches[0].endswith("isa voice_session_has_message; }; reduce $count = count;"))
+
+        driver = FakeDriver({query: (0, index) for index, query in enumerate(orphan.batches)})
+        (result,) = validate.run_checks(driver, "db", [orphan], workers=1, timeout_seconds=5)
+        self.assertEqual((result.status, result.value), ("WARN", 0 + 1 + 2))
+
+    def test_counter_mode_reads_values_and_flags_missing_counters(self) -> None:
+        counters = {check.name: 0 for check, _ in validate.counter_checks()}
+        counters["orphan_tasks_without_project"] = 4
+        del counters["tasks_total"]
+        results = {result.name: result for result in validate.counter_results(counters)}
+        self.assertEqual(len(results), len(validate.COUNTER_CHECK_NAMES))
+        self.assertEqual((results["orphan_tasks_without_project"].status, results["orphan_tasks_without_project"].value), ("WARN", 4))
+        self.assertEqual(results["tasks_total"].status, "ERROR")
+        self.assertEqual(results["projects_total"].status, "OK")
+
+    def test_stale_marker_fails_counter_mode_until_recount(self) -> None:
+        counters = {check.name: 0 for check, _ in validate.counter_checks()}
+        counters[validate.COUNTERS_STALE_ID] = 1
+        results = validate.counter_results(counters)
+        self.assertTrue(all(result.status == "ERROR" and result.value == 0 for result in results))
+        self.assertIn("--recount", results[0].error)
+
+        class RecordingDriver:
+            def __init__(self) -> None:
+                self.queries: list[str] = []
+
+            def transaction(self, database: str, tx_type: object) -> "RecordingDriver":
+                return self
+
+            def query(self, query: str) -> FakeAnswer:
+                self.queries.append(query)
+                return FakeAnswer([])
+
+            def commit(self) -> None:
+                self.queries.append("COMMIT")
+
+            def close(self) -> None:
+                return None
+
+        clear_marker = validate.counter_set_queries(validate.COUNTERS_STALE_ID, 0)[1]
+        partial = RecordingDriver()
+        self.assertFalse(validate.write_counters(partial, "db", {"tasks_total": 3}))
+        self.assertNotIn(clear_marker, partial.queries)
+        self.assertIn(validate.counter_set_queries("tasks_total", 3)[1], partial.queries)
+
+        complete = RecordingDriver()
+        self.assertTrue(validate.write_counters(complete, "db", {name: 0 for name in validate.COUNTER_CHECK_NAMES}))
+        self.assertIn(clear_marker, complete.queries)
+        self.assertEqual(complete.queries[-1], "COMMIT")
+
+    def test_key_literals_are_escaped(self) -> None:
+        self.assertEqual(validate.typeql_string('a"b\\c'), '"a\\"b\\\\c"')
+
+
+if __name__ == "__main__":
+    unittest.main()
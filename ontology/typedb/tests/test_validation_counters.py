@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import importlib.util
+import re
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+INGEST_PATH = ROOT / "scripts" / "typedb-ontology-ingest.py"
+
+spec = importlib.util.spec_from_file_location("typedb_ontology_ingest_counters_test_module", INGEST_PATH)
+if spec is None or spec.loader is None:
+    raise RuntimeError(f"Cannot load module from {INGEST_PATH}")
+ingest = importlib.util.module_from_spec(spec)
+sys.modules["typedb_ontology_ingest_counters_test_module"] = ingest
+spec.loader.exec_module(ingest)
+validation = ingest.validation
+
+
+class FakeRows:
+    def __init__(self, count: int) -> None:
+        self.iterator = iter([object()] * count)
+
+    def is_concept_rows(self) -> bool:
+        return True
+
+    def as_concept_rows(self) -> "FakeRows":
+        return self
+
+    def resolve(self) -> "FakeRows":
+        return self
+
+
+class FakeGraph:
+    """Just enough of a task/project graph to answer counter probes and apply task writes."""
+
+    def __init__(self) -> None:
+        self.projects = {"p1"}
+        self.tasks: dict[str, dict[str, bool]] = {}
+        self.log: list[str] = []
+
+    def answer(self, query: str) -> FakeRows:
+        self.log.append(query)
+        task_keys = re.findall(r'has task_id "([^"]+)"', query)
+        if query.endswith("limit 1;"):
+            if "isa project;" in query:
+                key = re.search(r'has project_id "([^"]+)"', query).group(1)
+                return FakeRows(int(key in self.projects))
+            task = self.tasks.get(task_keys[0])
+            if task is None:
+                return FakeRows(0)
+            if "project_has_task" in query:
+                return FakeRows(int(not task["linked"]))
+            if "runtime_tag" in query:
+                return FakeRows(int(not task["runtime_tag"]))
+            return FakeRows(1)
+        if query.startswith("insert $t isa task"):
+            self.tasks[task_keys[0]] = {"linked": False, "runtime_tag": "runtime_tag" in query}
+        elif "insert (owner_project: $p, task: $t) isa project_has_task" in query:
+            self.tasks[task_keys[0]]["linked"] = True
+        return FakeRows(0)
+
+
+class FakeTransaction:
+    def __init__(self, graph: FakeGraph, tx_type: object) -> None:
+        self.graph = graph
+        self.tx_type = tx_type
+
+    def query(self, query: str) -> FakeRows:
+        return self.graph.answer(query)
+
+    def commit(self) -> None:
+        self.graph.log.append("COMMIT")
+
+    def rollback(self) -> None:
+        self.graph.log.append("ROLLBACK")
+
+    def close(self) -> None:
+        return None
+
+
+class FakeDriver:
+    def __init__(self, graph: FakeGraph) -> None:
+        self.graph = graph
+
+    def transaction(self, database: str, tx_type: object) -> FakeTransaction:
+        return FakeTransaction(self.graph, tx_type)
+
+
+class ValidationCounterTests(unittest.TestCase):
+    def test_counter_checks_cover_totals_orphans_and_runtime_tags(self) -> None:
+        names = {check.name for check, _ in validation.counter_checks()}
+        self.assertIn("orphan_messages_without_session", names)
+        self.assertIn("tasks_missing_runtime_tag", names)
+        self.assertNotIn("codex_tasks_without_project_git_repo", names)
+        check = next(check for check, _ in validation.counter_checks() if check.name == "orphan_tasks_without_project")
+        self.assertEqual(
+            validation.counter_probe_query(check, "t1"),
+            'match $t has task_id "t1"; $t isa task; not { (owner_project: $p, task: $t) isa project_has_task; }; limit 1;',
+        )
+
+    def test_writes_adjust_counters_inside_the_same_transaction(self) -> None:
+        graph = FakeGraph()
+        driver = ingest.ValidationCounterDriver(FakeDriver(graph))
+
+        ingest.execute_query_in_transaction(
+            driver, "db", ingest.TransactionType.WRITE, 'insert $t isa task, has task_id "t1";'
+        )
+        updates = [query for query in graph.log if "update $c has counter_value" in query]
+        self.assertEqual(
+            sorted(re.search(r'validation_counter_id "([^"]+)"', query).group(1) for query in updates),
+            ["orphan_tasks_without_project", "tasks_missing_runtime_tag", "tasks_total"],
+        )
+        self.assertTrue(all("let $n = $v + 1;" in query for query in updates))
+        self.assertEqual(graph.log[-1], "COMMIT")
+        self.assertLess(graph.log.index(updates[-1]), graph.log.index("COMMIT"))
+
+        graph.log.clear()
+        ingest.execute_query_in_transaction(
+            driver,
+            "db",
+            ingest.TransactionType.WRITE,
+            'match $p isa project, has project_id "p1"; $t isa task, has task_id "t1"; '
+            "insert (owner_project: $p, task: $t) isa project_has_task;",
+        )
+        updates = [query for query in graph.log if "update $c has counter_value" in query]
+        self.assertEqual(
+            updates,
+            [validation.counter_update_query("orphan_tasks_without_project", -1)],
+        )
+        self.assertEqual(
+            {name: delta for name, delta in driver.run_deltas.items() if delta},
+            {"tasks_total": 1, "tasks_missing_runtime_tag": 1},
+        )
+
+    def test_reads_and_unchanged_writes_leave_counters_alone(self) -> None:
+        graph = FakeGraph()
+        driver = ingest.ValidationCounterDriver(FakeDriver(graph))
+        self.assertIsInstance(driver.transaction("db", ingest.TransactionType.READ), FakeTransaction)
+        ingest.execute_query_in_transaction(
+            driver, "db", ingest.TransactionType.WRITE, 'match $p isa project, has project_id "p1"; insert $p has name "P";'
+        )
+        self.assertFalse([query for query in graph.log if "validation_counter" in query])
+
+
+if __name__ == "__main__":
+    unittest.main()